@@ -1,26 +1,79 @@
-from flask import Flask, render_template, request, jsonify
-import pandas as pd
+import click
+from flask import Flask, render_template, request, jsonify, stream_with_context
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
+import hashlib
+import hmac
 import json
-from math import radians, sin, cos, sqrt, atan2
-from kmeans_clustering import TravelKMeans
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import config
+from attraction_store import AttractionStore
+from batch import BatchPool, BatchPoolBusy, generate_batch, itinerary_request
+from cluster_cache import ClusterCache, LRUCache
+from dataset import Dataset, DatasetWatcher
+from itinerary_cache import ItineraryCache, SQLiteCacheBackend
+from itinerary_format import (all_attractions, compact_day, compact_itinerary, compact_rows,
+                              expand_day, expand_itinerary, plan_corrections, route_response)
+from fuzzy_resolver import PlaceNotFoundError
+from geo import haversine_km
+from location_index import LocationIndex
+from metrics import Metrics, format_metric
+from route_order import location_distance_matrix, plan_route
+from scheduler import DayScheduler
+from serialization import compress, dumps
+from snapshot import dataset_version, save_snapshot
+from travel_times import MAX_CITY_SIZE, PROFILES, build_travel_times
 
 app = Flask(__name__)
 
-# Load attractions data
-def load_attractions():
-    try:
-        df = pd.read_csv('attractions.csv')
-        return df.to_dict('records')
-    except Exception as e:
-        print(f"Error loading attractions: {e}")
-        return []
+# Per-stage latency histograms, exported at /metrics
+metrics = Metrics(enabled=config.METRICS_ENABLED)
+
+# One JSON line per logged request, see log_request
+logger = logging.getLogger('itinerary')
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
+DATASET_PATH = 'attractions.csv'
+
+# Largest search radius accepted by /nearby
+MAX_NEARBY_RADIUS_KM = 100
+
+# Bump when the itinerary format changes, so shared caches drop old plans
+ITINERARY_CACHE_VERSION = 3
+
+def error_result(error):
+    """The {'error': message} result for an exception, with suggestions for unknown places."""
+    result = {'error': str(error)}
+    if isinstance(error, PlaceNotFoundError):
+        result['suggestions'] = [{'place': s.place, 'confidence': s.confidence}
+                                 for s in error.suggestions]
+    return result
 
 # Travel planner class
 class SouthIndiaTravelPlanner:
-    def __init__(self):
-        self.attractions = load_attractions()
+    """
+    Plans itineraries; one instance serves every thread of a process.
+
+    The dataset and its indexes are read-only and replaced only as a whole by
+    reload_dataset. The caches and counters shared between requests are
+    locked. Everything a request changes (used attractions, schedulers,
+    response rows) is created for that request alone.
+    """
+
+    def __init__(self, cluster_cache_size=256, cluster_cache_ttl=None, warm_clusters=False,
+                 kmeans_backend='auto', kmeans_metric='euclidean', snapshot_path=None,
+                 itinerary_cache_size=1024, itinerary_cache_ttl=None,
+                 itinerary_cache_backend=None, travel_times_path=None, speed_profile='urban',
+                 cluster_workers=0):
         self.south_indian_states = [
             'Kerala',
             'Tamil Nadu',
@@ -141,6 +194,210 @@ class SouthIndiaTravelPlanner:
             'rameshwaram': ['rameshwaram temple', 'rameshwaram'],
             'kanyakumari': ['kanyakumari temple', 'kanyakumari']
         }
+        # Load the dataset and the precompiled place -> attractions lookup (same
+        # results as matches_location) from a snapshot when it is up to date.
+        # Requests read self.dataset once, reload_dataset swaps in a new one.
+        self.snapshot_path = snapshot_path
+        self.travel_times_path = travel_times_path
+        self.speed_profile = speed_profile
+        try:
+            self.dataset = self._load_dataset()
+        except Exception as e:
+            print(f"Error loading attractions: {e}")
+            empty = AttractionStore.from_records([])
+            self.dataset = Dataset(empty, LocationIndex(empty, self.location_variations),
+                                   dataset_version(DATASET_PATH), self.location_variations,
+                                   speed_profile=speed_profile)
+        self.reload_counts = {'reloaded': 0, 'unchanged': 0, 'error': 0}
+        self._reload_lock = threading.Lock()
+        # Fitted clusters per matched attraction set, shared across requests
+        self.warm_clusters = warm_clusters
+        self.cluster_cache = ClusterCache(maxsize=cluster_cache_size, ttl=cluster_cache_ttl,
+                                          backend=kmeans_backend, metric=kmeans_metric)
+        # Places clustered lately, so reloads can refit them ahead of requests
+        self.clustered_places = LRUCache(maxsize=cluster_cache_size)
+        # Threads fitting a request's uncached places in parallel, 0 or 1 for none
+        self.cluster_workers = cluster_workers
+        if warm_clusters:
+            self.warm_cluster_cache()
+        # Whole itineraries, keyed on normalized inputs and the dataset version
+        self.itinerary_cache = ItineraryCache(maxsize=itinerary_cache_size,
+                                              ttl=itinerary_cache_ttl,
+                                              backend=itinerary_cache_backend)
+
+    # The active dataset's parts, for callers outside a request
+    @property
+    def attractions(self):
+        return self.dataset.attractions
+
+    @property
+    def location_index(self):
+        return self.dataset.location_index
+
+    @property
+    def spatial_index(self):
+        return self.dataset.spatial_index
+
+    @property
+    def dataset_version(self):
+        return self.dataset.version
+
+    def _load_dataset(self):
+        return Dataset.load(DATASET_PATH, self.snapshot_path, self.location_variations,
+                            self.travel_times_path, self.speed_profile)
+
+    def save_snapshot(self, path):
+        """Write the dataset and location index to a snapshot file."""
+        dataset = self.dataset
+        save_snapshot(path, dataset.attractions, dataset.location_index, DATASET_PATH,
+                      self.location_variations)
+
+    def _fit_places(self, dataset, places, only_cached_in=None):
+        """
+        Fit the clusters of places, as requests would.
+
+        Args:
+            dataset (Dataset): Dataset to match the places in
+            places (iterable): Place names
+            only_cached_in (Dataset): Skip places whose clusters in this other
+                version were not cached, None to fit every place
+
+        Returns:
+            int: Number of places fitted
+        """
+        fitted = 0
+        for place in places:
+            attractions = [dataset.attractions[i] for i in dataset.location_index.lookup(place)]
+            if not attractions:
+                continue
+            if only_cached_in is not None:
+                before = [only_cached_in.attractions[i]
+                          for i in only_cached_in.location_index.lookup(place)]
+                if not before or not self.cluster_cache.cached(before, min(3, len(before))):
+                    continue
+            self.cluster_cache.fit(attractions, min(3, len(attractions)))
+            fitted += 1
+        return fitted
+
+    def warm_cluster_cache(self):
+        """Precompute the clusters for every known location."""
+        self._fit_places(self.dataset, self.location_variations)
+
+    def reload_dataset(self, force=False):
+        """
+        Rebuild the dataset from attractions.csv and swap it in.
+
+        Everything is built before the swap, on the caller's thread, while
+        requests keep being served from the current version. Clusters are
+        cached by coordinates, so only the places covering cities whose
+        attractions changed need new fits; those that were cached before (or
+        every known location with warm_clusters) are refitted ahead of the
+        swap. Cached itineraries are keyed on the dataset version and simply
+        stop matching. Concurrent calls are serialized.
+
+        Places considered for refitting are the changed cities, the known
+        locations and the places clustered lately (clustered_places) that
+        cover a changed city in either version; a removed city counts as
+        changed.
+
+        Args:
+            force (bool): Rebuild even when the file's checksum is unchanged
+
+        Returns:
+            dict: 'status' ('reloaded', 'unchanged' or 'error'), the active
+                'dataset_version', and for reloads the 'changed_cities', the
+                number of places 'reclustered' and the rebuild 'seconds'
+        """
+        with self._reload_lock:
+            started = time.perf_counter()
+            current = self.dataset
+            try:
+                if not force and dataset_version(DATASET_PATH, current.source) == current.version:
+                    self.reload_counts['unchanged'] += 1
+                    return {'status': 'unchanged', 'dataset_version': current.version}
+
+                dataset = self._load_dataset()
+                if not len(dataset.attractions):
+                    raise ValueError(f'{DATASET_PATH} has no attractions')
+                changed = dataset.changed_cities(current)
+                changed_set = set(changed)
+
+                # A place's attractions changed if it covers a changed city in either
+                # version, e.g. a state that lost a removed city
+                def covers_changed(version, place):
+                    store = version.attractions
+                    ids = version.location_index.lookup(place)
+                    return any(store.cities[code] in changed_set
+                               for code in set(store.city_codes[ids].tolist()))
+
+                places = dict.fromkeys(changed)
+                for place in [*self.location_variations, *self.clustered_places.keys()]:
+                    if covers_changed(dataset, place) or covers_changed(current, place):
+                        places[place] = None
+                reclustered = self._fit_places(
+                    dataset, places, only_cached_in=None if self.warm_clusters else current)
+            except Exception as e:
+                self.reload_counts['error'] += 1
+                return {'status': 'error', 'error': str(e), 'dataset_version': current.version}
+
+            self.dataset = dataset
+            self.reload_counts['reloaded'] += 1
+            return {
+                'status': 'reloaded',
+                'dataset_version': dataset.version,
+                'changed_cities': len(changed),
+                'reclustered': reclustered,
+                'seconds': round(time.perf_counter() - started, 3),
+            }
+
+    def suggest_places(self, text, limit=5):
+        """
+        Known places spelled like some text, for "did you mean" prompts.
+
+        Args:
+            text (str): Place name as entered by the user
+            limit (int): Maximum number of suggestions
+
+        Returns:
+            list: Suggestion(place, matched, confidence) tuples, best first
+
+        Raises:
+            ValueError: If limit is negative
+        """
+        if limit < 0:
+            raise ValueError('limit must not be negative.')
+        if limit == 0:
+            return []
+        return self.dataset.place_resolver.suggest(text, limit=limit)
+
+    def resolve_place(self, place, dataset=None):
+        """
+        Correct a place that matches no attractions.
+
+        The best suggestion is used when its confidence reaches
+        PLACE_AUTOCORRECT_CONFIDENCE and no other suggestion ties with it.
+        Places in location_variations are spelled right but have no
+        attractions, they are never corrected into a different place.
+
+        Args:
+            place (str): Place name as entered by the user
+            dataset (Dataset): Version to resolve in, the active one when None
+
+        Returns:
+            str: The corrected place name
+
+        Raises:
+            PlaceNotFoundError: With the suggestions, when none is safe to pick
+        """
+        if dataset is None:
+            dataset = self.dataset
+        suggestions = dataset.place_resolver.suggest(place)
+        known = dataset.location_index.canonical_key(place) in self.location_variations
+        if (not known and suggestions and
+                suggestions[0].confidence >= config.PLACE_AUTOCORRECT_CONFIDENCE):
+            if len(suggestions) == 1 or suggestions[1].confidence < suggestions[0].confidence:
+                return suggestions[0].place
+        raise PlaceNotFoundError(place, suggestions)
 
     def matches_location(self, attraction, location):
         location_lower = location.lower().strip()
@@ -170,223 +427,639 @@ class SouthIndiaTravelPlanner:
             location_lower in attraction['Category'].lower().strip()
         )
 
+    def nearby(self, lat, lng, radius_km, category=None, limit=50):
+        """
+        Find attractions around a point.
+
+        Args:
+            lat (float): Latitude in degrees
+            lng (float): Longitude in degrees
+            radius_km (float): Search radius in kilometers
+            category (str): Only attractions of this category (case-insensitive), or None
+            limit (int): Maximum number of attractions returned
+
+        Returns:
+            list: Attraction rows sorted by distance, each with its 'id' and 'distance_km'
+
+        Raises:
+            ValueError: If limit is negative
+        """
+        if limit < 0:
+            raise ValueError('limit must not be negative.')
+        dataset = self.dataset
+        ids, distances = dataset.spatial_index.query_radius(lat, lng, radius_km)
+        if category:
+            levels = [c.lower() for c in dataset.attractions.categories]
+            if category.strip().lower() not in levels:
+                return []
+            keep = (dataset.attractions.category_codes[ids] ==
+                    levels.index(category.strip().lower()))
+            ids, distances = ids[keep], distances[keep]
+
+        results = []
+        for attraction_id, distance in zip(ids[:limit].tolist(), distances[:limit].tolist()):
+            row = dataset.attractions.record(attraction_id)
+            row['id'] = attraction_id
+            row['distance_km'] = distance
+            results.append(row)
+        return results
+
     def calculate_travel_time(self, lat1, lon1, lat2, lon2):
         """Calculate estimated travel time between two points in minutes"""
-        distance = self.calculate_distance(lat1, lon1, lat2, lon2)
-        # Assuming average speed of 40 km/h in cities
-        return int((distance / 40) * 60)
+        # By the speed profile, 40 km/h in cities unless configured otherwise
+        return int(self.dataset.travel_times.speed.minutes(
+            self.calculate_distance(lat1, lon1, lat2, lon2)))
 
     def calculate_distance(self, lat1, lon1, lat2, lon2):
         """Calculate distance between two points using Haversine formula"""
-        R = 6371  # Earth's radius in kilometers
+        return float(haversine_km(lat1, lon1, lat2, lon2))
 
-        lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
+    def _itinerary_cache_key(self, dataset, locations, duration, max_hours, start_place,
+                             end_place):
+        """Key an itinerary on everything it depends on except the start date."""
+        canonical = [dataset.location_index.canonical_key(loc) for loc in locations]
+        fixed_ends = [dataset.location_index.canonical_key(place) if place else None
+                      for place in (start_place, end_place)]
+        payload = json.dumps([ITINERARY_CACHE_VERSION, dataset.version,
+                              dataset.travel_times.version,
+                              self.cluster_cache.backend, self.cluster_cache.metric,
+                              canonical, duration, max_hours, fixed_ends])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
 
-        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-        c = 2 * atan2(sqrt(a), sqrt(1-a))
-        distance = R * c
+    def _prepare(self, places, duration, start_date, max_hours, start_place, end_place):
+        """
+        Validate a request and look up its plan in the itinerary cache.
 
-        return distance
+        Plans don't depend on the start date, dates and place names are
+        stamped on when the response is built.
 
-    def generate_itinerary(self, places, duration, start_date, max_hours):
+        Returns:
+            tuple: (dataset, start, locations, cache_key, cached) where dataset
+                is the version the whole request works with and cached is the
+                cached plan as JSON, or None
+
+        Raises:
+            ValueError: On invalid input
+        """
+        if not places or not start_date or duration < 1 or duration > 7:
+            raise ValueError('Please provide valid input for all fields.')
+        start = datetime.strptime(start_date, '%Y-%m-%d')
+
+        dataset = self.dataset
+        locations = list(dict.fromkeys(places))
+        cache_key = self._itinerary_cache_key(dataset, locations, duration, max_hours,
+                                              start_place, end_place)
+        with metrics.stage('cache_lookup'):
+            cached = self.itinerary_cache.get(cache_key)
+        return dataset, start, locations, cache_key, cached
+
+    def generate_itinerary(self, places, duration, start_date, max_hours,
+                           start_place=None, end_place=None, compact=False):
+        """
+        Plan a trip.
+
+        Args:
+            places (list): Place names to visit
+            duration (int): Number of days, 1 to 7
+            start_date (str): First day as YYYY-MM-DD
+            max_hours (int): Daily budget for visits plus travel
+            start_place (str): Place the trip must start at, or None
+            end_place (str): Place the trip must end at, or None
+            compact (bool): Return the compact response (see compact_itinerary)
+
+        Returns:
+            dict: The itinerary with the 'dataset_version' it was planned on,
+                and 'corrections' when misspelled places were auto-corrected,
+                or {'error': message} (see error_result)
+        """
         try:
-            # Validate inputs
-            if not places or not start_date or duration < 1 or duration > 7:
-                return {'error': 'Please provide valid input for all fields.'}
-
-            # Find matching attractions for each location
-            location_attractions = {}
-            for place in places:
-                matching_attractions = [attr for attr in self.attractions 
-                                     if self.matches_location(attr, place)]
-                if not matching_attractions:
-                    return {'error': f'No matching attractions found for: {place}'}
-                location_attractions[place] = matching_attractions
-
-            # Calculate maximum minutes for pure visit time
-            max_visit_minutes_per_day = max_hours * 60
-
-            # Create daily schedules
-            daily_schedules = []
-            used_attractions = set()
-
-            # Calculate optimal travel sequence based on distances
-            locations = list(location_attractions.keys())
-            if len(locations) > 1:
-                # Create distance matrix between locations
-                distance_matrix = {}
-                for loc1 in locations:
-                    distance_matrix[loc1] = {}
-                    for loc2 in locations:
-                        if loc1 != loc2:
-                            # Use the first attraction from each location as reference point
-                            attr1 = location_attractions[loc1][0]
-                            attr2 = location_attractions[loc2][0]
-                            distance_matrix[loc1][loc2] = self.calculate_distance(
-                                attr1['Latitude'], attr1['Longitude'],
-                                attr2['Latitude'], attr2['Longitude']
-                            )
-
-                # Sort locations by proximity
-                sorted_locations = []
-                current = locations[0]
-                remaining = set(locations[1:])
-                sorted_locations.append(current)
-
-                while remaining:
-                    next_loc = min(remaining, 
-                                 key=lambda x: distance_matrix[current][x])
-                    sorted_locations.append(next_loc)
-                    current = next_loc
-                    remaining.remove(next_loc)
+            dataset, start, locations, cache_key, cached = self._prepare(
+                places, duration, start_date, max_hours, start_place, end_place)
+            if cached is not None:
+                plan = json.loads(cached)
             else:
-                sorted_locations = locations
-
-            # Calculate days per location
-            total_locations = len(sorted_locations)
-            days_per_location = max(1, duration // total_locations)
-            remaining_days = duration - (days_per_location * total_locations)
-
-            current_day = 0
-            for location in sorted_locations:
-                attractions = location_attractions[location]
-                
-                # Use K-means clustering to group nearby attractions
-                n_clusters = min(3, len(attractions))  # Use at most 3 clusters
-                kmeans = TravelKMeans(n_clusters=n_clusters)
-                attraction_clusters = kmeans.fit(attractions)
-                
-                # Calculate days for this location
-                location_days = days_per_location
-                if remaining_days > 0:
-                    location_days += 1
-                    remaining_days -= 1
-
-                # Create daily schedules for this location
-                for day in range(location_days):
-                    if current_day >= duration:
-                        break
-
-                    final_attractions = []
-                    current_visit_time = 0
-                    last_location = None
-
-                    # Try to fill the day with attractions from the same cluster
-                    for cluster_idx, cluster in enumerate(attraction_clusters):
-                        if not cluster:
-                            continue
-
-                        for attraction in cluster[:]:
-                            if attraction['Name'] in used_attractions:
-                                continue
-
-                            visit_time = attraction.get('Estimated Visit Time (mins)', 0)
-                            travel_time = 0
-                            if last_location:
-                                travel_time = self.calculate_travel_time(
-                                    last_location['Latitude'], 
-                                    last_location['Longitude'],
-                                    attraction['Latitude'], 
-                                    attraction['Longitude']
-                                )
-
-                            if current_visit_time + visit_time + travel_time <= max_visit_minutes_per_day:
-                                # Add cluster information to attraction
-                                attraction['cluster'] = cluster_idx
-                                final_attractions.append(attraction)
-                                current_visit_time += visit_time + travel_time
-                                last_location = attraction
-                                used_attractions.add(attraction['Name'])
-                                cluster.remove(attraction)
-
-                    if final_attractions:
-                        # Calculate additional time
-                        food_time = len(final_attractions) * 60  # 1 hour for food per attraction
-                        total_time = current_visit_time + food_time
-
-                        # Get cluster centers for map visualization
-                        cluster_centers = kmeans.get_cluster_centers()
-                        cluster_info = []
-                        for i, center in enumerate(cluster_centers):
-                            cluster_info.append({
-                                'lat': float(center[0]),
-                                'lng': float(center[1]),
-                                'cluster_id': i
-                            })
-
-                        # Create date for this day
-                        start = datetime.strptime(start_date, '%Y-%m-%d')
-                        current_date = start + timedelta(days=current_day)
-                        date_str = current_date.strftime('%Y-%m-%d')
-
-                        daily_schedules.append({
-                            'day': current_day + 1,
-                            'date': date_str,
-                            'attractions': final_attractions,
-                            'total_time': total_time,
-                            'visit_time': current_visit_time,
-                            'travel_time': current_visit_time - sum(a.get('Estimated Visit Time (mins)', 0) for a in final_attractions),
-                            'food_time': food_time,
-                            'last_location': {
-                                'name': final_attractions[-1]['Name'],
-                                'city': final_attractions[-1]['City'],
-                                'state': final_attractions[-1]['State']
-                            },
-                            'map_data': {
-                                'attractions': [{
-                                    'name': attr['Name'],
-                                    'lat': float(attr['Latitude']),
-                                    'lng': float(attr['Longitude']),
-                                    'cluster': attr['cluster'],
-                                    'visit_time': attr.get('Estimated Visit Time (mins)', 0)
-                                } for attr in final_attractions],
-                                'cluster_centers': cluster_info
-                            }
-                        })
-                        current_day += 1
-
-            # After finding location_attractions
-            all_attractions = []
-            for place, attrs in location_attractions.items():
-                all_attractions.extend(attrs)
+                days = self._iter_plan(dataset, locations, duration, max_hours,
+                                       start_place, end_place)
+                plan = next(days)
+                plan['itinerary'] = list(days)
+                self.itinerary_cache.put(cache_key, json.dumps(plan))
 
-            return {
-                'itinerary': daily_schedules,
-                'all_attractions': all_attractions
-            }
+            with metrics.stage('formatting'):
+                build = compact_itinerary if compact else expand_itinerary
+                result = build(plan, dataset.attractions, start, locations)
+            corrections = plan_corrections(plan, locations)
+            if corrections:
+                result['corrections'] = corrections
+            result['dataset_version'] = dataset.version
+            return result
 
         except Exception as e:
-            return {'error': str(e)}
+            return error_result(e)
+
+    def iter_itinerary(self, places, duration, start_date, max_hours,
+                       start_place=None, end_place=None, compact=False):
+        """
+        Plan a trip, yielding each day as soon as it is packed.
+
+        Takes the same arguments as generate_itinerary.
+
+        Yields:
+            dict: Events, in order:
+                {'type': 'route', 'route': ..., 'dataset_version': ...} once the
+                    cities are ordered, with 'corrections' when places were
+                    auto-corrected,
+                {'type': 'day', 'day': ...} per day; compact days come with
+                    'attractions', the table rows not sent with earlier days,
+                {'type': 'end'}, with 'all_attractions' unless compact;
+                or {'type': 'error', 'error': message} when planning fails
+        """
+        try:
+            dataset, start, locations, cache_key, cached = self._prepare(
+                places, duration, start_date, max_hours, start_place, end_place)
+            if cached is not None:
+                plan = json.loads(cached)
+                days = plan['itinerary']
+            else:
+                days = self._iter_plan(dataset, locations, duration, max_hours,
+                                       start_place, end_place)
+                plan = next(days)
+                plan['itinerary'] = []
+
+            event = {'type': 'route', 'route': route_response(plan, locations),
+                     'dataset_version': dataset.version}
+            corrections = plan_corrections(plan, locations)
+            if corrections:
+                event['corrections'] = corrections
+            yield event
+            seen = set()
+            for day in days:
+                if cached is None:
+                    plan['itinerary'].append(day)
+                if compact:
+                    yield {'type': 'day', 'day': compact_day(day, start),
+                           'attractions': compact_rows(day['ids'], dataset.attractions, seen)}
+                else:
+                    yield {'type': 'day', 'day': expand_day(day, dataset.attractions, start)}
+            if cached is None:
+                self.itinerary_cache.put(cache_key, json.dumps(plan))
+
+            end = {'type': 'end'}
+            if not compact:
+                end['all_attractions'] = all_attractions(plan, dataset.attractions)
+            yield end
+
+        except Exception as e:
+            yield {'type': 'error', **error_result(e)}
+
+    def _cluster_locations(self, location_attractions):
+        """
+        Fit the clusters of each location of a request, at most 3 per location.
+
+        With cluster_workers above 1 and several locations missing from the
+        cluster cache, those are fitted in parallel on a pool that lives only
+        for this request, so no threads outlive it or have to survive a fork.
+
+        Args:
+            location_attractions (dict): Location -> matched AttractionRecords
+
+        Returns:
+            dict: Location -> (clusters, cluster_centers) from ClusterCache.fit
+        """
+        def fit(location):
+            attractions = location_attractions[location]
+            return self.cluster_cache.fit(attractions, min(3, len(attractions)))
+
+        fitted = {}
+        if self.cluster_workers > 1 and len(location_attractions) > 1:
+            misses = [location for location, attractions in location_attractions.items()
+                      if not self.cluster_cache.cached(attractions, min(3, len(attractions)))]
+            if len(misses) > 1:
+                with ThreadPoolExecutor(max_workers=min(self.cluster_workers,
+                                                        len(misses))) as pool:
+                    fitted = dict(zip(misses, pool.map(fit, misses)))
+        return {location: fitted[location] if location in fitted else fit(location)
+                for location in location_attractions}
+
+    def _iter_plan(self, dataset, locations, duration, max_hours, start_place, end_place):
+        """
+        Choose the route, then each day's attractions, as ids of dataset's attractions.
+
+        Yields:
+            dict: First the plan without its days ({'matched', 'route'}, and
+                'resolved', the place used for each location or None, when any
+                were auto-corrected), then each day as soon as it is packed; the
+                full plan is rendered by expand_itinerary or compact_itinerary
+
+        Raises:
+            PlaceNotFoundError: When a place has no attractions and no safe correction
+            ValueError: When a fixed end is not visited
+        """
+        # Find matching attractions for each location
+        location_attractions = {}
+        corrections = {}
+        with metrics.stage('matching'):
+            for place in locations:
+                ids = dataset.location_index.lookup(place)
+                if not ids:
+                    corrections[place] = self.resolve_place(place, dataset)
+                    ids = dataset.location_index.lookup(corrections[place])
+                location_attractions[place] = [dataset.attractions[i] for i in ids]
+
+        # Calculate maximum minutes for pure visit time
+        max_visit_minutes_per_day = max_hours * 60
+
+        # Per-request state, the shared attraction store is never mutated
+        used_names = np.zeros(len(dataset.attractions.distinct_names), dtype=bool)
+
+        # Cluster every location once, for ordering and for daily schedules
+        with metrics.stage('clustering'):
+            location_clusters = self._cluster_locations(location_attractions)
+            for location in locations:
+                self.clustered_places.put(corrections.get(location, location), True)
+
+        # Calculate optimal travel sequence based on distances between
+        # the cluster centers of each location
+        # Compared like the itinerary cache key compares them, so aliases match
+        # ('Mysore' is one of ['mysuru', 'Ooty']) whether or not the plan is cached
+        canonical_key = dataset.location_index.canonical_key
+        canonical = [canonical_key(loc) for loc in locations]
+        fixed_ends = []
+        for fixed_place in (start_place, end_place):
+            if not fixed_place:
+                fixed_ends.append(None)
+                continue
+            matches = [i for i, key in enumerate(canonical) if key == canonical_key(fixed_place)]
+            if not matches:
+                raise ValueError(f'{fixed_place} is not one of the places to visit.')
+            fixed_ends.append(matches[0])
+
+        with metrics.stage('ordering'):
+            distance_matrix = location_distance_matrix(
+                [location_clusters[loc][1] for loc in locations])
+            route = plan_route(distance_matrix, start=fixed_ends[0], end=fixed_ends[1],
+                               speed=dataset.travel_times.speed)
+        sorted_locations = [locations[i] for i in route.order]
+
+        head = {
+            'matched': [[a.id for a in location_attractions[loc]] for loc in locations],
+            'route': {
+                'order': route.order,
+                'distance_km': route.distance_km,
+                'travel_time': route.travel_time
+            }
+        }
+        if corrections:
+            # By position, the plan is cached for every spelling of these places
+            head['resolved'] = [corrections.get(loc) for loc in locations]
+        yield head
+
+        # Calculate days per location
+        total_locations = len(sorted_locations)
+        days_per_location = max(1, duration // total_locations)
+        remaining_days = duration - (days_per_location * total_locations)
+
+        # Days are handed to the caller as they are packed, so day packing is
+        # timed piecewise and recorded as one stage at the end
+        packing_seconds = 0.0
+        current_day = 0
+        for location in sorted_locations:
+            started = time.perf_counter()
+            # K-means clusters group nearby attractions, the scheduler
+            # packs each day from them
+            attraction_clusters, cluster_centers = location_clusters[location]
+            scheduler = DayScheduler(
+                dataset.attractions,
+                [[a.id for a in cluster] for cluster in attraction_clusters],
+                used_names,
+                spatial_index=dataset.spatial_index,
+                travel_times=dataset.travel_times
+            )
+            # Cluster centers for map visualization
+            centers = [[float(center[0]), float(center[1])] for center in cluster_centers]
+
+            # Calculate days for this location
+            location_days = days_per_location
+            if remaining_days > 0:
+                location_days += 1
+                remaining_days -= 1
+
+            # Create daily schedules for this location
+            for day in range(location_days):
+                if current_day >= duration:
+                    break
+
+                day_plan = scheduler.next_day(max_visit_minutes_per_day)
+
+                if day_plan.ids:
+                    current_visit_time = day_plan.visit_time + day_plan.travel_time
+
+                    # Calculate additional time
+                    food_time = len(day_plan.ids) * 60  # 1 hour for food per attraction
+                    total_time = current_visit_time + food_time
+
+                    packing_seconds += time.perf_counter() - started
+                    yield {
+                        'day': current_day + 1,
+                        'ids': day_plan.ids,
+                        'clusters': day_plan.clusters,
+                        'total_time': total_time,
+                        'visit_time': current_visit_time,
+                        'travel_time': day_plan.travel_time,
+                        'food_time': food_time,
+                        'cluster_centers': centers
+                    }
+                    started = time.perf_counter()
+                    current_day += 1
+            packing_seconds += time.perf_counter() - started
+        metrics.observe_stage('day_packing', packing_seconds)
 
 # Initialize travel planner
-travel_planner = SouthIndiaTravelPlanner()
+travel_planner = SouthIndiaTravelPlanner(
+    cluster_cache_size=config.CLUSTER_CACHE_SIZE,
+    cluster_cache_ttl=config.CLUSTER_CACHE_TTL,
+    warm_clusters=config.WARM_CLUSTER_CACHE,
+    kmeans_backend=config.KMEANS_BACKEND,
+    kmeans_metric=config.KMEANS_METRIC,
+    snapshot_path=config.DATASET_SNAPSHOT,
+    itinerary_cache_size=config.ITINERARY_CACHE_SIZE,
+    itinerary_cache_ttl=config.ITINERARY_CACHE_TTL,
+    itinerary_cache_backend=(SQLiteCacheBackend(config.ITINERARY_CACHE_DB,
+                                                ttl=config.ITINERARY_CACHE_TTL)
+                             if config.ITINERARY_CACHE_DB else None),
+    travel_times_path=config.TRAVEL_TIMES,
+    speed_profile=config.SPEED_PROFILE,
+    cluster_workers=config.CLUSTER_WORKERS
+)
+
+def batch_planner():
+    """Planner of a batch worker process, which builds its own by importing this module."""
+    return travel_planner
+
+# Shared by every /generate_itineraries request this process serves, one batch at a time
+batch_pool = BatchPool(batch_planner, config.BATCH_WORKERS)
+
+def reload_dataset(force=False):
+    """Reload attractions.csv into travel_planner, logging the outcome as a JSON line."""
+    result = travel_planner.reload_dataset(force=force)
+    if result['status'] != 'unchanged':
+        level = logging.WARNING if result['status'] == 'error' else logging.INFO
+        logger.log(level, json.dumps(dict(result, event='dataset_reload')))
+    return result
+
+# Rebuild in the background whenever attractions.csv changes on disk. Each process
+# starts its own watcher with its first request: threads do not survive a fork, and
+# one started at import in a preforking server's master would only reload the master.
+dataset_watcher = None
+_watcher_pid = None
+_watcher_lock = threading.Lock()
+
+def start_dataset_watcher():
+    """Start this process's dataset watcher, unless disabled or already running."""
+    global dataset_watcher, _watcher_pid
+    with _watcher_lock:
+        if _watcher_pid != os.getpid():
+            _watcher_pid = os.getpid()
+            dataset_watcher = None
+            if config.DATASET_WATCH_INTERVAL > 0:
+                # Compared with the file the dataset was loaded from, which under a
+                # preloading server may have changed before this worker's first request
+                source = travel_planner.dataset.source
+                loaded = (source['size'], source['mtime_ns']) if source else None
+                dataset_watcher = DatasetWatcher(DATASET_PATH, config.DATASET_WATCH_INTERVAL,
+                                                 reload_dataset, loaded=loaded).start()
+    return dataset_watcher
+
+@app.before_request
+def ensure_dataset_watcher():
+    if _watcher_pid != os.getpid():
+        start_dataset_watcher()
+
+@app.cli.command('build-snapshot')
+@click.option('--output', default=config.DATASET_SNAPSHOT or 'attractions.snapshot.npz',
+              help='Snapshot file to write.')
+def build_snapshot(output):
+    """Rebuild the dataset snapshot from attractions.csv."""
+    SouthIndiaTravelPlanner().save_snapshot(output)
+    click.echo(f'Wrote {output}')
+
+@app.cli.command('build-travel-times')
+@click.option('--output', default=config.TRAVEL_TIMES or 'travel_times.npy',
+              help='Matrix file to write, with a .json manifest next to it.')
+@click.option('--profile', default=config.SPEED_PROFILE, show_default=True,
+              type=click.Choice(sorted(PROFILES)), help='Speed profile.')
+@click.option('--edges', type=click.Path(exists=True, dir_okay=False),
+              help='CSV of from,to,minutes road times between attractions.')
+@click.option('--max-city-size', default=MAX_CITY_SIZE, show_default=True,
+              help='Cities with more attractions use the formula.')
+def build_travel_times_command(output, profile, edges, max_city_size):
+    """Precompute per-city travel-time matrices for attractions.csv."""
+    dataset = travel_planner.dataset
+    manifest = build_travel_times(output, dataset.attractions, dataset.version, profile,
+                                  edges, max_city_size)
+    click.echo(f"Wrote {output}: {len(manifest['cities'])} cities, "
+               f"{manifest['overridden_pairs']} road times")
+
+@app.cli.command('generate-itineraries')
+@click.argument('input_file', type=click.File('rb'), default='-')
+@click.argument('output_file', type=click.File('wb'), default='-')
+@click.option('--workers', default=config.BATCH_WORKERS, show_default=True,
+              help='Worker processes.')
+@click.option('--compact', is_flag=True, help='Write compact itineraries.')
+def generate_itineraries_command(input_file, output_file, workers, compact):
+    """Plan every JSONL request in INPUT_FILE, writing JSONL results in order."""
+    pool = BatchPool(batch_planner, workers)
+    try:
+        for line in generate_batch(travel_planner, input_file, pool=pool, compact=compact):
+            output_file.write(line)
+    finally:
+        pool.close()
 
 @app.route('/')
 def index():
     return render_template('index.html')
 
+@app.route('/nearby')
+def nearby():
+    try:
+        lat = request.args.get('lat', type=float)
+        lng = request.args.get('lng', type=float)
+        radius_km = request.args.get('radius_km', 5, type=float)
+        limit = request.args.get('limit', 50, type=int)
+        if lat is None or lng is None:
+            return jsonify({'error': 'lat and lng must be given as numbers.'})
+        if not 0 < radius_km <= MAX_NEARBY_RADIUS_KM:
+            return jsonify({'error': f'radius_km must be between 0 and {MAX_NEARBY_RADIUS_KM}.'})
+        if limit < 0:
+            return jsonify({'error': 'limit must not be negative.'})
+        with metrics.stage('nearby'):
+            attractions = travel_planner.nearby(lat, lng, radius_km,
+                                                category=request.args.get('category'),
+                                                limit=min(limit, config.NEARBY_MAX_LIMIT))
+        return json_response({'attractions': attractions})
+
+    except Exception as e:
+        return jsonify({'error': str(e)})
+
+@app.route('/suggest_places')
+def suggest_places():
+    q = request.args.get('q', '').strip()
+    limit = request.args.get('limit', 5, type=int)
+    if not q:
+        return jsonify({'error': 'q must be given.'})
+    if limit < 0:
+        return jsonify({'error': 'limit must not be negative.'})
+    suggestions = travel_planner.suggest_places(q, limit=min(limit, config.SUGGEST_MAX_LIMIT))
+    return jsonify({'suggestions': [s._asdict() for s in suggestions]})
+
+@app.route('/cache_stats')
+def cache_stats():
+    return jsonify({
+        'clusters': travel_planner.cluster_cache.stats(),
+        'itineraries': travel_planner.itinerary_cache.stats()
+    })
+
+@app.route('/admin/reload_dataset', methods=['POST'])
+def admin_reload_dataset():
+    # Disabled unless ADMIN_TOKEN is set, send the token in an X-Admin-Token header.
+    # The rebuild runs in a background thread unless ?wait=1, ?force=1 rebuilds
+    # even when the file is unchanged.
+    if not config.ADMIN_TOKEN:
+        return 'Admin endpoints are disabled\n', 404, {'Content-Type': 'text/plain'}
+    token = request.headers.get('X-Admin-Token', '')
+    if not hmac.compare_digest(token.encode(), config.ADMIN_TOKEN.encode()):
+        return jsonify({'error': 'Invalid admin token.'}), 403
+    force = bool(request.args.get('force'))
+    if request.args.get('wait'):
+        return jsonify(reload_dataset(force=force))
+    threading.Thread(target=reload_dataset, args=(force,), name='dataset-reload',
+                     daemon=True).start()
+    return jsonify({'status': 'started',
+                    'dataset_version': travel_planner.dataset_version}), 202
+
+@app.route('/metrics')
+def prometheus_metrics():
+    if not metrics.enabled:
+        return 'Metrics are disabled\n', 404, {'Content-Type': 'text/plain'}
+    lines = metrics.render()
+    caches = (('clusters', travel_planner.cluster_cache.stats()),
+              ('itineraries', travel_planner.itinerary_cache.stats()))
+    for stat, kind in (('hits', 'counter'), ('misses', 'counter'), ('size', 'gauge')):
+        name = f'cache_{stat}_total' if kind == 'counter' else f'cache_{stat}'
+        lines.extend(format_metric(name, kind, f'Cache {stat}.',
+                                   [((('cache', cache),), stats[stat]) for cache, stats in caches]))
+    dataset = travel_planner.dataset
+    lines.extend(format_metric('dataset_info', 'gauge', 'Active dataset version.',
+                               [((('version', dataset.version),), 1)]))
+    lines.extend(format_metric('dataset_loaded_timestamp_seconds', 'gauge',
+                               'When the active dataset was loaded.', [((), dataset.loaded_at)]))
+    lines.extend(format_metric('dataset_reloads_total', 'counter', 'Dataset reload attempts.',
+                               [((('status', status),), count)
+                                for status, count in travel_planner.reload_counts.items()]))
+    return '\n'.join(lines) + '\n', 200, {'Content-Type': 'text/plain; version=0.0.4'}
+
+def json_response(result):
+    """Encode a result with the fast encoder, gzipped when large and accepted."""
+    body, encoding = compress(dumps(result), request.headers.get('Accept-Encoding', ''),
+                              config.GZIP_MIN_BYTES)
+    response = app.response_class(body, mimetype='application/json')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+def log_request(data, result, seconds, trace=None):
+    """
+    Log one itinerary request as a JSON line.
+
+    Errors and traced requests are always logged, other requests only with
+    probability LOG_SAMPLE_RATE.
+    """
+    error = result.get('error')
+    if error is None and trace is None and random.random() >= config.LOG_SAMPLE_RATE:
+        return
+    record = {
+        'event': 'generate_itinerary',
+        'status': 'error' if error else 'ok',
+        'duration_ms': round(seconds * 1000, 3),
+        'places': data.get('places') if isinstance(data, dict) else None,
+        'days': len(result.get('itinerary', [])),
+    }
+    if error:
+        record['error'] = error
+    if trace is not None:
+        record['trace_id'] = trace.id
+        record['stages_ms'] = {name: round(stage_seconds * 1000, 3)
+                               for name, stage_seconds in trace.stages.items()}
+    logger.log(logging.WARNING if error else logging.INFO, json.dumps(record))
+
 @app.route('/generate_itinerary', methods=['POST'])
 def generate_itinerary():
+    started = time.perf_counter()
+    # Send an X-Trace-Id header (or ?trace=1) to get per-stage timings logged
+    trace_id = request.headers.get('X-Trace-Id')
+    trace = metrics.start_trace(trace_id) if trace_id or request.args.get('trace') else None
+    data = None
     try:
-        data = request.get_json()
-        print("Received data:", data)  # Add this line
-        places = [p.strip() for p in data['places'].split(';') if p.strip()]
-        duration = int(data['duration'])
-        start_date = data['startDate']
-        max_hours = int(data['maxHours'])
-
-        result = travel_planner.generate_itinerary(
-            places, duration, start_date, max_hours
-        )
+        try:
+            data = request.get_json()
+            kwargs = itinerary_request(data)
+            # {"format": "compact"} or ?format=compact, see compact_itinerary
+            if request.args.get('format'):
+                kwargs['compact'] = request.args['format'] == 'compact'
+
+            result = travel_planner.generate_itinerary(**kwargs)
+
+        except Exception as e:
+            result = {'error': str(e)}
+
+        with metrics.stage('serialization'):
+            response = json_response(result)
+    finally:
+        if trace is not None:
+            metrics.end_trace()
 
-        print("Result:", result)  # And this line
-        return jsonify(result)
+    seconds = time.perf_counter() - started
+    metrics.observe_request('generate_itinerary', 'error' if 'error' in result else 'ok', seconds)
+    log_request(data, result, seconds, trace)
+    if trace is not None:
+        response.headers['X-Trace-Id'] = trace.id
+    return response
 
+@app.route('/generate_itineraries', methods=['POST'])
+def generate_itineraries():
+    # JSONL in, JSONL out, one result or {"error": ...} per record in input order
+    try:
+        lines = generate_batch(travel_planner, request.stream, pool=batch_pool,
+                               compact=request.args.get('format') == 'compact', blocking=False)
+    except BatchPoolBusy as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '1'}
+    return app.response_class(stream_with_context(lines), mimetype='application/x-ndjson')
+
+@app.route('/generate_itinerary/stream', methods=['GET', 'POST'])
+def stream_itinerary():
+    # Days are sent as they are planned, see iter_itinerary for the events. The
+    # stream is NDJSON, or Server-Sent Events when the client accepts
+    # text/event-stream (EventSource can pass the fields as query parameters).
+    sse = 'text/event-stream' in request.headers.get('Accept', '')
+    try:
+        data = request.get_json() if request.method == 'POST' else request.args
+        kwargs = itinerary_request(data)
+        if request.args.get('format'):
+            kwargs['compact'] = request.args['format'] == 'compact'
+        events = travel_planner.iter_itinerary(**kwargs)
     except Exception as e:
-        print("Error:", e)  # And this line
-        return jsonify({'error': str(e)})
+        events = iter([{'type': 'error', 'error': str(e)}])
+
+    def encode():
+        for event in events:
+            if sse:
+                yield b'event: ' + event['type'].encode() + b'\ndata: ' + dumps(event) + b'\n\n'
+            else:
+                yield dumps(event) + b'\n'
+
+    return app.response_class(stream_with_context(encode()),
+                              mimetype='text/event-stream' if sse else 'application/x-ndjson',
+                              headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
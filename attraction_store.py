@@ -0,0 +1,280 @@
+import sys
+
+import numpy as np
+
+# Column order of attractions.csv, kept for materialized records
+COLUMNS = (
+    'Name',
+    'Category',
+    'City',
+    'State',
+    'Latitude',
+    'Longitude',
+    'Rating',
+    'Estimated Visit Time (mins)',
+    'Review Count',
+    'Description',
+)
+
+
+def _read_only(array):
+    array.flags.writeable = False
+    return array
+
+
+def pack_strings(strings):
+    """
+    Pack strings into one UTF-8 buffer.
+
+    Args:
+        strings (iterable): Strings to pack
+
+    Returns:
+        tuple: (blob, offsets) where string i is blob[offsets[i]:offsets[i + 1]]
+    """
+    encoded = [string.encode('utf-8') for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(chunk) for chunk in encoded], out=offsets[1:])
+    return _read_only(np.frombuffer(b''.join(encoded), dtype=np.uint8)), _read_only(offsets)
+
+
+def unpack_strings(blob, offsets):
+    """Inverse of pack_strings, returns a list of str."""
+    data = blob.tobytes()
+    offsets = offsets.tolist()
+    return [data[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)]
+
+
+def _encode(values, intern=False):
+    """
+    Dictionary-encode a column of strings.
+
+    Args:
+        values (iterable): Column values
+        intern (bool): Whether to intern the distinct values
+
+    Returns:
+        tuple: (codes, levels) where levels[codes[i]] is the i-th value
+    """
+    level_codes = {}
+    codes = []
+    for value in values:
+        code = level_codes.get(value)
+        if code is None:
+            code = level_codes[value] = len(level_codes)
+        codes.append(code)
+
+    levels = tuple(sys.intern(value) if intern else value for value in level_codes)
+    if len(levels) <= np.iinfo(np.uint8).max + 1:
+        dtype = np.uint8
+    elif len(levels) <= np.iinfo(np.uint16).max + 1:
+        dtype = np.uint16
+    else:
+        dtype = np.int32
+    return _read_only(np.array(codes, dtype=dtype)), levels
+
+
+class AttractionRecord:
+    """
+    A read-only view of one attraction in an AttractionStore.
+
+    Supports the dictionary lookups the planner uses (attraction['City'],
+    attraction.get(...)) without copying the row; to_dict() materializes it.
+    """
+
+    __slots__ = ('store', 'id')
+
+    def __init__(self, store, attraction_id):
+        self.store = store
+        self.id = attraction_id
+
+    def __getitem__(self, column):
+        return self.store.value(self.id, column)
+
+    def get(self, column, default=None):
+        try:
+            return self.store.value(self.id, column)
+        except KeyError:
+            return default
+
+    def __eq__(self, other):
+        return (isinstance(other, AttractionRecord) and
+                self.store is other.store and self.id == other.id)
+
+    def __hash__(self):
+        return hash((id(self.store), self.id))
+
+    def __repr__(self):
+        return f'AttractionRecord({self.id}, {self.store.names[self.id]!r})'
+
+    def to_dict(self):
+        return self.store.record(self.id)
+
+
+class AttractionStore:
+    """
+    An immutable, column-oriented store of the attractions dataset.
+
+    Coordinates and numbers are NumPy arrays, categories/states/cities are
+    small-int codes into interned name tables, and descriptions are kept as one
+    UTF-8 blob that is only decoded for the rows that end up in a response.
+    Nothing in the store is mutated after construction, so it can be shared by
+    concurrent requests.
+    """
+
+    def __init__(self, names, categories, cities, states, latitudes, longitudes,
+                 ratings, visit_times, review_counts, descriptions):
+        """
+        Build the store from column sequences of equal length.
+        """
+        self.names = tuple(names)
+        self.name_codes, self.distinct_names = _encode(self.names)
+        self.category_codes, self.categories = _encode(categories, intern=True)
+        self.city_codes, self.cities = _encode(cities, intern=True)
+        self.state_codes, self.states = _encode(states, intern=True)
+
+        self.latitudes = _read_only(np.asarray(latitudes, dtype=np.float64))
+        self.longitudes = _read_only(np.asarray(longitudes, dtype=np.float64))
+        self.ratings = _read_only(np.asarray(ratings, dtype=np.float64))
+        self.visit_times = _read_only(np.asarray(visit_times, dtype=np.int32))
+        self.review_counts = _read_only(np.asarray(review_counts, dtype=np.int32))
+
+        self._description_blob, self._description_offsets = pack_strings(descriptions)
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Build the store from a list of attraction dictionaries.
+
+        Args:
+            records (list): Rows as produced by DataFrame.to_dict('records')
+
+        Returns:
+            AttractionStore: The store
+        """
+        return cls(*([record[column] for record in records] for column in COLUMNS))
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """
+        Build the store from a DataFrame with the attractions.csv columns.
+
+        Args:
+            df (pandas.DataFrame): The dataset
+
+        Returns:
+            AttractionStore: The store
+        """
+        return cls(*(df[column].tolist() if df[column].dtype.kind not in 'fiu'
+                     else df[column].to_numpy() for column in COLUMNS))
+
+    def to_arrays(self):
+        """
+        Export the store as NumPy arrays, for saving in a dataset snapshot.
+
+        Returns:
+            dict: Array name -> numpy.ndarray
+        """
+        arrays = {
+            'name_codes': self.name_codes,
+            'category_codes': self.category_codes,
+            'city_codes': self.city_codes,
+            'state_codes': self.state_codes,
+            'latitudes': self.latitudes,
+            'longitudes': self.longitudes,
+            'ratings': self.ratings,
+            'visit_times': self.visit_times,
+            'review_counts': self.review_counts,
+            'descriptions_blob': self._description_blob,
+            'descriptions_offsets': self._description_offsets,
+        }
+        for name in ('names', 'distinct_names', 'categories', 'cities', 'states'):
+            arrays[f'{name}_blob'], arrays[f'{name}_offsets'] = pack_strings(getattr(self, name))
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """
+        Rebuild a store exported with to_arrays, without re-encoding the columns.
+
+        Args:
+            arrays (dict): Array name -> numpy.ndarray
+
+        Returns:
+            AttractionStore: The store
+        """
+        store = cls.__new__(cls)
+        store.names = tuple(unpack_strings(arrays['names_blob'], arrays['names_offsets']))
+        store.distinct_names = tuple(
+            unpack_strings(arrays['distinct_names_blob'], arrays['distinct_names_offsets']))
+        for name in ('categories', 'cities', 'states'):
+            levels = unpack_strings(arrays[f'{name}_blob'], arrays[f'{name}_offsets'])
+            setattr(store, name, tuple(sys.intern(level) for level in levels))
+        for name in ('name_codes', 'category_codes', 'city_codes', 'state_codes',
+                     'latitudes', 'longitudes', 'ratings', 'visit_times', 'review_counts'):
+            setattr(store, name, _read_only(arrays[name]))
+        store._description_blob = _read_only(arrays['descriptions_blob'])
+        store._description_offsets = _read_only(arrays['descriptions_offsets'])
+        return store
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, attraction_id):
+        return AttractionRecord(self, attraction_id)
+
+    def __iter__(self):
+        return (AttractionRecord(self, i) for i in range(len(self)))
+
+    def description(self, attraction_id):
+        start, end = self._description_offsets[attraction_id:attraction_id + 2]
+        return self._description_blob[start:end].tobytes().decode('utf-8')
+
+    def value(self, attraction_id, column):
+        """
+        Read a single field of an attraction as a plain Python value.
+
+        Args:
+            attraction_id (int): Row id
+            column (str): Column name from attractions.csv
+
+        Returns:
+            The field value
+        """
+        if column == 'Name':
+            return self.names[attraction_id]
+        if column == 'Category':
+            return self.categories[self.category_codes[attraction_id]]
+        if column == 'City':
+            return self.cities[self.city_codes[attraction_id]]
+        if column == 'State':
+            return self.states[self.state_codes[attraction_id]]
+        if column == 'Latitude':
+            return float(self.latitudes[attraction_id])
+        if column == 'Longitude':
+            return float(self.longitudes[attraction_id])
+        if column == 'Rating':
+            return float(self.ratings[attraction_id])
+        if column == 'Estimated Visit Time (mins)':
+            return int(self.visit_times[attraction_id])
+        if column == 'Review Count':
+            return int(self.review_counts[attraction_id])
+        if column == 'Description':
+            return self.description(attraction_id)
+        raise KeyError(column)
+
+    def record(self, attraction_id, columns=COLUMNS):
+        """
+        Materialize one attraction as a new dictionary.
+
+        Args:
+            attraction_id (int): Row id
+            columns (tuple): Columns to include, all of them by default
+
+        Returns:
+            dict: The row, shaped like DataFrame.to_dict('records')
+        """
+        return {column: self.value(attraction_id, column) for column in columns}
+
+    def records(self, attraction_ids, columns=COLUMNS):
+        return [self.record(attraction_id, columns) for attraction_id in attraction_ids]
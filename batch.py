@@ -0,0 +1,251 @@
+import itertools
+import json
+import multiprocessing
+import os
+import threading
+
+from serialization import dumps
+
+# Records read ahead and planned together, bounding memory on long streams
+BATCH_WINDOW = 1024
+
+# Planner of a batch worker process, set once by _init_worker when it starts
+_planner = None
+
+
+def itinerary_request(data):
+    """
+    Read the generate_itinerary arguments from a request body.
+
+    Args:
+        data (dict): {places, duration, startDate, maxHours} with optional
+            startPlace, endPlace and format; places is a ';'-separated string
+            or a list
+
+    Returns:
+        dict: Keyword arguments for SouthIndiaTravelPlanner.generate_itinerary
+
+    Raises:
+        KeyError, ValueError, TypeError, AttributeError: On malformed input
+    """
+    places = data['places']
+    if isinstance(places, str):
+        places = places.split(';')
+    return {
+        'places': [p.strip() for p in places if p.strip()],
+        'duration': int(data['duration']),
+        'start_date': data['startDate'],
+        'max_hours': int(data['maxHours']),
+        'start_place': data.get('startPlace'),
+        'end_place': data.get('endPlace'),
+        'compact': data.get('format') == 'compact'
+    }
+
+
+def _parse_line(line):
+    """Parse one JSONL record into generate_itinerary arguments, or an error result."""
+    try:
+        return itinerary_request(json.loads(line)), None
+    except json.JSONDecodeError as e:
+        return None, {'error': f'Invalid JSON: {e}'}
+    except Exception as e:
+        return None, {'error': str(e)}
+
+
+def _plan_records(planner, records, compact):
+    """
+    Plan records that visit the same places, so they share matching and clustering.
+
+    Args:
+        planner (SouthIndiaTravelPlanner): Planner to use
+        records (list): (index, kwargs) pairs
+        compact (bool): Return compact responses for every record
+
+    Returns:
+        list: (index, encoded JSON line) pairs
+    """
+    lines = []
+    for index, kwargs in records:
+        try:
+            result = planner.generate_itinerary(
+                **dict(kwargs, compact=kwargs['compact'] or compact))
+        except Exception as e:
+            result = {'error': str(e)}
+        lines.append((index, dumps(result) + b'\n'))
+    return lines
+
+
+def _init_worker(planner_factory):
+    global _planner
+    _planner = planner_factory()
+
+
+def _plan_group(task):
+    """Pool task: plan a (records, compact, dataset version) group with the worker's planner."""
+    records, compact, version = task
+    # The serving process reloaded attractions.csv since, catch up before planning
+    if _planner.dataset_version != version:
+        _planner.reload_dataset()
+    return _plan_records(_planner, records, compact)
+
+
+class BatchPoolBusy(Exception):
+    """Raised when a BatchPool already runs as many batches as it allows."""
+
+
+class BatchPool:
+    """
+    Worker processes shared by every batch a server process runs.
+
+    Workers are started with forkserver (spawn where it is unavailable) rather
+    than forked from the serving process, whose other request threads may hold
+    locks a forked child would inherit locked. Each worker builds its planner
+    once with planner_factory, a module-level function it imports and calls,
+    so it holds its own copy of the dataset rather than sharing the serving
+    process's pages. Tasks carry the dataset version their batch was read
+    with, and a worker on another version reloads attractions.csv first. The
+    pool is created on first use in the process using it, so a preforking
+    server's workers each get their own.
+
+    At most max_batches batches use the pool at once, so concurrent requests
+    cannot multiply the number of processes; further batches wait for a slot
+    or are refused with BatchPoolBusy.
+    """
+
+    def __init__(self, planner_factory, workers, max_batches=1):
+        """
+        Args:
+            planner_factory (callable): Picklable function returning a planner
+            workers (int): Worker processes, 1 or less to plan in the caller's process
+            max_batches (int): Batches allowed to use the pool at the same time
+        """
+        self.planner_factory = planner_factory
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(max_batches)
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pid = None
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context(
+                    'forkserver' if 'forkserver' in methods else 'spawn')
+                self._pool = context.Pool(self.workers, initializer=_init_worker,
+                                          initargs=(self.planner_factory,))
+                self._pid = os.getpid()
+            return self._pool
+
+    def acquire(self, blocking=True):
+        """
+        Take a batch slot, starting the workers on first use.
+
+        Returns:
+            multiprocessing.pool.Pool: The workers, until release() is called
+
+        Raises:
+            BatchPoolBusy: When not blocking and every slot is taken
+        """
+        if not self._slots.acquire(blocking=blocking):
+            raise BatchPoolBusy('All batch workers are busy, try again later.')
+        try:
+            return self._get_pool()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self):
+        self._slots.release()
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None and self._pid == os.getpid():
+                self._pool.terminate()
+                self._pool.join()
+            self._pool = None
+
+
+def _group_window(planner, window):
+    """
+    Split a window of numbered lines into planner tasks and ready error lines.
+
+    Records are grouped on their canonical set of places.
+    """
+    groups = {}
+    errors = []
+    for index, line in window:
+        kwargs, error = _parse_line(line)
+        if error is not None:
+            errors.append((index, dumps(error) + b'\n'))
+            continue
+        key = tuple(sorted({planner.location_index.canonical_key(p) for p in kwargs['places']}))
+        groups.setdefault(key, []).append((index, kwargs))
+    return list(groups.values()), errors
+
+
+def generate_batch(planner, lines, pool=None, compact=False, window=BATCH_WINDOW,
+                   blocking=True):
+    """
+    Plan a stream of JSONL itinerary requests.
+
+    Each window of records is grouped by places and the groups are planned
+    by the pool's workers, or in this process with planner when there is no
+    pool or it has a single worker. Results are yielded as soon as every
+    earlier record is done, so output order always matches input order.
+
+    The pool slot is taken before this returns and released when the
+    returned generator is exhausted or closed.
+
+    Args:
+        planner (SouthIndiaTravelPlanner): Planner for grouping records, and
+            for planning them without workers
+        lines (iterable): JSONL records, as str or bytes; blank lines are skipped
+        pool (BatchPool): Worker processes, or None
+        compact (bool): Return compact responses for every record
+        window (int): Records read ahead and planned together
+        blocking (bool): Wait for a busy pool instead of raising
+
+    Returns:
+        generator: One JSON line (bytes) per record, the itinerary or {"error": message}
+
+    Raises:
+        BatchPoolBusy: When not blocking and the pool is busy
+    """
+    workers = None
+    if pool is not None and pool.workers > 1:
+        workers = pool.acquire(blocking)
+    batch = _stream_batch(planner, lines, workers, compact, window,
+                          pool.release if workers is not None else None)
+    # Enter the generator now, so closing it releases the slot even if it is never read
+    next(batch)
+    return batch
+
+
+def _stream_batch(planner, lines, workers, compact, window, release):
+    try:
+        yield
+        numbered = enumerate(line for line in lines if line.strip())
+        while True:
+            chunk = list(itertools.islice(numbered, window))
+            if not chunk:
+                break
+            version = planner.dataset_version
+            groups, errors = _group_window(planner, chunk)
+            if workers is not None:
+                results = workers.imap_unordered(_plan_group, [(group, compact, version)
+                                                               for group in groups])
+            else:
+                results = (_plan_records(planner, group, compact) for group in groups)
+
+            pending = dict(errors)
+            next_index = chunk[0][0]
+            # The leading empty group flushes errors that come before any planned record
+            for group_lines in itertools.chain([[]], results):
+                pending.update(group_lines)
+                while next_index in pending:
+                    yield pending.pop(next_index)
+                    next_index += 1
+    finally:
+        if release is not None:
+            release()
@@ -0,0 +1,61 @@
+"""
+Compare the memory held by list-of-dicts records and by AttractionStore.
+
+Each representation is loaded from the same synthetic CSV in a fresh
+subprocess, and tracemalloc reports what is still allocated once the
+DataFrame it was built from has been released.
+
+Run from the repository root:
+    python -m benchmarks.bench_attraction_store
+"""
+import gc
+import os
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+from benchmarks.synthetic import write_synthetic_csv
+
+SIZES = (200, 100_000, 1_000_000)
+
+
+def measure(representation, path):
+    import pandas as pd
+    from attraction_store import AttractionStore
+
+    tracemalloc.start()
+    df = pd.read_csv(path)
+    if representation == 'records':
+        data = df.to_dict('records')
+    else:
+        data = AttractionStore.from_dataframe(df)
+    del df
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    print(current)
+    return data
+
+
+def main():
+    print(f'{"rows":>9} {"records MiB":>12} {"store MiB":>10} {"ratio":>6}')
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in SIZES:
+            path = os.path.join(tmp, f'attractions_{n_rows}.csv')
+            write_synthetic_csv(path, n_rows)
+            sizes = {}
+            for representation in ('records', 'store'):
+                output = subprocess.run(
+                    [sys.executable, '-m', 'benchmarks.bench_attraction_store',
+                     representation, path],
+                    check=True, capture_output=True, text=True).stdout
+                sizes[representation] = int(output.split()[-1]) / 2 ** 20
+            print(f'{n_rows:>9} {sizes["records"]:>12.2f} {sizes["store"]:>10.2f} '
+                  f'{sizes["records"] / sizes["store"]:>6.1f}')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3:
+        measure(sys.argv[1], sys.argv[2])
+    else:
+        main()
@@ -0,0 +1,99 @@
+"""
+Compare batch itinerary throughput with serial POSTs to /generate_itinerary.
+
+The records repeat a small set of place combinations with varying durations
+and hours, like a nightly precomputation of popular packages. Every run
+starts with empty caches, and every batch result must equal the serial one.
+Worker processes build their planners before the timed run starts.
+
+Run from the repository root:
+    python -m benchmarks.bench_batch [n_records]
+"""
+import json
+import random
+import sys
+import time
+
+import app as app_module
+from batch import BatchPool, generate_batch
+
+PLACES = ['Ooty', 'Kodaikanal', 'Munnar', 'Mysore', 'Hampi', 'Gokarna', 'Chennai',
+          'Madurai', 'Kochi', 'Hyderabad', 'Tirupati', 'Panaji', 'Puducherry', 'Kovalam']
+
+
+def make_records(n, seed=42):
+    rng = random.Random(seed)
+    packages = [rng.sample(PLACES, rng.randint(1, 4)) for _ in range(max(1, n // 10))]
+    records = [{'places': '; '.join(rng.choice(packages)), 'duration': rng.randint(1, 7),
+                'startDate': '2026-01-01', 'maxHours': rng.randint(6, 12)} for _ in range(n)]
+    # A few malformed records, which must come back as errors in place
+    records[n // 3] = {'places': 'Ooty'}
+    records[n // 2] = {'places': 'Atlantis', 'duration': 2, 'startDate': '2026-01-01',
+                       'maxHours': 8}
+    return [json.dumps(record) for record in records]
+
+
+def clear_caches():
+    app_module.travel_planner.cluster_cache.clear()
+    app_module.travel_planner.itinerary_cache.clear()
+
+
+def run_serial(lines):
+    client = app_module.app.test_client()
+    return [client.post('/generate_itinerary', data=line,
+                        content_type='application/json').get_json() for line in lines]
+
+
+def start_pool(pool):
+    """Plan a few trips elsewhere, so every worker has loaded the dataset before timing."""
+    store = app_module.travel_planner.attractions
+    cities = sorted(set(store.cities) - set(PLACES))[:pool.workers * 4]
+    warmup = [json.dumps({'places': city, 'duration': 1, 'startDate': '2026-01-01',
+                          'maxHours': 8}) for city in cities]
+    list(generate_batch(app_module.travel_planner, warmup, pool=pool))
+    return pool
+
+
+def run_batch(lines, pool):
+    return [json.loads(line) for line in generate_batch(app_module.travel_planner, lines,
+                                                        pool=pool)]
+
+
+def run_endpoint(lines, pool):
+    app_module.batch_pool = pool
+    response = app_module.app.test_client().post('/generate_itineraries',
+                                                 data='\n'.join(lines) + '\n')
+    return [json.loads(line) for line in response.get_data().splitlines()]
+
+
+def timed(run, *args):
+    clear_caches()
+    start = time.perf_counter()
+    results = run(*args)
+    return results, time.perf_counter() - start
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    lines = make_records(n)
+    # Load the clustering backend once, outside the timings
+    app_module.travel_planner.generate_itinerary(['Ooty'], 1, '2026-01-01', 8)
+
+    expected, seconds = timed(run_serial, lines)
+    assert 'error' in expected[n // 3] and 'error' in expected[n // 2]
+    print(f'{"serial POSTs":<24} {n / seconds:8.1f} records/s')
+
+    cases = [(f'batch, {w} worker{"s" if w > 1 else ""}', run_batch, w) for w in (1, 2, 4)]
+    cases.append(('endpoint, 2 workers', run_endpoint, 2))
+    for name, run, workers in cases:
+        pool = start_pool(BatchPool(app_module.batch_planner, workers))
+        try:
+            results, seconds = timed(run, lines, pool)
+        finally:
+            pool.close()
+        assert results == expected, name
+        print(f'{name:<24} {n / seconds:8.1f} records/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Check that concurrent requests get exactly the answers they get one at a time.
+
+Hundreds of mixed requests go through the Flask test client: full and
+compact itineraries, streamed itineraries, nearby searches and place
+suggestions, with typos and errors among them. They are served serially,
+then from many threads, then from many threads with parallel clustering,
+then from forked workers sharing the planner loaded before the fork. Each
+run starts from empty caches and every response body must be identical to
+the serial one.
+
+A few itineraries visit more than EXACT_LIMIT places, whose order comes
+from the route heuristic and must not depend on load either. A shorter
+run of the same checks is tests/test_concurrency.py.
+
+Run from the repository root:
+    python -m benchmarks.bench_concurrency [n_requests] [n_threads]
+"""
+import logging
+import sys
+import time
+import warnings
+
+import app as app_module
+from tests.helpers import clear_caches, make_requests, run_forked, run_threads, send
+
+N_PROCESSES = 2
+CLUSTER_WORKERS = 4
+
+
+def timed(label, run, requests, expected=None):
+    clear_caches()
+    start = time.perf_counter()
+    results = run(requests)
+    seconds = time.perf_counter() - start
+    print(f'{label:<34} {seconds:7.2f} s {len(requests) / seconds:8.1f} req/s')
+    if expected is not None:
+        mismatches = [request for request, a, b in zip(requests, results, expected) if a != b]
+        assert not mismatches, mismatches[:3]
+    return results
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    n_threads = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    app_module.logger.setLevel(logging.ERROR)
+    warnings.filterwarnings('ignore', message='Number of distinct clusters')
+    planner = app_module.travel_planner
+    requests = make_requests(planner, n)
+    # Untimed, pays for lazy imports before the serial run is measured
+    for request in requests[:20]:
+        send(request)
+
+    expected = timed('serial', lambda r: [send(request) for request in r], requests)
+    errors = sum(status != 200 or b'"error"' in body for status, body in expected)
+    print(f'{n} requests, {errors} answered with an error')
+
+    timed(f'{n_threads} threads', lambda r: run_threads(r, n_threads), requests, expected)
+    planner.cluster_workers = CLUSTER_WORKERS
+    timed(f'{n_threads} threads, {CLUSTER_WORKERS} cluster workers',
+          lambda r: run_threads(r, n_threads), requests, expected)
+    planner.cluster_workers = 0
+    timed(f'{N_PROCESSES} forked workers', lambda r: run_forked(r, N_PROCESSES), requests,
+          expected)
+    print('all responses identical to serial')
+
+
+if __name__ == '__main__':
+    main()
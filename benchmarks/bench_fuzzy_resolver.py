@@ -0,0 +1,57 @@
+"""
+Benchmark typo-tolerant place suggestions on dictionaries of up to 100k names.
+
+Queries are dictionary names with one random typo (substitution, deletion,
+insertion or swap of neighbours). The name typed at must come back among
+the top suggestions, and a sample of queries is checked against a brute-force
+edit-distance scan of the whole dictionary. The accuracy and latency checks
+are tests/test_fuzzy_resolver.py, repeated here at every size.
+
+Run from the repository root:
+    python -m benchmarks.bench_fuzzy_resolver [n_names]
+"""
+import random
+import sys
+import time
+
+import numpy as np
+
+import app as app_module
+from fuzzy_resolver import FuzzyResolver
+from tests.helpers import (assert_planner_corrects_typos, shortlist_mismatches,
+                           suggestion_accuracy, synthetic_place_names, typo_queries)
+
+N_QUERIES = 1000
+N_CHECKED = 5
+
+
+def main():
+    assert_planner_corrects_typos(app_module.travel_planner)
+    n_max = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    all_names = synthetic_place_names(n_max)
+    rng = random.Random(42)
+
+    print(f"{'names':>8} {'build s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'top-1':>7} {'top-5':>7}")
+    for n in sorted({n for n in (1000, 10000) if n < n_max} | {n_max}):
+        names = all_names[:n]
+        start = time.perf_counter()
+        resolver = FuzzyResolver((name, name) for name in names)
+        build = time.perf_counter() - start
+
+        targets, queries = typo_queries(names, N_QUERIES, rng)
+        top1, top5, latencies = suggestion_accuracy(resolver, targets, queries)
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+        print(f'{n:8d} {build:8.2f} {p50:8.3f} {p95:8.3f} {p99:8.3f} '
+              f'{top1:7.1%} {top5:7.1%}')
+        assert top5 >= 0.95, n
+
+        # The trigram shortlist finds the best edit-distance match of a full scan
+        start = time.perf_counter()
+        assert not shortlist_mismatches(resolver, names, queries[:N_CHECKED])
+        scan = (time.perf_counter() - start) / N_CHECKED
+        print(f'{"":8} full edit-distance scan: {scan * 1000:.3f} ms per query')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Check the vectorized haversine kernel against the scalar formula and time both.
+
+The equivalence check is tests/test_geo.py, repeated here first.
+
+Run from the repository root:
+    python -m benchmarks.bench_geo
+"""
+import time
+
+import numpy as np
+
+from geo import haversine_km, pairwise_haversine_km
+from tests.helpers import assert_haversine_matches_scalar, random_points, scalar_distance
+
+
+def check_equivalence(rng, n=100_000):
+    assert_haversine_matches_scalar(rng, n)
+    print(f'equivalence: {n} distances and travel times match the scalar formula')
+
+
+def best_of(func, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    rng = np.random.default_rng(42)
+    check_equivalence(rng)
+
+    for n in (10, 100, 1000):
+        lats, lons = random_points(rng, n)
+        lat_list, lon_list = lats.tolist(), lons.tolist()
+        scalar = best_of(lambda: [scalar_distance(lat_list[0], lon_list[0], lat, lon)
+                                  for lat, lon in zip(lat_list, lon_list)])
+        vector = best_of(lambda: haversine_km(lats[0], lons[0], lats, lons))
+        print(f'one-to-many  n={n:>5}: scalar {scalar * 1e6:10.1f} us  '
+              f'vectorized {vector * 1e6:8.1f} us')
+
+    for n in (10, 100, 500):
+        lats, lons = random_points(rng, n)
+        lat_list, lon_list = lats.tolist(), lons.tolist()
+        scalar = best_of(lambda: [[scalar_distance(a, b, c, d)
+                                   for c, d in zip(lat_list, lon_list)]
+                                  for a, b in zip(lat_list, lon_list)], repeat=2)
+        vector = best_of(lambda: pairwise_haversine_km(lats, lons))
+        print(f'many-to-many n={n:>5}: scalar {scalar * 1e6:10.1f} us  '
+              f'vectorized {vector * 1e6:8.1f} us')
+
+
+if __name__ == '__main__':
+    main()
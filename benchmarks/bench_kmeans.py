@@ -0,0 +1,60 @@
+"""
+Compare the sklearn and NumPy TravelKMeans backends.
+
+Reports per-fit latency on city-sized attraction sets, and the cost of
+importing kmeans_clustering plus the first fit in a fresh interpreter.
+
+Run from the repository root:
+    python -m benchmarks.bench_kmeans
+"""
+import subprocess
+import sys
+import time
+import warnings
+
+from tests.helpers import synthetic_attractions
+from kmeans_clustering import TravelKMeans
+
+COLD_START = '''
+import time
+start = time.perf_counter()
+from kmeans_clustering import TravelKMeans
+TravelKMeans(3, backend={backend!r}).fit(
+    [{{'Latitude': 10.0 + i / 100, 'Longitude': 77.0 + i / 70}} for i in range(12)])
+print(time.perf_counter() - start)
+'''
+
+
+def fit_latency(backend, attractions, repeat=50):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        TravelKMeans(min(3, len(attractions)), backend=backend).fit(attractions)
+    return (time.perf_counter() - start) / repeat
+
+
+def cold_start(backend, repeat=3):
+    times = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-W', 'ignore', '-c',
+                                 COLD_START.format(backend=backend)],
+                                check=True, capture_output=True, text=True).stdout
+        times.append(float(output))
+    return min(times)
+
+
+def main():
+    warnings.simplefilter('ignore')
+    attractions = synthetic_attractions(5000)
+    for size in (3, 12, 50, 500):
+        sample = attractions[:size]
+        sklearn = fit_latency('sklearn', sample)
+        numpy = fit_latency('numpy', sample)
+        print(f'fit n={size:>4}: sklearn {sklearn * 1000:7.2f} ms  '
+              f'numpy {numpy * 1000:7.2f} ms')
+
+    for backend in ('sklearn', 'numpy'):
+        print(f'import + first fit ({backend}): {cold_start(backend) * 1000:7.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
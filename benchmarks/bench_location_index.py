@@ -0,0 +1,58 @@
+"""
+Compare LocationIndex lookups with the per-row matches_location scan.
+
+The equivalence check is tests/test_location_index.py, repeated here first.
+
+Run from the repository root:
+    python -m benchmarks.bench_location_index
+"""
+import time
+
+from app import SouthIndiaTravelPlanner
+from location_index import LocationIndex
+from tests.helpers import location_index_mismatches, scan, synthetic_attractions
+
+
+def check_equivalence(planner, attractions):
+    checked, mismatches = location_index_mismatches(planner, attractions)
+    assert not mismatches, mismatches
+    return checked
+
+
+def time_lookup(index, place, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        index.lookup(place)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    planner = SouthIndiaTravelPlanner()
+
+    checked = check_equivalence(planner, planner.attractions)
+    checked += check_equivalence(planner, synthetic_attractions(5000))
+    print(f'equivalence: {checked} places match the full scan')
+
+    # Lookup cost follows the number of matches, so a selective place (one
+    # attraction name) shows the per-row cost that the index removes.
+    for n_rows in (200, 100_000, 500_000):
+        attractions = synthetic_attractions(n_rows)
+        selective = attractions[-1]['Name']
+
+        start = time.perf_counter()
+        index = LocationIndex(attractions, planner.location_variations)
+        build = time.perf_counter() - start
+
+        sample = attractions[:min(n_rows, 50_000)]
+        start = time.perf_counter()
+        scan(planner, sample, selective)
+        scan_time = (time.perf_counter() - start) * n_rows / len(sample)
+
+        print(f'{n_rows:>8} rows: build {build * 1000:9.1f} ms  '
+              f'selective lookup {time_lookup(index, selective) * 1000:7.3f} ms  '
+              f'alias lookup {time_lookup(index, "mysuru") * 1000:7.3f} ms  '
+              f'full scan {scan_time * 1000:9.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Measure the overhead of the per-stage latency instrumentation.
+
+Times a bare metrics.stage() block, then whole /generate_itinerary requests
+through the Flask test client with instrumentation on and off. The itinerary
+cache is cleared before every request so each one runs every stage. Also
+checks the /metrics output and the trace id round trip.
+
+Run from the repository root:
+    python -m benchmarks.bench_metrics
+"""
+import time
+
+import app as app_module
+from metrics import Metrics
+
+REQUESTS = [
+    {'places': 'Ooty; Kodaikanal', 'duration': '3', 'startDate': '2026-01-01', 'maxHours': '8'},
+    {'places': 'Mysore; Hampi; Gokarna', 'duration': '5', 'startDate': '2026-01-01',
+     'maxHours': '8'},
+    {'places': 'Chennai', 'duration': '2', 'startDate': '2026-01-01', 'maxHours': '6'},
+]
+ROUNDS = 100
+
+
+def time_stage_calls(enabled, n=200000):
+    metrics = Metrics(enabled=enabled)
+    start = time.perf_counter()
+    for _ in range(n):
+        with metrics.stage('matching'):
+            pass
+    return (time.perf_counter() - start) / n
+
+
+def time_requests(client):
+    """
+    Time every request with instrumentation on and off, interleaved to cancel drift.
+
+    Returns:
+        tuple: Sums over REQUESTS of the median times, enabled and disabled
+    """
+    times = {(i, enabled): [] for i in range(len(REQUESTS)) for enabled in (True, False)}
+    for _ in range(ROUNDS):
+        for i, payload in enumerate(REQUESTS):
+            for enabled in (True, False):
+                app_module.metrics.enabled = enabled
+                app_module.travel_planner.itinerary_cache.clear()
+                start = time.perf_counter()
+                response = client.post('/generate_itinerary', json=payload)
+                times[i, enabled].append(time.perf_counter() - start)
+                assert 'itinerary' in response.get_json()
+    return tuple(sum(sorted(times[i, enabled])[ROUNDS // 2] for i in range(len(REQUESTS)))
+                 for enabled in (True, False))
+
+
+def check_endpoints(client):
+    app_module.metrics.enabled = True
+    response = client.post('/generate_itinerary', json=REQUESTS[0],
+                           headers={'X-Trace-Id': 'bench-trace'})
+    assert response.headers['X-Trace-Id'] == 'bench-trace'
+
+    text = client.get('/metrics').get_data(as_text=True)
+    for stage in ('matching', 'clustering', 'ordering', 'day_packing', 'serialization'):
+        assert f'itinerary_stage_seconds_count{{stage="{stage}"}}' in text, stage
+    assert 'http_request_seconds_bucket{endpoint="generate_itinerary",status="ok",le="+Inf"}' in text
+
+    app_module.metrics.enabled = False
+    assert client.get('/metrics').status_code == 404
+
+
+def main():
+    on, off = time_stage_calls(True), time_stage_calls(False)
+    print(f'stage() enabled      {on * 1e6:8.3f} us per block')
+    print(f'stage() disabled     {off * 1e6:8.3f} us per block')
+
+    client = app_module.app.test_client()
+    check_endpoints(client)
+    time_requests(client)  # Warm up the cluster cache
+    enabled, disabled = time_requests(client)
+    print(f'requests, enabled    {enabled * 1000:8.3f} ms (sum of medians)')
+    print(f'requests, disabled   {disabled * 1000:8.3f} ms (sum of medians)')
+    print(f'overhead             {(enabled - disabled) / disabled * 100:+8.2f} %')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+Measure dataset hot reloads and check that requests stay consistent across swaps.
+
+A synthetic dataset is written to a temporary CSV and one city's attractions
+are moved. A reload must re-cluster only the places covering that city, and
+is compared with a cold start that clusters every known location. Requests
+served from threads while versions are swapped back and forth must each
+match the serial answer for the version they report.
+
+Run from the repository root:
+    python -m benchmarks.bench_reload [n_rows]
+"""
+import csv
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import app as app_module
+from tests.helpers import synthetic_attractions
+from dataset import DatasetWatcher
+
+MOVED_CITY = 'Munnar'
+QUERIES = [
+    (['Munnar', 'Kochi'], 3, 8),
+    (['Ooty', 'Kodaikanal'], 3, 8),
+    (['Kerala'], 5, 10),
+    (['Mysore', 'Hampi', 'Gokarna'], 4, 10),
+]
+N_THREADS = 4
+N_SWAPS = 6
+
+
+def write_rows(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def move_city(rows, city, offset=0.002):
+    return [dict(row, Latitude=row['Latitude'] + offset) if row['City'] == city else row
+            for row in rows]
+
+
+def answers(planner):
+    return [planner.generate_itinerary(places, duration, '2026-01-01', max_hours)
+            for places, duration, max_hours in QUERIES]
+
+
+def hammer(planner, expected, stop, failures):
+    while not stop.is_set():
+        for i, (places, duration, max_hours) in enumerate(QUERIES):
+            result = planner.generate_itinerary(places, duration, '2026-01-01', max_hours)
+            version_answers = expected.get(result.get('dataset_version'))
+            if version_answers is None or result != version_answers[i]:
+                failures.append(QUERIES[i])
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rows = synthetic_attractions(n)
+    moved = move_city(rows, MOVED_CITY)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'attractions.csv')
+        write_rows(path, rows)
+        app_module.DATASET_PATH = path
+
+        start = time.perf_counter()
+        planner = app_module.SouthIndiaTravelPlanner(warm_clusters=True)
+        cold = time.perf_counter() - start
+        print(f'cold start, every location clustered: {cold:8.2f} s')
+        original = planner.dataset_version
+        expected = {original: answers(planner)}
+
+        write_rows(path, moved)
+        result = planner.reload_dataset()
+        assert result['status'] == 'reloaded' and result['changed_cities'] == 1, result
+        print(f"reload, {MOVED_CITY} moved:               {result['seconds']:8.2f} s "
+              f"({result['reclustered']} places re-clustered)")
+        expected[planner.dataset_version] = answers(planner)
+        assert len(set(expected)) == 2
+
+        # Unchanged files are not rebuilt
+        assert planner.reload_dataset()['status'] == 'unchanged'
+
+        # Swap versions back and forth under load
+        stop, failures = threading.Event(), []
+        threads = [threading.Thread(target=hammer, args=(planner, expected, stop, failures))
+                   for _ in range(N_THREADS)]
+        for thread in threads:
+            thread.start()
+        for i in range(N_SWAPS):
+            write_rows(path, rows if i % 2 == 0 else moved)
+            assert planner.reload_dataset()['status'] == 'reloaded'
+            time.sleep(0.2)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        assert not failures, failures[:3]
+        print(f'{N_SWAPS} swaps under {N_THREADS} request threads: all responses consistent')
+
+        # The watcher picks up a change on its own
+        before = planner.dataset_version
+        watcher = DatasetWatcher(path, 0.05, planner.reload_dataset).start()
+        write_rows(path, moved if before == original else rows)
+        deadline = time.time() + 30
+        while planner.dataset_version == before and time.time() < deadline:
+            time.sleep(0.05)
+        watcher.stop()
+        assert planner.dataset_version != before
+
+
+if __name__ == '__main__':
+    main()
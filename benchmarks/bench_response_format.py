@@ -0,0 +1,91 @@
+"""
+Compare payload size and encode time of the full and compact responses.
+
+Each mode is encoded with Flask's jsonify (the previous path), the standard
+json module and serialization.dumps (orjson when installed), and measured raw
+and gzipped. Also checks that compact days resolve to the same attractions as
+full ones and that the endpoint gzips large responses.
+
+Run from the repository root:
+    python -m benchmarks.bench_response_format
+"""
+import gzip
+import json
+import time
+
+import app as app_module
+from itinerary_format import COMPACT_COLUMNS
+from serialization import GZIP_LEVEL, dumps
+
+QUERIES = [
+    (['Ooty', 'Kodaikanal'], 3, 8),
+    (['Mysore', 'Hampi', 'Gokarna'], 7, 10),
+    (['Chennai', 'Madurai', 'Thanjavur', 'Kochi', 'Munnar'], 7, 12),
+    (['Kerala'], 7, 10),
+    (['Tamil Nadu', 'Hyderabad'], 7, 12),
+]
+REPEAT = 50
+
+
+def best_time(encode, result):
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        encode(result)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def check_compact(full, compact):
+    assert 'all_attractions' not in compact
+    for full_day, compact_day in zip(full['itinerary'], compact['itinerary'], strict=True):
+        rows = [compact['attractions'][str(i)] for i in compact_day['attractions']]
+        expected = [{column: a[column] for column in COMPACT_COLUMNS}
+                    for a in full_day['attractions']]
+        assert rows == expected
+        assert compact_day['clusters'] == [a['cluster'] for a in full_day['attractions']]
+    assert compact['route'] == full['route']
+
+
+def check_endpoint():
+    client = app_module.app.test_client()
+    payload = {'places': 'Kerala', 'duration': '7', 'startDate': '2026-01-01',
+               'maxHours': '10'}
+    plain = client.post('/generate_itinerary', json=payload)
+    zipped = client.post('/generate_itinerary?format=compact', json=payload,
+                         headers={'Accept-Encoding': 'gzip'})
+    assert zipped.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(zipped.get_data()))['format'] == 'compact'
+    assert 'all_attractions' in plain.get_json()
+
+
+def main():
+    planner = app_module.travel_planner
+    encoders = [
+        ('jsonify', lambda result: app_module.app.json.response(result).get_data()),
+        ('json', lambda result: json.dumps(result).encode('utf-8')),
+        ('dumps', dumps),
+    ]
+    check_endpoint()
+
+    print(f"{'query':<40} {'mode':<8} {'bytes':>9} {'gzip':>8}"
+          + ''.join(f' {name + " ms":>11}' for name, _ in encoders) + f" {'gzip ms':>9}")
+    with app_module.app.app_context():
+        for places, duration, max_hours in QUERIES:
+            full = planner.generate_itinerary(places, duration, '2026-01-01', max_hours)
+            compact = planner.generate_itinerary(places, duration, '2026-01-01', max_hours,
+                                                 compact=True)
+            check_compact(full, compact)
+            for mode, result in (('full', full), ('compact', compact)):
+                body = dumps(result)
+                assert json.loads(body) == json.loads(json.dumps(result))
+                timings = ''.join(f' {best_time(encode, result) * 1000:11.3f}'
+                                  for _, encode in encoders)
+                gzip_time = best_time(lambda b: gzip.compress(b, compresslevel=GZIP_LEVEL), body)
+                print(f"{'; '.join(places)[:40]:<40} {mode:<8} {len(body):9d} "
+                      f"{len(gzip.compress(body, compresslevel=GZIP_LEVEL)):8d}{timings} "
+                      f"{gzip_time * 1000:9.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Check plan_route against brute force and time it per number of locations.
+
+Exact ordering (up to route_order.EXACT_LIMIT locations) must match a
+brute-force search; larger inputs must come back within the latency budget,
+and with the same route every time.
+
+Run from the repository root:
+    python -m benchmarks.bench_route_order
+"""
+import itertools
+import time
+
+import numpy as np
+
+from geo import pairwise_haversine_km
+from route_order import EXACT_LIMIT, plan_route
+
+LATENCY_BUDGET = 0.1  # seconds any plan_route call may take
+
+
+def path_length(order, distances):
+    return sum(distances[a, b] for a, b in zip(order, order[1:]))
+
+
+def brute_force_length(distances, start=None, end=None):
+    best = None
+    for order in itertools.permutations(range(len(distances))):
+        if (start is not None and order[0] != start) or (end is not None and order[-1] != end):
+            continue
+        length = path_length(order, distances)
+        best = length if best is None else min(best, length)
+    return best
+
+
+def random_distances(rng, n):
+    lats, lons = rng.uniform(8, 19, n), rng.uniform(73, 85, n)
+    return pairwise_haversine_km(lats, lons)
+
+
+def main():
+    rng = np.random.default_rng(42)
+
+    for n in range(2, EXACT_LIMIT + 1):
+        for _ in range(20):
+            distances = random_distances(rng, n)
+            for start, end in ((None, None), (0, None), (None, n - 1), (0, n - 1)):
+                route = plan_route(distances, start=start, end=end)
+                assert sorted(route.order) == list(range(n))
+                expected = brute_force_length(distances, start, end)
+                assert abs(path_length(route.order, distances) - expected) < 1e-6, (n, start, end)
+    print(f'exact: orders for 2..{EXACT_LIMIT} locations match brute force')
+
+    for n in (3, 5, 7, 8, 12, 20, 50, 100):
+        distances = random_distances(rng, n)
+        times, orders = [], set()
+        for _ in range(5):
+            start = time.perf_counter()
+            route = plan_route(distances)
+            times.append(time.perf_counter() - start)
+            orders.add(tuple(route.order))
+        assert max(times) < LATENCY_BUDGET, f'{n} locations took {max(times):.3f}s'
+        assert len(orders) == 1, f'{n} locations gave {len(orders)} different routes'
+        mode = 'exact' if n <= EXACT_LIMIT else 'heuristic'
+        print(f'{n:>4} locations ({mode:<9}): worst {max(times) * 1000:7.2f} ms  '
+              f'travel {route.travel_time} min')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark DayScheduler on synthetic cities and check the itinerary schema.
+
+The legacy nested cluster loop is reproduced here as the baseline. The schema
+check runs the planner on the real dataset and verifies the per-day fields
+the frontend reads (visit_time, travel_time, food_time, map_data, ...);
+it is tests/test_itinerary_schema.py, repeated here first.
+
+Run from the repository root:
+    python -m benchmarks.bench_scheduler
+"""
+import time
+from math import log1p
+
+import numpy as np
+
+from app import SouthIndiaTravelPlanner
+from attraction_store import AttractionStore
+from kmeans_clustering import TravelKMeans
+from scheduler import DayScheduler
+from spatial_index import SpatialIndex
+from tests.helpers import DAY_FIELDS, assert_itinerary_schema, load_seed_rows
+
+DAYS = 7
+MAX_MINUTES = 8 * 60
+
+
+def synthetic_city(n_rows, seed=42):
+    """n_rows attractions scattered around one city center."""
+    rng = np.random.default_rng(seed)
+    seed_rows = load_seed_rows()
+    records = []
+    for i in range(n_rows):
+        row = dict(seed_rows[i % len(seed_rows)])
+        row['Name'] = f"{row['Name']} {i}"
+        row['City'] = 'Synthetic City'
+        row['Latitude'] = 12.97 + rng.normal(0, 0.08)
+        row['Longitude'] = 77.59 + rng.normal(0, 0.08)
+        records.append(row)
+    return AttractionStore.from_records(records)
+
+
+def legacy_days(planner, clusters, days):
+    """The nested cluster loop generate_itinerary used before DayScheduler."""
+    clusters = [list(cluster) for cluster in clusters]
+    used = set()
+    plans = []
+    for _ in range(days):
+        final, elapsed, last = [], 0, None
+        for cluster in clusters:
+            for attraction in cluster[:]:
+                if attraction['Name'] in used:
+                    continue
+                visit = attraction['Estimated Visit Time (mins)']
+                travel = 0
+                if last:
+                    travel = planner.calculate_travel_time(
+                        last['Latitude'], last['Longitude'],
+                        attraction['Latitude'], attraction['Longitude'])
+                if elapsed + visit + travel <= MAX_MINUTES:
+                    final.append(attraction)
+                    elapsed += visit + travel
+                    last = attraction
+                    used.add(attraction['Name'])
+                    cluster.remove(attraction)
+        plans.append(final)
+    return plans
+
+
+def value(store, ids):
+    return sum(store.ratings[i] * log1p(store.review_counts[i]) for i in ids)
+
+
+def check_schema(planner):
+    queries = [(['Munnar'], 3), (['Hyderabad', 'Mysore'], 4), (['Goa'], 7),
+               (['Ooty', 'Kodaikanal', 'Munnar', 'Kochi'], 7)]
+    for places, duration in queries:
+        result = planner.generate_itinerary(places, duration, '2026-01-01', 8)
+        assert_itinerary_schema(result, MAX_MINUTES)
+    print(f'schema: {len(queries)} itineraries keep the day fields {sorted(DAY_FIELDS)}')
+
+
+def main():
+    planner = SouthIndiaTravelPlanner()
+    check_schema(planner)
+
+    for n_rows in (1_000, 5_000, 20_000, 50_000):
+        store = synthetic_city(n_rows)
+        kmeans = TravelKMeans(3, backend='numpy')
+        clusters = kmeans.fit(list(store))
+        cluster_ids = [[a.id for a in cluster] for cluster in clusters]
+
+        spatial_index = SpatialIndex(store.latitudes, store.longitudes)
+        for name, index in (('scheduler', None), ('+ spatial index', spatial_index)):
+            start = time.perf_counter()
+            scheduler = DayScheduler(store, cluster_ids,
+                                     np.zeros(len(store.distinct_names), bool),
+                                     spatial_index=index)
+            plans = [scheduler.next_day(MAX_MINUTES) for _ in range(DAYS)]
+            new_time = time.perf_counter() - start
+            new_ids = [i for plan in plans for i in plan.ids]
+            new_travel = sum(plan.travel_time for plan in plans)
+            print(f'{n_rows:>6} attractions: {name:<15} {new_time * 1000:8.1f} ms '
+                  f'({len(new_ids)} stops, value {value(store, new_ids):6.0f}, '
+                  f'travel {new_travel} min)')
+
+        start = time.perf_counter()
+        legacy = legacy_days(planner, clusters, DAYS)
+        legacy_time = time.perf_counter() - start
+        legacy_ids = [a.id for day in legacy for a in day]
+        legacy_travel = sum(
+            planner.calculate_travel_time(a['Latitude'], a['Longitude'],
+                                          b['Latitude'], b['Longitude'])
+            for day in legacy for a, b in zip(day, day[1:]))
+
+        print(f'{n_rows:>6} attractions: {"legacy":<15} {legacy_time * 1000:8.1f} ms '
+              f'({len(legacy_ids)} stops, value {value(store, legacy_ids):6.0f}, '
+              f'travel {legacy_travel} min)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark SpatialIndex radius and nearest-neighbour queries on 1M points.
+
+Query points are scattered around the real attractions, where the synthetic
+points are densest. A sample of the answers is checked against a brute-force
+haversine scan.
+
+Run from the repository root:
+    python -m benchmarks.bench_spatial_index [n_points]
+"""
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_coordinates
+from geo import haversine_km
+from spatial_index import SpatialIndex
+
+N_QUERIES = 2000
+N_CHECKED = 50
+
+
+def brute_force(latitudes, longitudes, lat, lng, radius_km=None, k=None, mask=None):
+    distances = haversine_km(lat, lng, latitudes, longitudes)
+    ids = np.arange(len(latitudes)) if mask is None else np.flatnonzero(mask)
+    if radius_km is not None:
+        ids = ids[distances[ids] <= radius_km]
+    ids = ids[np.lexsort((ids, distances[ids]))]
+    return ids if k is None else ids[:k]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    latitudes, longitudes = synthetic_coordinates(n)
+    rng = np.random.default_rng(7)
+    picks = rng.integers(0, n, N_QUERIES)
+    query_lats = latitudes[picks] + rng.normal(0, 0.02, N_QUERIES)
+    query_lngs = longitudes[picks] + rng.normal(0, 0.02, N_QUERIES)
+    # A category-like filter keeping one point in eight
+    mask = rng.random(n) < 0.125
+
+    start = time.perf_counter()
+    index = SpatialIndex(latitudes, longitudes)
+    print(f'build {n} points: {(time.perf_counter() - start) * 1000:.1f} ms')
+
+    cases = [
+        ('radius 0.5 km', lambda lat, lng: index.query_radius(lat, lng, 0.5),
+         dict(radius_km=0.5)),
+        ('radius 2 km', lambda lat, lng: index.query_radius(lat, lng, 2), dict(radius_km=2)),
+        ('radius 2 km, masked', lambda lat, lng: index.query_radius(lat, lng, 2, mask),
+         dict(radius_km=2, mask=mask)),
+        ('nearest 1', lambda lat, lng: index.nearest(lat, lng, 1), dict(k=1)),
+        ('nearest 10', lambda lat, lng: index.nearest(lat, lng, 10), dict(k=10)),
+        ('nearest 10, masked', lambda lat, lng: index.nearest(lat, lng, 10, mask),
+         dict(k=10, mask=mask)),
+    ]
+    for name, query, expected in cases:
+        for lat, lng in zip(query_lats[:N_CHECKED], query_lngs[:N_CHECKED]):
+            ids, _ = query(lat, lng)
+            assert np.array_equal(ids, brute_force(latitudes, longitudes, lat, lng, **expected))
+
+        found = 0
+        start = time.perf_counter()
+        for lat, lng in zip(query_lats, query_lngs):
+            found += len(query(lat, lng)[0])
+        per_query = (time.perf_counter() - start) / N_QUERIES
+        print(f'{name:<22} {per_query * 1e6:8.1f} us/query  ({found / N_QUERIES:.1f} results)')
+
+    start = time.perf_counter()
+    for lat, lng in zip(query_lats[:20], query_lngs[:20]):
+        brute_force(latitudes, longitudes, lat, lng, radius_km=2)
+    print(f'{"brute force 2 km":<22} {(time.perf_counter() - start) / 20 * 1e6:8.1f} us/query')
+
+
+if __name__ == '__main__':
+    main()
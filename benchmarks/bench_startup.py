@@ -0,0 +1,57 @@
+"""
+Measure time from process start to the first served /generate_itinerary.
+
+Each case starts a fresh interpreter that imports the app and serves one
+request through the Flask test client.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+FIRST_REQUEST = '''
+import time
+from app import app
+response = app.test_client().post('/generate_itinerary', json={
+    'places': 'Ooty; Kodaikanal', 'duration': '3',
+    'startDate': '2026-01-01', 'maxHours': '8'})
+assert response.status_code == 200 and 'itinerary' in response.get_json()
+print(time.time())
+'''
+
+
+def time_to_first_request(env, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.time()
+        output = subprocess.run([sys.executable, '-W', 'ignore', '-c', FIRST_REQUEST],
+                                env=dict(os.environ, **env), check=True,
+                                capture_output=True, text=True).stdout
+        times.append(float(output.split()[-1]) - start)
+    return min(times)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot = os.path.join(tmp, 'attractions.snapshot.npz')
+        subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'build-snapshot',
+                        '--output', snapshot], check=True, capture_output=True)
+
+        cases = [
+            ('csv, sklearn backend', {'DATASET_SNAPSHOT': '', 'KMEANS_BACKEND': 'sklearn'}),
+            ('csv, numpy backend', {'DATASET_SNAPSHOT': '', 'KMEANS_BACKEND': 'numpy'}),
+            ('snapshot, sklearn backend', {'DATASET_SNAPSHOT': snapshot,
+                                           'KMEANS_BACKEND': 'sklearn'}),
+            ('snapshot, numpy backend', {'DATASET_SNAPSHOT': snapshot,
+                                         'KMEANS_BACKEND': 'numpy'}),
+        ]
+        for name, env in cases:
+            print(f'{name:<28} {time_to_first_request(env) * 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
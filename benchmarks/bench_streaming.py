@@ -0,0 +1,88 @@
+"""
+Measure time to first day of streamed itineraries against whole responses.
+
+Clusters are cached (as in steady state) but itineraries are not, so every
+run plans from scratch. Streamed events must add up to the same itinerary
+as generate_itinerary, in both the full and the compact format.
+
+Run from the repository root:
+    python -m benchmarks.bench_streaming
+"""
+import json
+import time
+
+import app as app_module
+from serialization import dumps
+
+QUERIES = [
+    (['Ooty', 'Kodaikanal'], 3, 8),
+    (['Chennai', 'Madurai', 'Thanjavur', 'Kochi', 'Munnar'], 7, 12),
+    (['Kerala', 'Tamil Nadu'], 7, 12),
+    (['Mysore', 'Hampi', 'Gokarna', 'Panaji', 'Hyderabad', 'Tirupati', 'Puducherry'], 7, 10),
+]
+REPEAT = 20
+
+
+def check_stream(planner, places, duration, max_hours):
+    for compact in (False, True):
+        planner.itinerary_cache.clear()
+        expected = planner.generate_itinerary(places, duration, '2026-01-01', max_hours,
+                                              compact=compact)
+        for cached in (False, True):
+            if not cached:
+                planner.itinerary_cache.clear()
+            events = list(planner.iter_itinerary(places, duration, '2026-01-01', max_hours,
+                                                 compact=compact))
+            assert [e['type'] for e in events] == ['route'] + ['day'] * (len(events) - 2) + ['end']
+            assert events[0]['route'] == expected['route']
+            assert [e['day'] for e in events[1:-1]] == expected['itinerary']
+            if compact:
+                table = {}
+                for event in events[1:-1]:
+                    assert not set(event['attractions']) & set(table)
+                    table.update(event['attractions'])
+                assert table == expected['attractions']
+            else:
+                assert events[-1]['all_attractions'] == expected['all_attractions']
+
+
+def time_whole(planner, places, duration, max_hours):
+    planner.itinerary_cache.clear()
+    start = time.perf_counter()
+    dumps(planner.generate_itinerary(places, duration, '2026-01-01', max_hours))
+    return time.perf_counter() - start
+
+
+def time_first_day(planner, places, duration, max_hours):
+    planner.itinerary_cache.clear()
+    start = time.perf_counter()
+    first = None
+    for event in planner.iter_itinerary(places, duration, '2026-01-01', max_hours):
+        dumps(event)
+        if first is None and event['type'] == 'day':
+            first = time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+
+def main():
+    planner = app_module.travel_planner
+    print(f"{'query':<44} {'whole ms':>9} {'first day ms':>13} {'stream ms':>10}")
+    for places, duration, max_hours in QUERIES:
+        check_stream(planner, places, duration, max_hours)
+        whole = min(time_whole(planner, places, duration, max_hours) for _ in range(REPEAT))
+        streamed = [time_first_day(planner, places, duration, max_hours) for _ in range(REPEAT)]
+        first = min(s[0] for s in streamed)
+        total = min(s[1] for s in streamed)
+        print(f"{'; '.join(places)[:44]:<44} {whole * 1000:9.2f} {first * 1000:13.2f} "
+              f"{total * 1000:10.2f}")
+
+    # The endpoint emits the same events as NDJSON
+    response = app_module.app.test_client().post('/generate_itinerary/stream', json={
+        'places': 'Ooty; Kodaikanal', 'duration': '3', 'startDate': '2026-01-01',
+        'maxHours': '8'})
+    lines = [json.loads(line) for line in response.get_data().splitlines()]
+    assert lines[0]['type'] == 'route' and lines[-1]['type'] == 'end'
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Compare memory-mapped travel-time matrices with the haversine formula.
+
+Matrices are built for a synthetic dataset in a temporary directory. Lookups
+must equal the formula for the profile they were built with, road times from
+an edge list must override it, and stale files must be ignored.
+
+Run from the repository root:
+    python -m benchmarks.bench_travel_times [n_rows]
+"""
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from attraction_store import AttractionStore
+from tests.helpers import synthetic_attractions
+from travel_times import TravelTimes, build_travel_times
+
+N_LOOKUPS = 5000
+WINDOW = 40  # destinations per lookup, about what DayScheduler compares per step
+
+
+def city_members(store):
+    return {code: np.flatnonzero(store.city_codes == code) for code in range(len(store.cities))}
+
+
+def lookups(store, rng):
+    members = [ids for ids in city_members(store).values() if len(ids) > 1]
+    queries = []
+    for _ in range(N_LOOKUPS):
+        ids = members[rng.randrange(len(members))]
+        queries.append((int(rng.choice(ids)), rng.sample(ids.tolist(), min(WINDOW, len(ids)))))
+    return queries
+
+
+def timed(travel_times, queries):
+    start = time.perf_counter()
+    results = [travel_times.minutes(from_id, np.asarray(to_ids)) for from_id, to_ids in queries]
+    return results, (time.perf_counter() - start) / len(queries)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    store = AttractionStore.from_records(synthetic_attractions(n))
+    rng = random.Random(42)
+    queries = lookups(store, rng)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'travel_times.npy')
+        start = time.perf_counter()
+        manifest = build_travel_times(path, store, 'v1')
+        build = time.perf_counter() - start
+        print(f'build: {build:.2f} s, {len(manifest["cities"])} cities, '
+              f'{os.path.getsize(path) / 2 ** 20:.1f} MiB')
+
+        start = time.perf_counter()
+        mapped = TravelTimes.load(path, store, 'v1')
+        load = time.perf_counter() - start
+        assert mapped.mapped
+        formula = TravelTimes(store)
+
+        expected, formula_seconds = timed(formula, queries)
+        results, mapped_seconds = timed(mapped, queries)
+        assert all(np.array_equal(a, b) for a, b in zip(expected, results))
+        print(f'load (mmap): {load * 1000:.2f} ms')
+        print(f'{WINDOW} destinations: formula {formula_seconds * 1e6:7.1f} us, '
+              f'matrix {mapped_seconds * 1e6:7.1f} us')
+
+        # Pairs across cities fall back to the formula
+        from_id, to_ids = 0, np.arange(len(store), step=max(1, len(store) // 500))
+        assert np.array_equal(mapped.minutes(from_id, to_ids), formula.minutes(from_id, to_ids))
+        route = [from_id for from_id, _ in queries[:20]]
+        assert mapped.path_minutes(route) == formula.path_minutes(route)
+
+        # Stale matrices, or another profile, are ignored
+        assert not TravelTimes.load(path, store, 'v2').mapped
+        assert not TravelTimes.load(path, store, 'v1', 'highway').mapped
+
+        # Road times from an edge list override the profile within a city
+        ids = city_members(store)[0][:3].tolist()
+        names = [store.names[i] for i in ids]
+        edges_path = os.path.join(tmp, 'roads.csv')
+        with open(edges_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['from', 'to', 'minutes'])
+            writer.writerow([names[0], names[1], 97])
+        manifest = build_travel_times(path, store, 'v1', profile='highway', edges_path=edges_path)
+        assert manifest['overridden_pairs'] == 2
+        roads = TravelTimes.load(path, store, 'v1', 'highway')
+        assert roads.minutes(ids[0], [ids[1]])[0] == roads.minutes(ids[1], [ids[0]])[0] == 97
+        highway = TravelTimes(store, 'highway')
+        assert roads.minutes(ids[0], [ids[2]])[0] == highway.minutes(ids[0], [ids[2]])[0]
+        print('edge list overrides and formula fallback: ok')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,294 @@
+"""
+Replay itinerary requests against the planner and the Flask app and report latency.
+
+Requests are JSONL records in the /generate_itineraries format: a capture of
+real traffic, or records generated here. Generated traffic favours a few
+popular places and repeats popular packages, so caches are hit about as
+often as in production; a few records carry typos or unknown places.
+
+Each target (the planner called directly, or POSTs through the Flask test
+client) is replayed at every concurrency level, starting from empty caches.
+The report has p50/p95/p99 latency and throughput per run, the same
+percentiles for every stage of itinerary generation, and peak RSS after each
+phase. Save it as a baseline and later runs flag what got slower or bigger
+than the tolerance allows. Baselines only compare on the same machine.
+
+Run from the repository root:
+    python -m benchmarks.load_test generate captured.jsonl --count 1000
+    python -m benchmarks.load_test replay [--requests captured.jsonl] [--rows 100000]
+        [--target planner flask] [--concurrency 1 4] [--save-baseline] [--baseline FILE]
+"""
+import argparse
+import json
+import logging
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import app as app_module
+from batch import itinerary_request
+from benchmarks.synthetic import write_synthetic_csv
+from tests.helpers import generate_requests
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines',
+                             'load_test.json')
+PERCENTILES = (50, 95, 99)
+# Compared against the baseline; p99 of a few hundred requests is too noisy,
+# and so are the tails of stages, which include waiting for the GIL
+COMPARED_LATENCY = ('p50', 'p95')
+COMPARED_STAGE = ('p50',)
+# Latency differences below this are noise, whatever the relative change
+MIN_DELTA_MS = 1.0
+WARMUP = 50
+
+
+def read_requests(path):
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def peak_rss_mb():
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentiles(seconds):
+    values = np.percentile(seconds, PERCENTILES) * 1000
+    return {f'p{p}': round(float(value), 3) for p, value in zip(PERCENTILES, values)}
+
+
+def load_planner(rows):
+    """Build a planner for attractions.csv, or for a synthetic dataset of rows attractions."""
+    if not rows:
+        return app_module.SouthIndiaTravelPlanner()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'attractions.csv')
+        write_synthetic_csv(path, rows)
+        app_module.DATASET_PATH = path
+        return app_module.SouthIndiaTravelPlanner()
+
+
+def send_planner(planner):
+    def send(line):
+        return planner.generate_itinerary(**itinerary_request(json.loads(line)))
+    return send
+
+
+def send_flask(planner):
+    app_module.travel_planner = planner
+    local = threading.local()
+
+    def send(line):
+        if not hasattr(local, 'client'):
+            local.client = app_module.app.test_client()
+        response = local.client.post('/generate_itinerary', data=line,
+                                     content_type='application/json')
+        return response.get_json()
+    return send
+
+
+TARGETS = {'planner': send_planner, 'flask': send_flask}
+
+
+def timed_request(send, line):
+    """Latency, stage timings and whether the request succeeded."""
+    metrics = app_module.metrics
+    # The Flask test client serves the request on this thread, so the
+    # route's stages land in this trace too
+    trace = metrics.start_trace()
+    start = time.perf_counter()
+    try:
+        result = send(line)
+        ok = 'error' not in result
+    except Exception:
+        ok = False
+    finally:
+        seconds = time.perf_counter() - start
+        metrics.end_trace()
+    return seconds, trace.stages, ok
+
+
+def replay(planner, send, lines, concurrency):
+    planner.cluster_cache.clear()
+    planner.itinerary_cache.clear()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda line: timed_request(send, line), lines))
+    wall = time.perf_counter() - start
+
+    stages = {}
+    for _, request_stages, _ in results:
+        for name, seconds in request_stages.items():
+            stages.setdefault(name, []).append(seconds)
+    return {
+        'requests': len(results),
+        'errors': sum(not ok for _, _, ok in results),
+        'throughput_rps': round(len(results) / wall, 2),
+        'latency_ms': percentiles([seconds for seconds, _, _ in results]),
+        'stages_ms': {name: percentiles(values) for name, values in sorted(stages.items())},
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+    }
+
+
+def compare(report, baseline, tolerance):
+    """
+    List what regressed against a baseline report.
+
+    Returns:
+        list: One description per metric beyond the tolerance
+    """
+    regressions = []
+
+    def slower(label, new, old, keys):
+        for key in keys:
+            value, before = new[key], old.get(key)
+            if before is not None and value > before * (1 + tolerance) and \
+                    value - before > MIN_DELTA_MS:
+                regressions.append(f'{label} {key}: {before:.3f} -> {value:.3f} ms')
+
+    for phase, result in report['phases'].items():
+        old = baseline['phases'].get(phase)
+        if old is None:
+            continue
+        if result['peak_rss_mb'] > old['peak_rss_mb'] * (1 + tolerance):
+            regressions.append(f"{phase} peak RSS: {old['peak_rss_mb']} -> "
+                               f"{result['peak_rss_mb']} MiB")
+        if phase == 'load':
+            continue
+        slower(f'{phase} latency', result['latency_ms'], old['latency_ms'], COMPARED_LATENCY)
+        for stage, values in result['stages_ms'].items():
+            slower(f'{phase} {stage}', values, old['stages_ms'].get(stage, {}), COMPARED_STAGE)
+        if result['throughput_rps'] * (1 + tolerance) < old['throughput_rps']:
+            regressions.append(f"{phase} throughput: {old['throughput_rps']} -> "
+                               f"{result['throughput_rps']} req/s")
+    return regressions
+
+
+def print_report(report):
+    load = report['phases']['load']
+    print(f"load: {load['seconds']:.2f} s, peak RSS {load['peak_rss_mb']:.1f} MiB")
+    print(f"{'phase':<15} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'errors':>6} {'RSS MiB':>8}")
+    for phase, result in report['phases'].items():
+        if phase == 'load':
+            continue
+        latency = result['latency_ms']
+        print(f"{phase:<15} {result['throughput_rps']:8.1f} {latency['p50']:8.3f} "
+              f"{latency['p95']:8.3f} {latency['p99']:8.3f} {result['errors']:6d} "
+              f"{result['peak_rss_mb']:8.1f}")
+        for stage, values in result['stages_ms'].items():
+            print(f"  {stage:<13} {'':>8} {values['p50']:8.3f} {values['p95']:8.3f} "
+                  f"{values['p99']:8.3f}")
+
+
+def quiet():
+    """Keep the dataset watcher off and silence request logs and k-means warnings."""
+    app_module.config.DATASET_WATCH_INTERVAL = 0
+    app_module.logger.setLevel(logging.ERROR)
+    warnings.filterwarnings('ignore', message='Number of distinct clusters')
+
+
+def run_replay(args):
+    quiet()
+
+    start = time.perf_counter()
+    planner = load_planner(args.rows)
+    phases = {'load': {'seconds': round(time.perf_counter() - start, 3),
+                       'peak_rss_mb': round(peak_rss_mb(), 1)}}
+
+    if args.requests:
+        lines = read_requests(args.requests)
+    else:
+        lines = [json.dumps(record) for record in generate_requests(planner, args.count)]
+
+    # One untimed pass pays for lazy imports and first-touch page faults
+    replay(planner, send_planner(planner), lines[:WARMUP], 1)
+    for target in args.target:
+        send = TARGETS[target](planner)
+        for concurrency in args.concurrency:
+            # The fastest of a few runs, the others were slowed by something else
+            runs = [replay(planner, send, lines, concurrency) for _ in range(args.repeat)]
+            phases[f'{target}/c{concurrency}'] = max(runs, key=lambda run: run['throughput_rps'])
+
+    report = {
+        'config': {'rows': args.rows or len(planner.attractions), 'requests': len(lines),
+                   'source': os.path.basename(args.requests) if args.requests else 'generated',
+                   'repeat': args.repeat,
+                   'cpus': os.cpu_count()},
+        'phases': phases,
+    }
+    print_report(report)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1)
+        print(f'Saved baseline {args.baseline}')
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f'No baseline at {args.baseline}, run with --save-baseline to create one')
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline['config'] != report['config']:
+        print(f"Baseline was run with {baseline['config']}, comparisons may not hold")
+    regressions = compare(report, baseline, args.tolerance)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    if not regressions:
+        print(f'No regressions against {args.baseline} (tolerance {args.tolerance:.0%})')
+    return 1 if regressions else 0
+
+
+def run_generate(args):
+    quiet()
+    planner = load_planner(args.rows)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        for record in generate_requests(planner, args.count, args.seed):
+            f.write(json.dumps(record) + '\n')
+    print(f'Wrote {args.count} requests to {args.output}')
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate = commands.add_parser('generate', help='Write generated requests as JSONL')
+    generate.add_argument('output')
+    generate.add_argument('--count', type=int, default=1000)
+    generate.add_argument('--seed', type=int, default=42)
+    generate.add_argument('--rows', type=int, default=0,
+                          help='Use the places of a synthetic dataset of this size')
+    generate.set_defaults(run=run_generate)
+
+    run = commands.add_parser('replay', help='Replay requests and report latency')
+    run.add_argument('--requests', help='JSONL requests to replay, generated when omitted')
+    run.add_argument('--count', type=int, default=500, help='Number of generated requests')
+    run.add_argument('--rows', type=int, default=0,
+                     help='Synthetic dataset size, attractions.csv when 0')
+    run.add_argument('--target', nargs='+', choices=sorted(TARGETS), default=['planner', 'flask'])
+    run.add_argument('--concurrency', type=int, nargs='+', default=[1, 4])
+    run.add_argument('--repeat', type=int, default=3,
+                     help='Runs per target and concurrency, the fastest is reported')
+    run.add_argument('--baseline', default=BASELINE_PATH)
+    run.add_argument('--save-baseline', action='store_true',
+                     help='Write this report as the baseline instead of comparing')
+    run.add_argument('--tolerance', type=float, default=0.5,
+                     help='Allowed relative slowdown or growth before a regression')
+    run.set_defaults(run=run_replay)
+
+    args = parser.parse_args()
+    sys.exit(args.run(args))
+
+
+if __name__ == '__main__':
+    main()
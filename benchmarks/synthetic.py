@@ -0,0 +1,64 @@
+"""
+Synthetic datasets scaled from attractions.csv, for the benchmarks.
+
+The rows come from tests.helpers, which the tests build their datasets with.
+Write CSVs with the attractions.csv layout from the repository root:
+    python -m benchmarks.synthetic --rows 10000 100000 1000000 --output-dir data
+"""
+import argparse
+import csv
+import os
+
+import numpy as np
+
+from tests.helpers import iter_synthetic_attractions, load_seed_rows
+
+
+def synthetic_coordinates(n_rows, seed=42):
+    """
+    Coordinates only, spread like iter_synthetic_attractions but built with NumPy.
+
+    Returns:
+        tuple: (latitudes, longitudes) arrays of length n_rows
+    """
+    rng = np.random.default_rng(seed)
+    seed_rows = load_seed_rows()
+    picks = np.arange(n_rows) % len(seed_rows)
+    latitudes = np.array([row['Latitude'] for row in seed_rows])[picks]
+    longitudes = np.array([row['Longitude'] for row in seed_rows])[picks]
+    jitter = np.arange(n_rows) >= len(seed_rows)
+    latitudes[jitter] += rng.uniform(-0.05, 0.05, jitter.sum())
+    longitudes[jitter] += rng.uniform(-0.05, 0.05, jitter.sum())
+    return latitudes, longitudes
+
+
+def write_synthetic_csv(path, n_rows, seed=42):
+    """Stream a synthetic dataset with the attractions.csv layout to path."""
+    rows = iter_synthetic_attractions(n_rows, seed)
+    first = next(rows)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(first))
+        writer.writeheader()
+        writer.writerow(first)
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Write synthetic attractions.csv files. Every city keeps its share of '
+                    'the real rows and clones lie within about 5 km of a real attraction.')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 1000000],
+                        help='Dataset sizes to write')
+    parser.add_argument('--output-dir', default='.', help='Directory for attractions_<rows>.csv')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for n_rows in args.rows:
+        path = os.path.join(args.output_dir, f'attractions_{n_rows}.csv')
+        write_synthetic_csv(path, n_rows, args.seed)
+        print(f'Wrote {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from kmeans_clustering import TravelKMeans
+
+
+class LRUCache:
+    """
+    A thread-safe, bounded least-recently-used cache with an optional time to live.
+    """
+
+    def __init__(self, maxsize=256, ttl=None, clock=time.monotonic):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize (int): Maximum number of entries kept
+            ttl (float): Seconds an entry stays valid, None to keep it until evicted
+            clock (callable): Time source, in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires is None or expires > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        expires = None if self.ttl is None else self.clock() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def keys(self):
+        """Keys currently held, least recently used first."""
+        with self._lock:
+            return list(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry[0] is None or entry[0] > self.clock())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+        }
+
+
+def fingerprint(coordinates, n_clusters):
+    """
+    Stable key for the coordinates of a set of matched attractions and a cluster count.
+
+    Args:
+        coordinates (numpy.ndarray): (n, 2) latitudes and longitudes, in input order
+        n_clusters (int): Number of clusters
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.blake2b(np.ascontiguousarray(coordinates, dtype=np.float64).tobytes(),
+                             digest_size=16, person=b'clusters')
+    digest.update(str(n_clusters).encode())
+    return digest.hexdigest()
+
+
+class ClusterCache:
+    """
+    Memoizes TravelKMeans results per matched attraction set.
+
+    K-means runs with a fixed random_state and only looks at coordinates, so
+    the clusters for a given sequence of coordinates never change and can be
+    reused across requests. Entries are keyed on the coordinates and hold
+    positions in the input rather than attraction ids, so they stay valid
+    across dataset reloads for every set of attractions that did not move.
+    Every call gets fresh cluster lists it is free to consume.
+    """
+
+    def __init__(self, maxsize=256, ttl=None, backend='auto', metric='euclidean'):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize (int): Maximum number of attraction sets kept
+            ttl (float): Seconds a clustering stays cached, None for no expiry
+            backend (str): TravelKMeans backend used for cache misses
+            metric (str): TravelKMeans distance metric
+        """
+        self.backend = backend
+        self.metric = metric
+        self._cache = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    def _key(attractions, n_clusters):
+        store = attractions[0].store
+        ids = np.fromiter((a.id for a in attractions), dtype=np.int64, count=len(attractions))
+        return fingerprint(np.column_stack((store.latitudes[ids], store.longitudes[ids])),
+                           n_clusters)
+
+    def fit(self, attractions, n_clusters):
+        """
+        Cluster attractions, reusing a previous fit of the same coordinates when cached.
+
+        Args:
+            attractions (list): AttractionRecord views of the matched attractions
+            n_clusters (int): Number of clusters
+
+        Returns:
+            tuple: (clusters, cluster_centers) as returned by TravelKMeans.fit
+                and TravelKMeans.get_cluster_centers
+        """
+        key = self._key(attractions, n_clusters)
+        entry = self._cache.get(key)
+        if entry is None:
+            kmeans = TravelKMeans(n_clusters=n_clusters, backend=self.backend,
+                                  metric=self.metric)
+            clusters = kmeans.fit(attractions)
+            centers = np.array(kmeans.get_cluster_centers())
+            centers.flags.writeable = False
+            positions = {a.id: i for i, a in enumerate(attractions)}
+            entry = (tuple(tuple(positions[a.id] for a in cluster) for cluster in clusters),
+                     centers)
+            self._cache.put(key, entry)
+
+        cluster_positions, centers = entry
+        return [[attractions[i] for i in cluster] for cluster in cluster_positions], centers
+
+    def cached(self, attractions, n_clusters):
+        """Whether a fit of these attractions is cached, without counting a hit or miss."""
+        return self._key(attractions, n_clusters) in self._cache
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        return self._cache.stats()
@@ -0,0 +1,72 @@
+import os
+
+from dotenv import load_dotenv
+
+# Settings come from the environment, or from a .env file next to the app
+load_dotenv()
+
+
+def _env_bool(name, default=False):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _env_float(name, default=None):
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+# Clustering cache
+CLUSTER_CACHE_SIZE = int(os.environ.get('CLUSTER_CACHE_SIZE', 256))
+CLUSTER_CACHE_TTL = _env_float('CLUSTER_CACHE_TTL')  # seconds, unset for no expiry
+WARM_CLUSTER_CACHE = _env_bool('WARM_CLUSTER_CACHE')
+
+# Clustering engine: 'auto' (scikit-learn when installed), 'sklearn' or 'numpy'
+KMEANS_BACKEND = os.environ.get('KMEANS_BACKEND', 'auto')
+KMEANS_METRIC = os.environ.get('KMEANS_METRIC', 'euclidean')  # or 'haversine' (numpy only)
+# Threads fitting the clusters of a request's places in parallel when several are not
+# cached yet, 0 fits them one after another
+CLUSTER_WORKERS = int(os.environ.get('CLUSTER_WORKERS', 0))
+
+# Prebuilt dataset snapshot, regenerate with `flask --app app build-snapshot`.
+# Set to an empty value to always parse attractions.csv.
+DATASET_SNAPSHOT = os.environ.get('DATASET_SNAPSHOT', 'attractions.snapshot.npz')
+
+# Whole-itinerary cache, ITINERARY_CACHE_DB enables a SQLite cache shared by workers
+ITINERARY_CACHE_SIZE = int(os.environ.get('ITINERARY_CACHE_SIZE', 1024))
+ITINERARY_CACHE_TTL = _env_float('ITINERARY_CACHE_TTL')
+ITINERARY_CACHE_DB = os.environ.get('ITINERARY_CACHE_DB', '')
+
+# Per-stage latency histograms at /metrics, set to 0 to switch instrumentation off
+METRICS_ENABLED = _env_bool('METRICS_ENABLED', True)
+# Fraction of successful requests logged, errors and traced requests are always logged
+LOG_SAMPLE_RATE = _env_float('LOG_SAMPLE_RATE', 0.01)
+
+# Responses at least this many bytes are gzipped for clients that accept it, 0 disables
+GZIP_MIN_BYTES = int(os.environ.get('GZIP_MIN_BYTES', 1024))
+
+# Most results /nearby and /suggest_places return, larger limits are capped to these
+NEARBY_MAX_LIMIT = int(os.environ.get('NEARBY_MAX_LIMIT', 500))
+SUGGEST_MAX_LIMIT = int(os.environ.get('SUGGEST_MAX_LIMIT', 20))
+
+# Worker processes for /generate_itineraries and `flask generate-itineraries`, started once
+# per server process and used by one batch at a time. Each loads its own copy of the dataset.
+BATCH_WORKERS = int(os.environ.get('BATCH_WORKERS', os.cpu_count() or 1))
+
+# Places matching nothing are auto-corrected to the closest known place scoring at
+# least this confidence (0-1, see fuzzy_resolver), set above 1 to only suggest
+PLACE_AUTOCORRECT_CONFIDENCE = _env_float('PLACE_AUTOCORRECT_CONFIDENCE', 0.8)
+
+# Seconds between checks of attractions.csv for changes, which are reloaded in the
+# background; 0 disables the watcher
+DATASET_WATCH_INTERVAL = _env_float('DATASET_WATCH_INTERVAL', 10.0)
+# Token for the /admin endpoints (X-Admin-Token header), unset disables them
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN', '')
+
+# Per-city travel-time matrices, build with `flask --app app build-travel-times`.
+# Used when built for the current dataset and profile, empty to always use the formula.
+TRAVEL_TIMES = os.environ.get('TRAVEL_TIMES', 'travel_times.npy')
+# Speed model for travel times: 'urban' (40 km/h) or 'highway'
+SPEED_PROFILE = os.environ.get('SPEED_PROFILE', 'urban')
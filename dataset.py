@@ -0,0 +1,195 @@
+import hashlib
+import os
+import threading
+import time
+
+import numpy as np
+
+from attraction_store import AttractionStore
+from fuzzy_resolver import FuzzyResolver
+from location_index import LocationIndex
+from snapshot import load_snapshot, source_fingerprint
+from spatial_index import SpatialIndex
+from travel_times import TravelTimes
+
+
+def load_attractions(path):
+    """
+    Parse the attractions CSV.
+
+    Raises:
+        Exception: Whatever pandas raises for a missing or malformed file
+    """
+    # pandas is only needed when there is no usable snapshot
+    import pandas as pd
+    return AttractionStore.from_dataframe(pd.read_csv(path))
+
+
+def place_names(attractions, location_index, location_variations):
+    """(name, place) pairs the fuzzy resolver matches misspelled places against."""
+    for key, variations in location_variations.items():
+        if location_index.lookup(key):
+            yield key, key
+            for var in variations:
+                yield var, key
+    for values in (attractions.cities, attractions.states, attractions.distinct_names):
+        for value in values:
+            yield value, value
+
+
+class Dataset:
+    """
+    One version of the attraction data and every index derived from it.
+
+    Nothing is modified after construction. A reload builds a complete new
+    Dataset and the planner swaps its reference in a single assignment, so a
+    request that takes the reference once sees one consistent version
+    throughout, even while a newer one is being built or swapped in.
+    """
+
+    def __init__(self, attractions, location_index, version, location_variations,
+                 travel_times_path=None, speed_profile='urban', source=None):
+        """
+        Build the derived indexes.
+
+        Args:
+            attractions (AttractionStore): The dataset
+            location_index (LocationIndex): Place lookup over attractions
+            version (str): Identifier of the source file contents
+            location_variations (dict): Canonical location key -> list of aliases
+            travel_times_path (str): Travel-time matrices to map when built for
+                this version, or None
+            speed_profile (str): Speed profile for travel times (see travel_times)
+            source (dict): source_fingerprint of the file version was taken
+                from, so checking it again only hashes the file once it changed
+        """
+        self.attractions = attractions
+        self.location_index = location_index
+        self.version = version
+        self.source = source
+        self.loaded_at = time.time()
+        # Grid over the attraction coordinates for nearest-neighbour queries
+        self.spatial_index = SpatialIndex(attractions.latitudes, attractions.longitudes)
+        # Known spellings of places, for places that match nothing as typed
+        self.place_resolver = FuzzyResolver(place_names(attractions, location_index,
+                                                        location_variations))
+        # Travel minutes between attractions, memory-mapped matrices or the formula
+        self.travel_times = TravelTimes.load(travel_times_path, attractions, version,
+                                             speed_profile)
+        self._city_digests = None
+
+    @classmethod
+    def load(cls, csv_path, snapshot_path, location_variations, travel_times_path=None,
+             speed_profile='urban'):
+        """
+        Load a dataset from its snapshot when up to date, otherwise from the CSV.
+
+        Args:
+            csv_path (str): Path to attractions.csv
+            snapshot_path (str): Snapshot .npz file, or None
+            location_variations (dict): Canonical location key -> list of aliases
+            travel_times_path (str): Travel-time matrices, see Dataset
+            speed_profile (str): Speed profile for travel times
+
+        Returns:
+            Dataset: The loaded dataset
+
+        Raises:
+            Exception: When the CSV cannot be parsed
+        """
+        # A fresh snapshot carries the CSV's checksum, the file is only hashed without one
+        snapshot = load_snapshot(snapshot_path, csv_path, location_variations)
+        if snapshot is not None:
+            attractions, location_index, source = snapshot
+        else:
+            source = source_fingerprint(csv_path)
+            attractions = load_attractions(csv_path)
+            location_index = LocationIndex(attractions, location_variations)
+        return cls(attractions, location_index, source['sha256'][:16], location_variations,
+                   travel_times_path, speed_profile, source)
+
+    def city_digests(self):
+        """
+        Digest of each city's attraction coordinates, in dataset order.
+
+        Coordinates are all k-means looks at, so a city whose digest is
+        unchanged between two versions has the same clusters in both.
+
+        Returns:
+            dict: City name -> hex digest
+        """
+        if self._city_digests is None:
+            store = self.attractions
+            order = np.argsort(store.city_codes, kind='stable')
+            starts = np.searchsorted(store.city_codes[order], np.arange(len(store.cities) + 1))
+            coordinates = np.column_stack((store.latitudes[order], store.longitudes[order]))
+            self._city_digests = {
+                city: hashlib.blake2b(coordinates[starts[code]:starts[code + 1]].tobytes(),
+                                      digest_size=16).hexdigest()
+                for code, city in enumerate(store.cities)
+            }
+        return self._city_digests
+
+    def changed_cities(self, previous):
+        """
+        Cities whose attractions were added, removed or moved since another version.
+
+        Args:
+            previous (Dataset): The version being replaced
+
+        Returns:
+            list: City names, this dataset's first, then those only in previous
+        """
+        before, after = previous.city_digests(), self.city_digests()
+        return [city for city in dict.fromkeys([*after, *before])
+                if before.get(city) != after.get(city)]
+
+
+class DatasetWatcher:
+    """
+    Polls a file's size and modification time from a daemon thread.
+
+    Stat calls are cheap, the callback decides whether the contents really
+    changed (the planner compares checksums before rebuilding anything).
+    """
+
+    def __init__(self, path, interval, on_change, loaded=None):
+        """
+        Args:
+            path (str): File to watch
+            interval (float): Seconds between checks
+            on_change (callable): Called without arguments after the file changes
+            loaded (tuple): (size, mtime_ns) of the file when the data in use
+                was read from it, so changes made before the watcher starts
+                are noticed too; None to start from the file as it is now
+        """
+        self.path = path
+        self.interval = interval
+        self.on_change = on_change
+        self._last = loaded if loaded is not None else self._stat()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='dataset-watcher', daemon=True)
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+            return stat.st_size, stat.st_mtime_ns
+        except OSError:
+            return None
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            current = self._stat()
+            if current != self._last:
+                self._last = current
+                try:
+                    self.on_change()
+                except Exception as e:
+                    print(f"Error reloading {self.path}: {e}")
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
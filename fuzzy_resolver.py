@@ -0,0 +1,150 @@
+from collections import namedtuple
+
+import numpy as np
+
+# Names sharing the most trigrams with a query that are rescored by edit distance
+SHORTLIST = 32
+
+Suggestion = namedtuple('Suggestion', ['place', 'matched', 'confidence'])
+
+
+def _trigrams(text):
+    padded = f'$${text}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b):
+    """
+    Levenshtein distance between two strings.
+
+    Uses Myers' bit-parallel algorithm: the column of the dynamic programming
+    table for a is held as bit vectors, so each character of b costs a few
+    integer operations instead of a loop over a.
+
+    Args:
+        a (str): First string
+        b (str): Second string
+
+    Returns:
+        int: Minimum number of single-character insertions, deletions and substitutions
+    """
+    if not a or not b:
+        return len(a) + len(b)
+    peq = {}
+    for i, char in enumerate(a):
+        peq[char] = peq.get(char, 0) | (1 << i)
+    full = (1 << len(a)) - 1
+    last = 1 << (len(a) - 1)
+    pv, mv, distance = full, 0, len(a)
+    for char in b:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & last:
+            distance += 1
+        elif mh & last:
+            distance -= 1
+        ph = (ph << 1) | 1
+        mh <<= 1
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv & full
+    return distance
+
+
+class FuzzyResolver:
+    """
+    Suggests known place names for misspelled input.
+
+    Names are indexed by their trigrams (padded, so short names have some).
+    A query only touches the postings of its own trigrams to shortlist the
+    names sharing the most of them, and only the shortlist is ranked by edit
+    distance, so the cost does not grow with every name in the dictionary.
+    """
+
+    def __init__(self, entries):
+        """
+        Build the index.
+
+        Args:
+            entries (iterable): (name, place) pairs; name is the spelling to
+                match against and place is what it resolves to. The first
+                place given for a name is kept.
+        """
+        places = {}
+        for name, place in entries:
+            places.setdefault(name.lower().strip(), place)
+        self._names = list(places)
+        self._places = list(places.values())
+
+        postings = {}
+        gram_counts = []
+        for name_idx, name in enumerate(self._names):
+            grams = _trigrams(name)
+            gram_counts.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(name_idx)
+        self._postings = {gram: np.array(idxs, dtype=np.int32)
+                          for gram, idxs in postings.items()}
+        self._gram_counts = np.array(gram_counts, dtype=np.int32)
+
+    def __len__(self):
+        return len(self._names)
+
+    def suggest(self, text, limit=5, min_confidence=0.5):
+        """
+        Rank known places by how closely their names match some text.
+
+        Args:
+            text (str): Place name as entered by the user
+            limit (int): Maximum number of suggestions
+            min_confidence (float): Drop suggestions scoring below this
+
+        Returns:
+            list: Suggestion(place, matched, confidence) tuples, best first,
+                one per place; confidence is 1 - edit distance / length of
+                the longer name, so an exact match scores 1.0
+        """
+        query = text.lower().strip()
+        grams = _trigrams(query)
+        hits = [self._postings[gram] for gram in grams if gram in self._postings]
+        if not query or not hits:
+            return []
+
+        # Trigram Jaccard similarity of every name sharing at least one trigram,
+        # counted over the postings only, not an array as long as the dictionary
+        candidates, shared = np.unique(np.concatenate(hits), return_counts=True)
+        similarity = shared / (len(grams) + self._gram_counts[candidates] - shared)
+        if len(candidates) > SHORTLIST:
+            top = np.argpartition(-similarity, SHORTLIST - 1)[:SHORTLIST]
+            candidates, similarity = candidates[top], similarity[top]
+
+        scored = []
+        for name_idx, trigram_score in zip(candidates.tolist(), similarity.tolist()):
+            name = self._names[name_idx]
+            confidence = 1 - edit_distance(query, name) / max(len(query), len(name))
+            if confidence >= min_confidence:
+                # Trigram similarity and then the name break ties
+                scored.append((-confidence, -trigram_score, name, name_idx))
+        scored.sort()
+
+        suggestions, seen = [], set()
+        for negative_confidence, _, name, name_idx in scored:
+            place = self._places[name_idx]
+            if place in seen:
+                continue
+            seen.add(place)
+            suggestions.append(Suggestion(place, name, round(-negative_confidence, 3)))
+            if len(suggestions) == limit:
+                break
+        return suggestions
+
+
+class PlaceNotFoundError(ValueError):
+    """A place matched no attractions; suggestions lists the closest known places."""
+
+    def __init__(self, place, suggestions):
+        super().__init__(f'No matching attractions found for: {place}')
+        self.place = place
+        self.suggestions = suggestions
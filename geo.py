@@ -0,0 +1,63 @@
+import numpy as np
+
+EARTH_RADIUS_KM = 6371  # Earth's radius in kilometers
+AVERAGE_SPEED_KMH = 40  # Assumed average speed in cities
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """
+    Great-circle distance using the Haversine formula, vectorized with NumPy.
+
+    Arguments broadcast against each other, so a single point against arrays
+    gives one-to-many distances and column/row vectors give a matrix.
+
+    Args:
+        lat1, lon1: Latitude/longitude of the first point(s) in degrees
+        lat2, lon2: Latitude/longitude of the second point(s) in degrees
+
+    Returns:
+        numpy.ndarray: Distances in kilometers
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64))
+                              for v in (lat1, lon1, lat2, lon2))
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    # Rounding can push a just past 1 for (nearly) antipodal points
+    a = np.clip(a, 0.0, 1.0)
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return EARTH_RADIUS_KM * c
+
+
+def pairwise_haversine_km(lats1, lons1, lats2=None, lons2=None):
+    """
+    Many-to-many distance matrix.
+
+    Args:
+        lats1, lons1 (array-like): Coordinates of the row points
+        lats2, lons2 (array-like): Coordinates of the column points, defaults to the row points
+
+    Returns:
+        numpy.ndarray: Matrix of shape (len(lats1), len(lats2)) in kilometers
+    """
+    if lats2 is None:
+        lats2, lons2 = lats1, lons1
+    lats1 = np.asarray(lats1, dtype=np.float64)[:, np.newaxis]
+    lons1 = np.asarray(lons1, dtype=np.float64)[:, np.newaxis]
+    return haversine_km(lats1, lons1, np.asarray(lats2)[np.newaxis, :],
+                        np.asarray(lons2)[np.newaxis, :])
+
+
+def travel_minutes(distance_km, speed_kmh=AVERAGE_SPEED_KMH):
+    """
+    Convert distances to whole minutes of travel, truncated like int().
+
+    Args:
+        distance_km (array-like): Distances in kilometers
+        speed_kmh (float): Average travel speed
+
+    Returns:
+        numpy.ndarray: Travel times in minutes
+    """
+    return (np.asarray(distance_km) / speed_kmh * 60).astype(np.int64)
@@ -0,0 +1,138 @@
+import abc
+import os
+import sqlite3
+import threading
+import time
+
+from cluster_cache import LRUCache
+
+
+class CacheBackend(abc.ABC):
+    """
+    Interface of a cache shared between worker processes.
+
+    Values are JSON strings. Backends should treat errors as misses rather
+    than failing the request.
+    """
+
+    @abc.abstractmethod
+    def get(self, key):
+        """Return the value stored under key, or None when missing or expired."""
+
+    @abc.abstractmethod
+    def set(self, key, value):
+        """Store value under key."""
+
+    @abc.abstractmethod
+    def clear(self):
+        """Drop every entry."""
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Shared cache in a local SQLite file, usable by several processes at once.
+    """
+
+    def __init__(self, path, ttl=None):
+        """
+        Initialize the backend.
+
+        Args:
+            path (str): SQLite database file, created if missing
+            ttl (float): Seconds an entry stays valid, None for no expiry
+        """
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+
+    def _connection(self):
+        # One connection per thread, and a new one after a fork
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('CREATE TABLE IF NOT EXISTS itineraries '
+                               '(key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def get(self, key):
+        try:
+            row = self._connection().execute(
+                'SELECT value, created FROM itineraries WHERE key = ?', (key,)).fetchone()
+        except sqlite3.Error as e:
+            print(f"Error reading itinerary cache: {e}")
+            return None
+        if row is None or (self.ttl is not None and row[1] + self.ttl <= time.time()):
+            return None
+        return row[0]
+
+    def set(self, key, value):
+        try:
+            self._connection().execute(
+                'INSERT OR REPLACE INTO itineraries (key, value, created) VALUES (?, ?, ?)',
+                (key, value, time.time()))
+        except sqlite3.Error as e:
+            print(f"Error writing itinerary cache: {e}")
+
+    def clear(self):
+        try:
+            self._connection().execute('DELETE FROM itineraries')
+        except sqlite3.Error as e:
+            print(f"Error clearing itinerary cache: {e}")
+
+
+class ItineraryCache:
+    """
+    Two-tier cache of generated itineraries: an in-process LRU in front of an
+    optional shared backend. Entries are JSON strings, so every hit decodes
+    into a fresh object the caller may modify.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None, backend=None):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize (int): Maximum number of itineraries kept in process
+            ttl (float): Seconds an itinerary stays cached in process, None for no expiry
+            backend (CacheBackend): Shared cache consulted on local misses, or None
+        """
+        self._local = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.backend = backend
+        self.backend_hits = 0
+        self.backend_misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        value = self._local.get(key)
+        if value is not None or self.backend is None:
+            return value
+
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.backend_misses += 1
+                return None
+            self.backend_hits += 1
+        self._local.put(key, value)
+        return value
+
+    def put(self, key, value):
+        self._local.put(key, value)
+        if self.backend is not None:
+            self.backend.set(key, value)
+
+    def clear(self):
+        self._local.clear()
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self):
+        stats = self._local.stats()
+        if self.backend is not None:
+            with self._lock:
+                stats['backend_hits'] = self.backend_hits
+                stats['backend_misses'] = self.backend_misses
+        return stats
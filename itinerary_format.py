@@ -0,0 +1,184 @@
+from datetime import timedelta
+
+# Attraction fields the frontend reads, the only ones kept in compact responses
+COMPACT_COLUMNS = (
+    'Name',
+    'Category',
+    'City',
+    'State',
+    'Latitude',
+    'Longitude',
+    'Rating',
+    'Estimated Visit Time (mins)',
+    'Description',
+)
+
+
+def route_response(plan, locations):
+    """The plan's route with place names instead of location indices."""
+    route = plan['route']
+    return {
+        'order': [locations[i] for i in route['order']],
+        'distance_km': route['distance_km'],
+        'travel_time': route['travel_time']
+    }
+
+
+def plan_corrections(plan, locations):
+    """The places typed in this request that were auto-corrected, and what to."""
+    return {location: place for location, place in zip(locations, plan.get('resolved', ()))
+            if place is not None}
+
+
+def _date(start, day):
+    return (start + timedelta(days=day['day'] - 1)).strftime('%Y-%m-%d')
+
+
+def expand_day(day, store, start):
+    """
+    Build one day of the full response from a planned day.
+
+    Args:
+        day (dict): Day of a plan, as yielded by SouthIndiaTravelPlanner._iter_plan
+        store (AttractionStore): Dataset the ids refer to
+        start (datetime): Date of the first day
+
+    Returns:
+        dict: The day with complete attraction rows, last location and map data
+    """
+    # Materialize the day's rows with their cluster information
+    final_attractions = store.records(day['ids'])
+    for attraction, cluster_idx in zip(final_attractions, day['clusters']):
+        attraction['cluster'] = cluster_idx
+
+    return {
+        'day': day['day'],
+        'date': _date(start, day),
+        'attractions': final_attractions,
+        'total_time': day['total_time'],
+        'visit_time': day['visit_time'],
+        'travel_time': day['travel_time'],
+        'food_time': day['food_time'],
+        'last_location': {
+            'name': final_attractions[-1]['Name'],
+            'city': final_attractions[-1]['City'],
+            'state': final_attractions[-1]['State']
+        },
+        'map_data': {
+            'attractions': [{
+                'name': attr['Name'],
+                'lat': attr['Latitude'],
+                'lng': attr['Longitude'],
+                'cluster': attr['cluster'],
+                'visit_time': attr.get('Estimated Visit Time (mins)', 0)
+            } for attr in final_attractions],
+            'cluster_centers': [{'lat': lat, 'lng': lng, 'cluster_id': i}
+                                for i, (lat, lng) in enumerate(day['cluster_centers'])]
+        }
+    }
+
+
+def all_attractions(plan, store):
+    """Every attraction matched by the plan's places, as full rows."""
+    rows = []
+    for ids in plan['matched']:
+        rows.extend(store.records(ids))
+    return rows
+
+
+def expand_itinerary(plan, store, start, locations):
+    """
+    Build the full itinerary response from a plan.
+
+    Plans hold attraction ids only, every day here gets complete attraction
+    rows, the last location and the map data, and every matched attraction
+    is listed in all_attractions.
+
+    Args:
+        plan (dict): SouthIndiaTravelPlanner._iter_plan's head with its days as 'itinerary'
+        store (AttractionStore): Dataset the ids refer to
+        start (datetime): Date of the first day
+        locations (list): Place names the route order indexes into
+
+    Returns:
+        dict: The itinerary response
+    """
+    return {
+        'itinerary': [expand_day(day, store, start) for day in plan['itinerary']],
+        'all_attractions': all_attractions(plan, store),
+        'route': route_response(plan, locations)
+    }
+
+
+def compact_day(day, start):
+    """
+    Build one day of the compact response from a planned day.
+
+    Args:
+        day (dict): Day of a plan, as yielded by SouthIndiaTravelPlanner._iter_plan
+        start (datetime): Date of the first day
+
+    Returns:
+        dict: The day, listing attraction ids
+    """
+    return {
+        'day': day['day'],
+        'date': _date(start, day),
+        'attractions': day['ids'],
+        'clusters': day['clusters'],
+        'total_time': day['total_time'],
+        'visit_time': day['visit_time'],
+        'travel_time': day['travel_time'],
+        'food_time': day['food_time'],
+        'cluster_centers': day['cluster_centers']
+    }
+
+
+def compact_rows(ids, store, seen):
+    """
+    Attraction table entries for the ids not already sent.
+
+    Args:
+        ids (list): Attraction ids
+        store (AttractionStore): Dataset the ids refer to
+        seen (set): Ids already in the table, updated in place
+
+    Returns:
+        dict: str(id) -> row limited to COMPACT_COLUMNS
+    """
+    rows = {}
+    for attraction_id in ids:
+        if attraction_id not in seen:
+            seen.add(attraction_id)
+            rows[str(attraction_id)] = store.record(attraction_id, COMPACT_COLUMNS)
+    return rows
+
+
+def compact_itinerary(plan, store, start, locations):
+    """
+    Build the compact itinerary response from a plan.
+
+    Days list attraction ids, and each attraction used by any day appears once
+    in the attractions table, keyed by id and limited to COMPACT_COLUMNS. The
+    per-day map data and last location (both derivable from the table) and
+    all_attractions are left out.
+
+    Args:
+        plan (dict): SouthIndiaTravelPlanner._iter_plan's head with its days as 'itinerary'
+        store (AttractionStore): Dataset the ids refer to
+        start (datetime): Date of the first day
+        locations (list): Place names the route order indexes into
+
+    Returns:
+        dict: The compact itinerary response
+    """
+    table, seen = {}, set()
+    for day in plan['itinerary']:
+        table.update(compact_rows(day['ids'], store, seen))
+
+    return {
+        'format': 'compact',
+        'attractions': table,
+        'itinerary': [compact_day(day, start) for day in plan['itinerary']],
+        'route': route_response(plan, locations)
+    }
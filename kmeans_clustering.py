@@ -1,6 +1,157 @@
-from sklearn.cluster import KMeans
+import importlib.util
+
 import numpy as np
-from math import radians, sin, cos, sqrt, atan2
+from geo import haversine_km
+
+BACKENDS = ('auto', 'sklearn', 'numpy')
+METRICS = ('euclidean', 'haversine')
+
+
+def _to_unit_vectors(coordinates):
+    """Convert (lat, lon) rows in degrees to 3D unit vectors."""
+    lat, lon = np.radians(coordinates[:, 0]), np.radians(coordinates[:, 1])
+    return np.column_stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)))
+
+
+def _to_lat_lon(vectors):
+    """Convert 3D vectors back to (lat, lon) rows in degrees."""
+    lat = np.arctan2(vectors[:, 2], np.hypot(vectors[:, 0], vectors[:, 1]))
+    lon = np.arctan2(vectors[:, 1], vectors[:, 0])
+    return np.degrees(np.column_stack((lat, lon)))
+
+
+class NumpyKMeans:
+    """
+    A pure-NumPy k-means (k-means++ seeding, Lloyd iterations) for small point sets.
+
+    Exposes the parts of the sklearn.cluster.KMeans interface that TravelKMeans
+    uses (fit, predict, labels_, cluster_centers_). With metric='haversine' the
+    points are clustered on the sphere: assignment uses great-circle distance
+    and centers are the normalized mean direction of their members.
+    """
+
+    def __init__(self, n_clusters, random_state=42, metric='euclidean',
+                 n_init=1, max_iter=300, tol=1e-4):
+        """
+        Initialize the model.
+
+        Args:
+            n_clusters (int): Number of clusters to create
+            random_state (int): Seed, the same seed always gives the same clusters
+            metric (str): 'euclidean' on (lat, lon) degrees or 'haversine'
+            n_init (int): Number of seeded restarts, the best inertia is kept
+            max_iter (int): Maximum Lloyd iterations per restart
+            tol (float): Relative center shift at which iterations stop
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric '{metric}', expected one of {METRICS}")
+        self.n_clusters = n_clusters
+        self.random_state = random_state
+        self.metric = metric
+        self.n_init = n_init
+        self.max_iter = max_iter
+        self.tol = tol
+
+    def _points(self, coordinates):
+        coordinates = np.asarray(coordinates, dtype=np.float64)
+        return _to_unit_vectors(coordinates) if self.metric == 'haversine' else coordinates
+
+    @staticmethod
+    def _squared_distances(points, centers):
+        # For unit vectors this is the squared chord length, which orders
+        # points the same way as the great-circle distance
+        return ((points[:, np.newaxis, :] - centers[np.newaxis, :, :]) ** 2).sum(axis=2)
+
+    def _seed(self, points, rng):
+        """Pick initial centers with k-means++."""
+        centers = [points[rng.integers(len(points))]]
+        closest = self._squared_distances(points, centers[0][np.newaxis]).ravel()
+        for _ in range(1, self.n_clusters):
+            total = closest.sum()
+            if total > 0:
+                index = rng.choice(len(points), p=closest / total)
+            else:
+                # Every point sits on a center already
+                index = rng.integers(len(points))
+            centers.append(points[index])
+            closest = np.minimum(
+                closest, self._squared_distances(points, points[index][np.newaxis]).ravel())
+        return np.array(centers)
+
+    def _lloyd(self, points, centers):
+        tol = self.tol * np.mean(np.var(points, axis=0))
+        for _ in range(self.max_iter):
+            labels = self._squared_distances(points, centers).argmin(axis=1)
+            sums = np.zeros_like(centers)
+            np.add.at(sums, labels, points)
+            counts = np.bincount(labels, minlength=self.n_clusters)
+
+            new_centers = centers.copy()
+            filled = counts > 0  # Empty clusters keep their previous center
+            if self.metric == 'haversine':
+                norms = np.linalg.norm(sums[filled], axis=1, keepdims=True)
+                new_centers[filled] = sums[filled] / np.where(norms > 0, norms, 1)
+            else:
+                new_centers[filled] = sums[filled] / counts[filled, np.newaxis]
+
+            shift = ((new_centers - centers) ** 2).sum()
+            centers = new_centers
+            if shift <= tol:
+                break
+
+        distances = self._squared_distances(points, centers)
+        labels = distances.argmin(axis=1)
+        inertia = distances[np.arange(len(points)), labels].sum()
+        return labels, centers, inertia
+
+    def fit(self, coordinates):
+        """
+        Cluster (lat, lon) coordinates.
+
+        Args:
+            coordinates (array-like): Array of shape (n_points, 2)
+
+        Returns:
+            NumpyKMeans: The fitted model
+        """
+        points = self._points(coordinates)
+        if len(points) < self.n_clusters:
+            raise ValueError(f'n_samples={len(points)} should be >= n_clusters={self.n_clusters}')
+
+        rng = np.random.default_rng(self.random_state)
+        best = None
+        for _ in range(self.n_init):
+            result = self._lloyd(points, self._seed(points, rng))
+            if best is None or result[2] < best[2]:
+                best = result
+
+        self.labels_, self._centers, self.inertia_ = best
+        if self.metric == 'haversine':
+            self.cluster_centers_ = _to_lat_lon(self._centers)
+        else:
+            self.cluster_centers_ = self._centers
+        return self
+
+    def predict(self, coordinates):
+        return self._squared_distances(self._points(coordinates), self._centers).argmin(axis=1)
+
+
+def resolve_backend(backend):
+    """
+    Pick the clustering backend.
+
+    Args:
+        backend (str): 'sklearn', 'numpy', or 'auto' for sklearn when it is installed
+
+    Returns:
+        str: 'sklearn' or 'numpy'
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown k-means backend '{backend}', expected one of {BACKENDS}")
+    if backend == 'auto':
+        return 'sklearn' if importlib.util.find_spec('sklearn') is not None else 'numpy'
+    return backend
+
 
 class TravelKMeans:
     """
@@ -8,15 +159,27 @@ class TravelKMeans:
     This helps in creating more efficient travel routes by grouping nearby attractions together.
     """
     
-    def __init__(self, n_clusters):
+    def __init__(self, n_clusters, backend='auto', metric='euclidean', random_state=42):
         """
         Initialize the TravelKMeans class.
         
         Args:
             n_clusters (int): Number of clusters to create
+            backend (str): 'sklearn', 'numpy' or 'auto' (sklearn when installed)
+            metric (str): 'euclidean' or 'haversine', the latter needs the numpy backend
+            random_state (int): Seed for deterministic clusters
         """
         self.n_clusters = n_clusters
-        self.kmeans = KMeans(n_clusters=n_clusters, random_state=42)
+        self.backend = resolve_backend(backend)
+        if self.backend == 'sklearn':
+            if metric != 'euclidean':
+                raise ValueError("The sklearn backend only supports metric='euclidean'")
+            # Imported here so the numpy backend never loads scikit-learn
+            from sklearn.cluster import KMeans
+            self.kmeans = KMeans(n_clusters=n_clusters, random_state=random_state)
+        else:
+            self.kmeans = NumpyKMeans(n_clusters=n_clusters, random_state=random_state,
+                                      metric=metric)
 
     def calculate_distance(self, lat1, lon1, lat2, lon2):
         """
@@ -31,17 +194,7 @@ class TravelKMeans:
         Returns:
             float: Distance in kilometers
         """
-        R = 6371  # Earth's radius in kilometers
-
-        lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-
-        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-        c = 2 * atan2(sqrt(a), sqrt(1-a))
-        distance = R * c
-
-        return distance
+        return float(haversine_km(lat1, lon1, lat2, lon2))
 
     def fit(self, attractions):
         """
@@ -62,19 +215,16 @@ class TravelKMeans:
         # Fit k-means
         self.kmeans.fit(coordinates)
         
-        # Group attractions by cluster
-        clusters = [[] for _ in range(self.n_clusters)]
-        for i, label in enumerate(self.kmeans.labels_):
-            clusters[label].append(attractions[i])
-        
-        # Sort attractions within each cluster by distance from cluster center
-        for i, cluster in enumerate(clusters):
-            if cluster:
-                center = self.kmeans.cluster_centers_[i]
-                cluster.sort(key=lambda x: self.calculate_distance(
-                    x['Latitude'], x['Longitude'],
-                    center[0], center[1]
-                ))
+        # Group attractions by cluster, sorted by distance from cluster center
+        labels = self.kmeans.labels_
+        centers = self.kmeans.cluster_centers_
+        distances = haversine_km(coordinates[:, 0], coordinates[:, 1],
+                                 centers[labels, 0], centers[labels, 1])
+        clusters = []
+        for i in range(self.n_clusters):
+            members = np.flatnonzero(labels == i)
+            order = members[np.argsort(distances[members], kind='stable')]
+            clusters.append([attractions[j] for j in order])
         
         return clusters
 
@@ -0,0 +1,206 @@
+import numpy as np
+
+from attraction_store import pack_strings, unpack_strings
+
+# Attraction fields that a place name is matched against
+SEARCH_FIELDS = ('City', 'State', 'Name', 'Category')
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _csr(groups):
+    """Flatten a list of id lists into (offsets, data) arrays."""
+    offsets = np.zeros(len(groups) + 1, dtype=np.int64)
+    np.cumsum([len(group) for group in groups], out=offsets[1:])
+    data = np.fromiter((i for group in groups for i in group), dtype=np.int32,
+                       count=int(offsets[-1]))
+    return offsets, data
+
+
+def _csr_slices(offsets, data):
+    return [data[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+
+class LocationIndex:
+    """
+    A precompiled index that resolves a place name to the attractions it matches.
+
+    It returns exactly what scanning every attraction with
+    SouthIndiaTravelPlanner.matches_location would return, but the work is done
+    once at startup: every alias in location_variations is resolved to its
+    attraction ids up front, and free-text places are matched through a trigram
+    index over the distinct City/State/Name/Category values instead of over rows.
+    """
+
+    def __init__(self, attractions, location_variations):
+        """
+        Build the index.
+
+        Args:
+            attractions (list): List of attraction dictionaries
+            location_variations (dict): Canonical location key -> list of aliases
+        """
+        value_ids = {}
+        for attraction_id, attraction in enumerate(attractions):
+            for field in SEARCH_FIELDS:
+                ids = value_ids.setdefault(attraction[field].lower().strip(), [])
+                if not ids or ids[-1] != attraction_id:
+                    ids.append(attraction_id)
+
+        # Distinct lowercased field values and the attractions carrying them
+        self._values = list(value_ids)
+        self._value_offsets, self._value_id_data = _csr(list(value_ids.values()))
+
+        postings = {}
+        for value_idx, value in enumerate(self._values):
+            for gram in _trigrams(value):
+                postings.setdefault(gram, []).append(value_idx)
+        self._trigram_postings = {gram: np.array(value_idxs, dtype=np.int32)
+                                  for gram, value_idxs in postings.items()}
+
+        # Special handling for Tirupati matches every Andhra Pradesh attraction
+        self._andhra_pradesh_ids = np.array(
+            [attraction_id for attraction_id, attraction in enumerate(attractions)
+             if 'Andhra Pradesh' in attraction['State']], dtype=np.int32)
+
+        # An alias belongs to the first key that lists it, as in matches_location
+        self._alias_keys = {}
+        for key, variations in location_variations.items():
+            for var in variations:
+                self._alias_keys.setdefault(var, key)
+
+        self._key_ids = {}
+        for key, variations in location_variations.items():
+            ids = [self._substring_ids(var) for var in variations]
+            self._key_ids[key] = np.unique(np.concatenate(ids)).astype(np.int32)
+
+    def _value_ids(self, value_idx):
+        start, end = self._value_offsets[value_idx:value_idx + 2]
+        return self._value_id_data[start:end]
+
+    def _substring_ids(self, needle):
+        """
+        Find attractions with a search field containing the given text.
+
+        Args:
+            needle (str): Lowercased, stripped text to look for
+
+        Returns:
+            numpy.ndarray: Sorted ids of the matching attractions
+        """
+        if len(needle) < 3:
+            # Too short to have a trigram, check every distinct value
+            candidates = range(len(self._values))
+        else:
+            empty = np.empty(0, dtype=np.int32)
+            grams = sorted(_trigrams(needle),
+                           key=lambda gram: len(self._trigram_postings.get(gram, empty)))
+            candidates = self._trigram_postings.get(grams[0], empty)
+            for gram in grams[1:]:
+                if len(candidates) <= 32:
+                    # Cheaper to check the few remaining values directly
+                    break
+                candidates = np.intersect1d(candidates, self._trigram_postings.get(gram, empty),
+                                            assume_unique=True)
+
+        matches = [self._value_ids(value_idx) for value_idx in candidates
+                   if needle in self._values[value_idx]]
+        if not matches:
+            return np.empty(0, dtype=np.int32)
+        return np.unique(np.concatenate(matches))
+
+    def canonical_key(self, location):
+        """
+        Normalize a place name so that aliases of the same location compare equal.
+
+        Args:
+            location (str): Place name as entered by the user
+
+        Returns:
+            str: The location_variations key for known aliases, otherwise the
+                lowercased, stripped place name
+        """
+        location_lower = location.lower().strip()
+        return self._alias_keys.get(location_lower, location_lower)
+
+    def lookup(self, location):
+        """
+        Find the attractions matching a place name.
+
+        Args:
+            location (str): Place name as entered by the user
+
+        Returns:
+            list: Ids of the matching attractions in dataset order
+        """
+        location_lower = location.lower().strip()
+
+        key = self._alias_keys.get(location_lower)
+        if key is not None:
+            ids = self._key_ids[key]
+        else:
+            ids = self._substring_ids(location_lower)
+
+        if 'tirupati' in location_lower:
+            ids = np.union1d(ids, self._andhra_pradesh_ids)
+
+        return ids.tolist()
+
+    def to_arrays(self):
+        """
+        Export the index as NumPy arrays, for saving in a dataset snapshot.
+
+        Returns:
+            dict: Array name -> numpy.ndarray
+        """
+        grams = list(self._trigram_postings)
+        gram_offsets, gram_data = _csr([self._trigram_postings[gram] for gram in grams])
+        keys = list(self._key_ids)
+        key_offsets, key_data = _csr([self._key_ids[key] for key in keys])
+        aliases = list(self._alias_keys)
+        key_positions = {key: i for i, key in enumerate(keys)}
+
+        arrays = {
+            'value_offsets': self._value_offsets,
+            'value_id_data': self._value_id_data,
+            'gram_offsets': gram_offsets,
+            'gram_data': gram_data,
+            'key_offsets': key_offsets,
+            'key_data': key_data,
+            'alias_keys': np.array([key_positions[self._alias_keys[alias]] for alias in aliases],
+                                   dtype=np.int32),
+            'andhra_pradesh_ids': self._andhra_pradesh_ids,
+        }
+        for name, strings in (('values', self._values), ('grams', grams),
+                              ('keys', keys), ('aliases', aliases)):
+            arrays[f'{name}_blob'], arrays[f'{name}_offsets'] = pack_strings(strings)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """
+        Rebuild an index exported with to_arrays.
+
+        Args:
+            arrays (dict): Array name -> numpy.ndarray
+
+        Returns:
+            LocationIndex: The index
+        """
+        index = cls.__new__(cls)
+        strings = {name: unpack_strings(arrays[f'{name}_blob'], arrays[f'{name}_offsets'])
+                   for name in ('values', 'grams', 'keys', 'aliases')}
+
+        index._values = strings['values']
+        index._value_offsets = arrays['value_offsets']
+        index._value_id_data = arrays['value_id_data']
+        index._trigram_postings = dict(zip(
+            strings['grams'], _csr_slices(arrays['gram_offsets'], arrays['gram_data'])))
+        index._andhra_pradesh_ids = arrays['andhra_pradesh_ids']
+        index._key_ids = dict(zip(
+            strings['keys'], _csr_slices(arrays['key_offsets'], arrays['key_data'])))
+        index._alias_keys = {alias: strings['keys'][position] for alias, position
+                             in zip(strings['aliases'], arrays['alias_keys'].tolist())}
+        return index
@@ -0,0 +1,189 @@
+import bisect
+import contextvars
+import threading
+import time
+import uuid
+from contextlib import nullcontext
+
+# Histogram buckets in seconds, from sub-millisecond stages to slow requests
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_NULL_STAGE = nullcontext()
+_current_trace = contextvars.ContextVar('trace', default=None)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{value}"' for key, value in labels) + '}'
+
+
+def format_metric(name, kind, help_text, samples):
+    """
+    Render one metric family in the Prometheus text format.
+
+    Args:
+        name (str): Metric name
+        kind (str): 'counter' or 'gauge'
+        help_text (str): Description
+        samples (list): (labels, value) pairs, labels being a tuple of (key, value)
+
+    Returns:
+        list: Lines of text
+    """
+    lines = [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+    lines.extend(f'{name}{_format_labels(labels)} {value}' for labels, value in samples)
+    return lines
+
+
+class Histogram:
+    """
+    A thread-safe histogram with fixed buckets, as exported to Prometheus.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def samples(self, name, labels):
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + ('+Inf',), counts):
+            cumulative += bucket_count
+            lines.append(f'{name}_bucket{_format_labels(labels + (("le", bound),))} {cumulative}')
+        lines.append(f'{name}_sum{_format_labels(labels)} {total}')
+        lines.append(f'{name}_count{_format_labels(labels)} {count}')
+        return lines
+
+
+class Trace:
+    """
+    Stage timings of one traced request.
+    """
+
+    def __init__(self, trace_id=None):
+        self.id = trace_id or uuid.uuid4().hex
+        self.stages = {}
+
+
+class _Stage:
+    __slots__ = ('metrics', 'name', 'start')
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe_stage(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Metrics:
+    """
+    Collects per-stage latency histograms and request counters.
+
+    When disabled, stage() returns a shared no-op context manager and nothing
+    is recorded, so instrumented code pays only for the method call.
+    """
+
+    def __init__(self, enabled=True, buckets=DEFAULT_BUCKETS):
+        """
+        Initialize the collector.
+
+        Args:
+            enabled (bool): Whether to record anything
+            buckets (tuple): Histogram bucket upper bounds in seconds
+        """
+        self.enabled = enabled
+        self.buckets = buckets
+        self._stages = {}
+        self._requests = {}
+        self._lock = threading.Lock()
+
+    def _histogram(self, histograms, key):
+        histogram = histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = histograms.setdefault(key, Histogram(self.buckets))
+        return histogram
+
+    def stage(self, name):
+        """
+        Time a block of code as one stage of itinerary generation.
+
+        Args:
+            name (str): Stage name, used as the 'stage' label
+
+        Returns:
+            A context manager
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def observe_stage(self, name, seconds):
+        if not self.enabled:
+            return
+        self._histogram(self._stages, name).observe(seconds)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.stages[name] = trace.stages.get(name, 0.0) + seconds
+
+    def observe_request(self, endpoint, status, seconds):
+        if self.enabled:
+            self._histogram(self._requests, (endpoint, status)).observe(seconds)
+
+    def start_trace(self, trace_id=None):
+        """
+        Start collecting stage timings for the current request.
+
+        Args:
+            trace_id (str): Id supplied by the caller, a new one is generated if None
+
+        Returns:
+            Trace: The trace, whose stages fill in as the request runs
+        """
+        trace = Trace(trace_id)
+        _current_trace.set(trace)
+        return trace
+
+    def end_trace(self):
+        _current_trace.set(None)
+
+    def render(self):
+        """
+        Render every histogram in the Prometheus text format.
+
+        Returns:
+            list: Lines of text
+        """
+        lines = [
+            '# HELP itinerary_stage_seconds Time spent in each itinerary generation stage.',
+            '# TYPE itinerary_stage_seconds histogram',
+        ]
+        for name, histogram in sorted(self._stages.items()):
+            lines.extend(histogram.samples('itinerary_stage_seconds', (('stage', name),)))
+        lines.extend([
+            '# HELP http_request_seconds Time spent serving each request.',
+            '# TYPE http_request_seconds histogram',
+        ])
+        for (endpoint, status), histogram in sorted(self._requests.items()):
+            lines.extend(histogram.samples('http_request_seconds',
+                                           (('endpoint', endpoint), ('status', status))))
+        return lines
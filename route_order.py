@@ -0,0 +1,225 @@
+import logging
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from geo import pairwise_haversine_km, travel_minutes
+
+# Largest number of locations ordered exactly with Held-Karp
+EXACT_LIMIT = 7
+
+# Distance comparisons the heuristic may make (nearest-neighbour steps and 2-opt
+# moves), across all starting points. A count rather than a time limit, so the
+# same input always gives the same route whatever the load.
+HEURISTIC_BUDGET = 40_000
+
+logger = logging.getLogger('itinerary')
+
+Route = namedtuple('Route', ['order', 'distance_km', 'travel_time', 'legs'])
+
+
+def location_distance_matrix(representatives):
+    """
+    Distances between locations, each represented by a set of points.
+
+    Two locations are as far apart as their closest pair of representatives
+    (e.g. cluster centers), which is where the trip would cross between them.
+
+    Args:
+        representatives (list): One (n_points, 2) array of (lat, lon) per location
+
+    Returns:
+        numpy.ndarray: Symmetric (n_locations, n_locations) matrix in kilometers
+    """
+    points = np.concatenate([np.asarray(r, dtype=np.float64).reshape(-1, 2)
+                             for r in representatives])
+    owners = np.repeat(np.arange(len(representatives)), [len(r) for r in representatives])
+    pairwise = pairwise_haversine_km(points[:, 0], points[:, 1])
+
+    n = len(representatives)
+    matrix = np.zeros((n, n))
+    for i in range(n):
+        rows = pairwise[owners == i]
+        for j in range(i + 1, n):
+            matrix[i, j] = matrix[j, i] = rows[:, owners == j].min()
+    return matrix
+
+
+def _path_length(path, distances):
+    return sum(distances[a, b] for a, b in zip(path, path[1:]))
+
+
+def _held_karp(distances, start, end):
+    """Shortest open path through every node, optionally with fixed ends."""
+    n = len(distances)
+    full = (1 << n) - 1
+    best = {}
+    for j in range(n):
+        if start is None or j == start:
+            if n == 1 or j != end:
+                best[(1 << j, j)] = (0.0, None)
+
+    for mask in range(1, full + 1):
+        for j in range(n):
+            state = best.get((mask, j))
+            if state is None:
+                continue
+            cost = state[0]
+            for k in range(n):
+                if mask & (1 << k):
+                    continue
+                next_mask = mask | (1 << k)
+                # The fixed end can only be the last node visited
+                if k == end and next_mask != full:
+                    continue
+                next_cost = cost + distances[j, k]
+                current = best.get((next_mask, k))
+                if current is None or next_cost < current[0]:
+                    best[(next_mask, k)] = (next_cost, j)
+
+    ends = [j for j in range(n) if (full, j) in best]
+    last = min(ends, key=lambda j: best[(full, j)][0])
+    path, mask = [], full
+    while last is not None:
+        path.append(last)
+        _, previous = best[(mask, last)]
+        mask &= ~(1 << last)
+        last = previous
+    return path[::-1]
+
+
+def _nearest_neighbour(distances, first, end):
+    n = len(distances)
+    remaining = set(range(n)) - {first}
+    if end is not None:
+        remaining.discard(end)
+    path = [first]
+    while remaining:
+        current = path[-1]
+        next_node = min(remaining, key=lambda k: (distances[current, k], k))
+        path.append(next_node)
+        remaining.remove(next_node)
+    if end is not None and end != first:
+        path.append(end)
+    return path
+
+
+def two_opt(path, distances, fixed_start=False, fixed_end=False, budget=None, deadline=None):
+    """
+    Improve an open path by segment reversals until no gain or out of budget.
+
+    Args:
+        path (list): Node indices in visiting order, reordered in place
+        distances (numpy.ndarray): Symmetric distance matrix between the nodes
+        fixed_start (bool): Keep the first node first
+        fixed_end (bool): Keep the last node last
+        budget (int): Reversals to evaluate at most, None for no limit
+        deadline (float): time.perf_counter() value to stop at, None for none
+
+    Returns:
+        tuple: (path, number of reversals evaluated)
+    """
+    n = len(path)
+    first = 1 if fixed_start else 0
+    last = n - 2 if fixed_end else n - 1
+    if budget is None:
+        budget = float('inf')
+    if deadline is None:
+        deadline = float('inf')
+    evaluated = 0
+    improved = True
+    while improved and evaluated < budget:
+        improved = False
+        for i in range(first, last):
+            for k in range(i + 1, last + 1):
+                # Reversing path[i:k + 1] only changes the legs at its two ends
+                before = distances[path[i - 1], path[i]] if i > 0 else 0.0
+                after = distances[path[k], path[k + 1]] if k < n - 1 else 0.0
+                new_before = distances[path[i - 1], path[k]] if i > 0 else 0.0
+                new_after = distances[path[i], path[k + 1]] if k < n - 1 else 0.0
+                if new_before + new_after < before + after - 1e-9:
+                    path[i:k + 1] = path[i:k + 1][::-1]
+                    improved = True
+            evaluated += last - i
+            if evaluated >= budget or time.perf_counter() >= deadline:
+                break
+        if time.perf_counter() >= deadline:
+            break
+    return path, evaluated
+
+
+def _heuristic(distances, start, end, budget, time_limit):
+    """
+    Nearest neighbour from each allowed start, refined by 2-opt, within budget.
+
+    time_limit is only a safety net; reaching it makes the route depend on
+    timing, so it is logged.
+    """
+    deadline = time.perf_counter() + time_limit
+    n = len(distances)
+    starts = [start] if start is not None else [j for j in range(n) if j != end]
+
+    best_path, best_length = None, None
+    remaining = budget
+    for first in starts:
+        path = _nearest_neighbour(distances, first, end)
+        remaining -= n * (n - 1) // 2
+        path, evaluated = two_opt(path, distances, start is not None, end is not None,
+                                   max(remaining, 0), deadline)
+        remaining -= evaluated
+        length = _path_length(path, distances)
+        if best_length is None or length < best_length:
+            best_path, best_length = path, length
+        if time.perf_counter() >= deadline:
+            logger.warning(f'Route ordering for {n} locations stopped at its '
+                           f'{time_limit} s time limit before using its budget')
+            break
+        if remaining <= 0:
+            break
+    return best_path
+
+
+def plan_route(distances, start=None, end=None, budget=HEURISTIC_BUDGET, time_limit=1.0,
+               speed=None):
+    """
+    Order locations to minimize the total inter-city distance.
+
+    Up to EXACT_LIMIT locations are solved exactly with Held-Karp; larger
+    inputs use nearest neighbour + 2-opt with a fixed budget of distance
+    comparisons. Both are deterministic.
+
+    Args:
+        distances (numpy.ndarray): Symmetric distance matrix in kilometers
+        start (int): Index of a location that must come first, or None
+        end (int): Index of a location that must come last, or None
+        budget (int): Distance comparisons the heuristic may make
+        time_limit (float): Seconds after which the heuristic stops anyway, a
+            safety net that is logged when reached
+        speed (SpeedProfile): Converts leg distances to minutes (see
+            travel_times), None for travel_minutes at the average speed
+
+    Returns:
+        Route: Location indices in visiting order, total distance in kilometers,
+            total travel time in minutes and per-leg travel times
+    """
+    n = len(distances)
+    if n == 0:
+        return Route([], 0.0, 0, [])
+    if start is not None and start == end and n > 1:
+        raise ValueError('The same location cannot be both the start and the end')
+
+    if n <= 2:
+        order = list(range(n))
+        if (start is not None and order[0] != start) or (end is not None and order[-1] != end):
+            order.reverse()
+    elif n <= EXACT_LIMIT:
+        order = _held_karp(distances, start, end)
+    else:
+        order = _heuristic(distances, start, end, budget, time_limit)
+
+    leg_km = [distances[a, b] for a, b in zip(order, order[1:])]
+    to_minutes = speed.minutes if speed is not None else travel_minutes
+    legs = [int(minutes) for minutes in to_minutes(leg_km)] if leg_km else []
+    return Route(order, float(sum(leg_km)), sum(legs), legs)
+
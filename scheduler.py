@@ -0,0 +1,223 @@
+import heapq
+from collections import namedtuple
+
+import numpy as np
+
+from geo import haversine_km, pairwise_haversine_km, travel_minutes
+from route_order import two_opt
+
+# Below this many attractions per location, nearby ones are found by a direct
+# scan, which beats growing an index search over a sparse neighbourhood
+NEARBY_SCAN_LIMIT = 1024
+
+DayPlan = namedtuple('DayPlan', ['ids', 'clusters', 'visit_time', 'travel_time'])
+
+
+def attraction_value(ratings, review_counts):
+    """
+    How worthwhile attractions are: rating, weighted up by (log) popularity.
+
+    Args:
+        ratings (numpy.ndarray): Ratings out of 5
+        review_counts (numpy.ndarray): Number of reviews
+
+    Returns:
+        numpy.ndarray: Values, higher is better
+    """
+    return ratings * np.log1p(review_counts)
+
+
+class DayScheduler:
+    """
+    Packs the days spent at one location under a daily time budget.
+
+    Every cluster of attractions is a max-heap on attraction value. Each step
+    looks at the most valuable remaining attractions of every cluster and adds
+    the one with the best value per minute, counting its visit time plus the
+    travel time from the previous stop, so nearby attractions win unless a far
+    one is clearly better. With a spatial index, the attractions closest to the
+    previous stop are compared as well, even when their value is too low to be
+    near the top of a heap. Attractions that get used (here or at another
+    location with the same name) are dropped lazily when they reach the top of
+    a heap, so removals cost O(log n). Each finished day is reordered with 2-opt.
+    """
+
+    def __init__(self, store, clusters, used_names, candidate_window=32, max_candidates=256,
+                 spatial_index=None, nearby_candidates=8, travel_times=None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            store (AttractionStore): The dataset
+            clusters (list): Lists of attraction ids, one per cluster
+            used_names (numpy.ndarray): Request-local flags per distinct name code,
+                shared by all locations of one itinerary and updated in place
+            candidate_window (int): Attractions per cluster compared at each step
+            max_candidates (int): Attractions per cluster inspected at each step
+                when looking for ones that still fit the day
+            spatial_index (SpatialIndex): Index over the store's coordinates, or None
+            nearby_candidates (int): Attractions nearest to the previous stop
+                compared at each step when spatial_index is given
+            travel_times (TravelTimes): Travel minutes between attractions, or
+                None for the 40 km/h formula
+        """
+        self.store = store
+        self.used_names = used_names
+        self.candidate_window = candidate_window
+        self.max_candidates = max_candidates
+        self.spatial_index = spatial_index
+        self.nearby_candidates = nearby_candidates
+        self.travel_times = travel_times
+
+        self._heaps = []
+        self._min_visit = []
+        for cluster_idx, ids in enumerate(clusters):
+            ids = np.asarray(ids, dtype=np.int64)
+            values = attraction_value(store.ratings[ids], store.review_counts[ids])
+            heap = [(-value, attraction_id, cluster_idx)
+                    for value, attraction_id in zip(values.tolist(), ids.tolist())]
+            heapq.heapify(heap)
+            self._heaps.append(heap)
+            # Lower bound on the visit time of anything left in the cluster
+            self._min_visit.append(int(store.visit_times[ids].min()) if len(ids) else 0)
+
+        if spatial_index is not None:
+            # This location's attractions that have not been picked yet
+            self._cluster_of = {attraction_id: cluster_idx
+                                for cluster_idx, ids in enumerate(clusters)
+                                for attraction_id in ids}
+            self._members = np.fromiter(self._cluster_of, dtype=np.int64,
+                                        count=len(self._cluster_of))
+            # Flags per member, so a request's cost does not grow with the whole dataset
+            self._position = {attraction_id: position for position, attraction_id
+                              in enumerate(self._members.tolist())}
+            self._available = np.ones(len(self._members), dtype=bool)
+            # The index filters by attraction id, a large location pays for a full mask
+            self._index_mask = None
+            if len(self._members) > NEARBY_SCAN_LIMIT:
+                self._index_mask = np.zeros(len(store), dtype=bool)
+                self._index_mask[self._members] = True
+
+    def _is_used(self, attraction_id):
+        return self.used_names[self.store.name_codes[attraction_id]]
+
+    def _window(self, cluster_idx, remaining_minutes):
+        """Pop up to candidate_window unused attractions that might still fit."""
+        heap = self._heaps[cluster_idx]
+        window, skipped = [], []
+        inspected = 0
+        while heap and len(window) < self.candidate_window and inspected < self.max_candidates:
+            entry = heapq.heappop(heap)
+            if self._is_used(entry[1]):
+                continue  # Lazy removal
+            inspected += 1
+            if self.store.visit_times[entry[1]] <= remaining_minutes:
+                window.append(entry)
+            else:
+                skipped.append(entry)
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        return window
+
+    def _nearby(self, last_id, exclude):
+        """Heap-style entries for the unused attractions closest to the previous stop."""
+        lat, lng = self.store.latitudes[last_id], self.store.longitudes[last_id]
+        if self._index_mask is None:
+            # Same answer as the index: k nearest by distance, then id
+            ids = self._members[self._available]
+            distances = haversine_km(lat, lng, self.store.latitudes[ids],
+                                     self.store.longitudes[ids])
+            ids = ids[np.lexsort((ids, distances))[:self.nearby_candidates]]
+        else:
+            ids, _ = self.spatial_index.nearest(lat, lng, k=self.nearby_candidates,
+                                                mask=self._index_mask)
+        ids = [i for i in ids.tolist() if i not in exclude and not self._is_used(i)]
+        values = attraction_value(self.store.ratings[ids], self.store.review_counts[ids])
+        return [(-value, attraction_id, self._cluster_of[attraction_id])
+                for value, attraction_id in zip(values.tolist(), ids)]
+
+    def _pick(self, last_id, remaining_minutes):
+        """Choose the next stop, or None when nothing fits in the remaining time."""
+        window = []
+        for cluster_idx in range(len(self._heaps)):
+            if self._min_visit[cluster_idx] <= remaining_minutes:
+                window.extend(self._window(cluster_idx, remaining_minutes))
+        candidates = list(window)
+        if self.spatial_index is not None and last_id is not None:
+            # Nearby entries stay in their heaps, only window entries were popped
+            candidates.extend(self._nearby(last_id, {entry[1] for entry in window}))
+        if not candidates:
+            return None
+
+        ids = np.array([entry[1] for entry in candidates], dtype=np.int64)
+        visits = self.store.visit_times[ids].astype(np.int64)
+        if last_id is None:
+            travel = np.zeros(len(ids), dtype=np.int64)
+        elif self.travel_times is not None:
+            travel = self.travel_times.minutes(last_id, ids)
+        else:
+            travel = travel_minutes(haversine_km(
+                self.store.latitudes[last_id], self.store.longitudes[last_id],
+                self.store.latitudes[ids], self.store.longitudes[ids]))
+        cost = visits + travel
+        values = -np.array([entry[0] for entry in candidates])
+        score = np.where(cost <= remaining_minutes, values / np.maximum(cost, 1), -np.inf)
+
+        best = int(np.argmax(score))
+        chosen = candidates[best] if np.isfinite(score[best]) else None
+        for entry in window:
+            if entry is not chosen:
+                heapq.heappush(self._heaps[entry[2]], entry)
+        if chosen is None:
+            return None
+        return chosen[1], chosen[2], int(visits[best]), int(travel[best])
+
+    def next_day(self, max_minutes):
+        """
+        Plan the next day.
+
+        Args:
+            max_minutes (int): Time budget for visits plus travel
+
+        Returns:
+            DayPlan: Attraction ids and their clusters in visiting order, total
+                visit minutes and total travel minutes; ids is empty when
+                nothing fits
+        """
+        ids, clusters = [], []
+        elapsed = 0
+        last_id = None
+        while True:
+            pick = self._pick(last_id, max_minutes - elapsed)
+            if pick is None:
+                break
+            attraction_id, cluster_idx, visit, travel = pick
+            ids.append(attraction_id)
+            clusters.append(cluster_idx)
+            elapsed += visit + travel
+            self.used_names[self.store.name_codes[attraction_id]] = True
+            if self.spatial_index is not None:
+                self._available[self._position[attraction_id]] = False
+                if self._index_mask is not None:
+                    self._index_mask[attraction_id] = False
+            last_id = attraction_id
+
+        # Keep the 2-opt order unless rounding each leg to whole minutes makes it longer
+        order = list(range(len(ids)))
+        if len(ids) > 2:
+            order, _ = two_opt(order, pairwise_haversine_km(self.store.latitudes[ids],
+                                                            self.store.longitudes[ids]))
+        if self._travel_time([ids[i] for i in order]) <= self._travel_time(ids):
+            ids = [ids[i] for i in order]
+            clusters = [clusters[i] for i in order]
+        visit_time = int(self.store.visit_times[ids].sum()) if ids else 0
+        return DayPlan(ids, clusters, visit_time, self._travel_time(ids))
+
+    def _travel_time(self, ids):
+        if len(ids) < 2:
+            return 0
+        if self.travel_times is not None:
+            return self.travel_times.path_minutes(ids)
+        return int(travel_minutes(haversine_km(
+            self.store.latitudes[ids[:-1]], self.store.longitudes[ids[:-1]],
+            self.store.latitudes[ids[1:]], self.store.longitudes[ids[1:]])).sum())
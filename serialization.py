@@ -0,0 +1,44 @@
+import gzip
+import json
+
+try:
+    import orjson
+except ImportError:  # Optional, the standard library encoder is the fallback
+    orjson = None
+
+GZIP_LEVEL = 5
+
+
+def dumps(obj):
+    """
+    Encode an object as compact UTF-8 JSON.
+
+    Args:
+        obj: JSON-compatible object
+
+    Returns:
+        bytes: The encoded document
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass  # e.g. NumPy scalars, which the standard encoder may still handle
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def compress(body, accept_encoding, min_bytes):
+    """
+    Gzip a response body when the client accepts it and it is large enough.
+
+    Args:
+        body (bytes): Encoded response
+        accept_encoding (str): The request's Accept-Encoding header
+        min_bytes (int): Smallest body worth compressing, 0 to never compress
+
+    Returns:
+        tuple: (body, content_encoding) where content_encoding is 'gzip' or None
+    """
+    if not min_bytes or len(body) < min_bytes or 'gzip' not in accept_encoding.lower():
+        return body, None
+    return gzip.compress(body, compresslevel=GZIP_LEVEL), 'gzip'
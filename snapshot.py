@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from attraction_store import AttractionStore
+from location_index import LocationIndex
+
+# Bump when the layout of the saved arrays changes
+SNAPSHOT_VERSION = 1
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_fingerprint(csv_path, known=None):
+    """
+    Identify the contents of the source CSV.
+
+    Args:
+        csv_path (str): Path to attractions.csv
+        known (dict): Fingerprint of an earlier read of the file, whose
+            checksum is reused while the file's size and modification time
+            still match it, or None to always hash the file
+
+    Returns:
+        dict: Size, modification time and SHA-256 of the file
+    """
+    stat = os.stat(csv_path)
+    fingerprint = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    if known and all(known.get(field) == value for field, value in fingerprint.items()):
+        fingerprint['sha256'] = known['sha256']
+    else:
+        fingerprint['sha256'] = _file_sha256(csv_path)
+    return fingerprint
+
+
+def dataset_version(csv_path, known=None):
+    """
+    Short identifier of the dataset contents, changes whenever the CSV does.
+
+    Args:
+        csv_path (str): Path to attractions.csv
+        known (dict): Earlier fingerprint of the file, see source_fingerprint
+
+    Returns:
+        str: Hex prefix of the file's SHA-256, or 'missing'
+    """
+    try:
+        return source_fingerprint(csv_path, known)['sha256'][:16]
+    except OSError:
+        return 'missing'
+
+
+def variations_digest(location_variations):
+    """Digest of the alias table the location index was built from."""
+    payload = json.dumps(list(location_variations.items()), separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def save_snapshot(path, store, location_index, csv_path, location_variations):
+    """
+    Write the dataset and its location index to a versioned .npz snapshot.
+
+    The file is written next to its destination and renamed into place, so a
+    reader never sees a partial snapshot.
+
+    Args:
+        path (str): Destination .npz file
+        store (AttractionStore): Dataset built from csv_path
+        location_index (LocationIndex): Index built from store
+        csv_path (str): Source CSV the snapshot was built from
+        location_variations (dict): Alias table the index was built with
+    """
+    meta = {
+        'version': SNAPSHOT_VERSION,
+        'source': source_fingerprint(csv_path),
+        'variations': variations_digest(location_variations),
+    }
+    arrays = {'meta': np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8)}
+    arrays.update({f'store__{name}': array for name, array in store.to_arrays().items()})
+    arrays.update({f'index__{name}': array for name, array in location_index.to_arrays().items()})
+
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+
+
+def _fresh_source(meta, csv_path, location_variations):
+    """The CSV's fingerprint if the snapshot was built from its contents, else None."""
+    if meta.get('version') != SNAPSHOT_VERSION:
+        return None
+    if meta.get('variations') != variations_digest(location_variations):
+        return None
+
+    source = meta.get('source', {})
+    if os.stat(csv_path).st_size != source.get('size'):
+        return None
+    # Hashed only when touched, possibly unchanged, e.g. after a fresh checkout
+    current = source_fingerprint(csv_path, known=source)
+    return current if current['sha256'] == source.get('sha256') else None
+
+
+def load_snapshot(path, csv_path, location_variations):
+    """
+    Load a snapshot written by save_snapshot if it matches the current CSV.
+
+    Args:
+        path (str): Snapshot .npz file
+        csv_path (str): Source CSV the snapshot must have been built from
+        location_variations (dict): Alias table the index must have been built with
+
+    Returns:
+        tuple: (AttractionStore, LocationIndex, source) where source is the
+            CSV's source_fingerprint, or None when the snapshot is missing,
+            stale or unreadable
+    """
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as npz:
+            meta = json.loads(npz['meta'].tobytes().decode('utf-8'))
+            source = _fresh_source(meta, csv_path, location_variations)
+            if source is None:
+                print(f"Snapshot {path} is stale, loading {csv_path}")
+                return None
+            arrays = {name: npz[name] for name in npz.files}
+    except Exception as e:
+        print(f"Error loading snapshot {path}: {e}")
+        return None
+
+    def section(prefix):
+        return {name[len(prefix):]: array for name, array in arrays.items()
+                if name.startswith(prefix)}
+
+    return (AttractionStore.from_arrays(section('store__')),
+            LocationIndex.from_arrays(section('index__')), source)
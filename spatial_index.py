@@ -0,0 +1,155 @@
+import numpy as np
+
+from geo import EARTH_RADIUS_KM, haversine_km
+
+KM_PER_DEGREE = np.pi * EARTH_RADIUS_KM / 180
+
+
+class SpatialIndex:
+    """
+    A uniform latitude/longitude grid over a set of points.
+
+    Points are sorted by grid cell, so each row of cells is a contiguous run
+    and a query only reads the cells overlapping the bounding box of its
+    search circle. Exact haversine distances are computed for those
+    candidates only. Longitudes are not wrapped at the antimeridian.
+    """
+
+    def __init__(self, latitudes, longitudes, cell_deg=0.01):
+        """
+        Build the index.
+
+        Args:
+            latitudes (array-like): Point latitudes in degrees
+            longitudes (array-like): Point longitudes in degrees
+            cell_deg (float): Cell size in degrees
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        self.cell_deg = cell_deg
+        self.size = len(latitudes)
+        if self.size:
+            self._lat0, self._lon0 = latitudes.min(), longitudes.min()
+            self._n_rows = int((latitudes.max() - self._lat0) // cell_deg) + 1
+            self._n_cols = int((longitudes.max() - self._lon0) // cell_deg) + 1
+        else:
+            self._lat0 = self._lon0 = 0.0
+            self._n_rows = self._n_cols = 1
+
+        rows, cols = self._cells(latitudes, longitudes)
+        keys = rows.astype(np.int64) * self._n_cols + cols
+        order = np.argsort(keys, kind='stable')
+        self._ids = order.astype(np.int32 if self.size < 2 ** 31 else np.int64)
+        self._lats = latitudes[order]
+        self._lons = longitudes[order]
+        # Distinct cell keys and where their points start in the sorted arrays
+        self._cell_keys, starts = np.unique(keys[order], return_index=True)
+        self._cell_offsets = np.append(starts, self.size)
+
+    def _cells(self, latitudes, longitudes):
+        rows = np.floor((latitudes - self._lat0) / self.cell_deg).astype(np.int64)
+        cols = np.floor((longitudes - self._lon0) / self.cell_deg).astype(np.int64)
+        return rows, cols
+
+    def _box(self, lat, lng, radius_km):
+        """
+        Positions (into the sorted arrays) of every point in the circle's bounding box.
+
+        Returns:
+            tuple: (positions, covers_grid) where covers_grid tells whether the
+                box contains the whole grid
+        """
+        dlat = radius_km / KM_PER_DEGREE
+        # Longitude degrees shrink towards the poles, size the box for the worst latitude
+        cos_lat = np.cos(np.radians(min(abs(lat) + dlat, 90.0)))
+        dlng = radius_km / (KM_PER_DEGREE * cos_lat) if cos_lat > 1e-9 else 360.0
+
+        (row_lo, row_hi), (col_lo, col_hi) = self._cells(np.array([lat - dlat, lat + dlat]),
+                                                         np.array([lng - dlng, lng + dlng]))
+        covers_grid = (row_lo <= 0 and col_lo <= 0 and
+                       row_hi >= self._n_rows - 1 and col_hi >= self._n_cols - 1)
+        row_lo, row_hi = max(row_lo, 0), min(row_hi, self._n_rows - 1)
+        col_lo, col_hi = max(col_lo, 0), min(col_hi, self._n_cols - 1)
+        if row_lo > row_hi or col_lo > col_hi:
+            return np.empty(0, dtype=np.int64), covers_grid
+
+        rows = np.arange(row_lo, row_hi + 1, dtype=np.int64) * self._n_cols
+        starts = self._cell_offsets[np.searchsorted(self._cell_keys, rows + col_lo, 'left')]
+        ends = self._cell_offsets[np.searchsorted(self._cell_keys, rows + col_hi, 'right')]
+        # Concatenate the runs [start, end) of every row without a Python loop
+        lengths = ends - starts
+        positions = np.arange(lengths.sum()) + np.repeat(starts - np.cumsum(lengths) + lengths,
+                                                         lengths)
+        return positions, covers_grid
+
+    def _candidates(self, lat, lng, radius_km, mask, within_only):
+        """Ids and distances of the points in the bounding box, in no particular order."""
+        positions, covers_grid = self._box(lat, lng, radius_km)
+        ids = self._ids[positions]
+        if mask is not None:
+            keep = mask[ids]
+            positions, ids = positions[keep], ids[keep]
+        distances = haversine_km(lat, lng, self._lats[positions], self._lons[positions])
+        if within_only:
+            within = distances <= radius_km
+            ids, distances = ids[within], distances[within]
+        return ids, distances, covers_grid
+
+    @staticmethod
+    def _sorted(ids, distances, k=None):
+        if k is not None and len(ids) > k:
+            # Keep everything tied with the k-th distance so ids break the ties
+            kth = np.partition(distances, k - 1)[k - 1]
+            keep = distances <= kth
+            ids, distances = ids[keep], distances[keep]
+        order = np.lexsort((ids, distances))[:k]
+        return ids[order], distances[order]
+
+    def query_radius(self, lat, lng, radius_km, mask=None):
+        """
+        Find the points within a distance of a location.
+
+        Args:
+            lat (float): Latitude in degrees
+            lng (float): Longitude in degrees
+            radius_km (float): Search radius in kilometers
+            mask (numpy.ndarray): Optional boolean flags per point id, only
+                points flagged True are returned
+
+        Returns:
+            tuple: (ids, distances_km) sorted by distance, then id
+        """
+        ids, distances, _ = self._candidates(lat, lng, radius_km, mask, within_only=True)
+        return self._sorted(ids, distances)
+
+    def nearest(self, lat, lng, k=1, mask=None):
+        """
+        Find the k points closest to a location.
+
+        The search radius starts at one cell and doubles until k points are
+        found inside it, so the answer is exact.
+
+        Args:
+            lat (float): Latitude in degrees
+            lng (float): Longitude in degrees
+            k (int): Number of points
+            mask (numpy.ndarray): Optional boolean flags per point id, only
+                points flagged True are returned
+
+        Returns:
+            tuple: (ids, distances_km) of up to k points sorted by distance, then id
+        """
+        if self.size == 0 or k < 1:
+            return np.empty(0, dtype=self._ids.dtype), np.empty(0)
+        radius_km = self.cell_deg * KM_PER_DEGREE
+        while True:
+            ids, distances, covers_grid = self._candidates(lat, lng, radius_km, mask,
+                                                           within_only=False)
+            if not covers_grid:
+                # Points outside the circle may be beaten by unseen ones beyond the box
+                within = distances <= radius_km
+                if np.count_nonzero(within) < k:
+                    radius_km *= 2
+                    continue
+                ids, distances = ids[within], distances[within]
+            return self._sorted(ids, distances, k)
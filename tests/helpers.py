@@ -0,0 +1,385 @@
+"""
+Checks, synthetic data and request replay shared by the tests and the
+benchmarks, which run the checks before timing.
+"""
+import csv
+import json
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from math import atan2, cos, radians, sin, sqrt
+from urllib.parse import urlencode
+
+import numpy as np
+
+from fuzzy_resolver import edit_distance
+from geo import haversine_km, pairwise_haversine_km, travel_minutes
+from location_index import LocationIndex
+from route_order import EXACT_LIMIT
+
+DATASET_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            'attractions.csv')
+
+LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+
+LOCATION_QUERIES = ['Hyderabad', 'mysuru', 'Tirupati', 'kerala', 'Beach', 'Gokarna', 'cochin',
+                    'fort', 'go', 'a', 'Nowhere', 'ooty hill station', 'andhra pradesh']
+
+
+def scan(planner, attractions, place):
+    """Ids of the attractions matches_location accepts, the lookup LocationIndex replaces."""
+    return [i for i, attr in enumerate(attractions) if planner.matches_location(attr, place)]
+
+
+def location_index_mismatches(planner, attractions):
+    """
+    Compare LocationIndex lookups with a matches_location scan.
+
+    Places are LOCATION_QUERIES and every alias in planner.location_variations.
+
+    Returns:
+        tuple: (places checked, list of places whose lookup differs from the scan)
+    """
+    index = LocationIndex(attractions, planner.location_variations)
+    places = LOCATION_QUERIES + [var for variations in planner.location_variations.values()
+                                 for var in variations]
+    return len(places), [place for place in places
+                         if index.lookup(place) != scan(planner, attractions, place)]
+
+
+def scalar_distance(lat1, lon1, lat2, lon2):
+    """The original math-based Haversine formula."""
+    R = 6371  # Earth's radius in kilometers
+
+    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+
+    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
+    c = 2 * atan2(sqrt(a), sqrt(1-a))
+    return R * c
+
+
+def random_points(rng, n):
+    # Spread over South India
+    return rng.uniform(8, 19, n), rng.uniform(73, 85, n)
+
+
+def assert_haversine_matches_scalar(rng, n=100_000):
+    """
+    Check haversine_km, pairwise_haversine_km and travel_minutes against the
+    scalar formula on n random pairs of points.
+    """
+    lats1, lons1 = random_points(rng, n)
+    lats2, lons2 = random_points(rng, n)
+    expected = np.array([scalar_distance(*p) for p in zip(lats1, lons1, lats2, lons2)])
+    actual = haversine_km(lats1, lons1, lats2, lons2)
+    np.testing.assert_allclose(actual, expected, rtol=1e-12, atol=1e-9)
+
+    expected_minutes = np.array([int((d / 40) * 60) for d in expected])
+    np.testing.assert_array_equal(travel_minutes(actual), expected_minutes)
+
+    matrix = pairwise_haversine_km(lats1[:50], lons1[:50], lats2[:40], lons2[:40])
+    expected_matrix = [[scalar_distance(lats1[i], lons1[i], lats2[j], lons2[j])
+                        for j in range(40)] for i in range(50)]
+    np.testing.assert_allclose(matrix, expected_matrix, rtol=1e-12, atol=1e-9)
+
+
+# Field -> type of the full itinerary response, as the frontend reads it
+ATTRACTION_FIELDS = {'Name': str, 'Category': str, 'City': str, 'State': str, 'Latitude': float,
+                     'Longitude': float, 'Rating': float, 'Estimated Visit Time (mins)': int,
+                     'Review Count': int, 'Description': str}
+DAY_FIELDS = {'day': int, 'date': str, 'attractions': list, 'total_time': int,
+              'visit_time': int, 'travel_time': int, 'food_time': int, 'last_location': dict,
+              'map_data': dict}
+MAP_ATTRACTION_FIELDS = {'name': str, 'lat': float, 'lng': float, 'cluster': int,
+                         'visit_time': int}
+CLUSTER_CENTER_FIELDS = {'lat': float, 'lng': float, 'cluster_id': int}
+LAST_LOCATION_FIELDS = {'name': str, 'city': str, 'state': str}
+
+
+def assert_fields(value, fields):
+    """Check value has exactly these keys, each holding exactly its type."""
+    assert set(value) == set(fields), sorted(set(value) ^ set(fields))
+    for key, kind in fields.items():
+        assert type(value[key]) is kind, (key, type(value[key]))
+
+
+def assert_itinerary_schema(result, max_minutes):
+    """
+    Check a full itinerary response's days, field by field, and their time sums.
+
+    Args:
+        result (dict): Response of generate_itinerary without compact
+        max_minutes (int): The request's maxHours in minutes
+    """
+    assert {'itinerary', 'all_attractions', 'route', 'dataset_version'} <= set(result), result
+    for row in result['all_attractions']:
+        assert_fields(row, ATTRACTION_FIELDS)
+    for number, day in enumerate(result['itinerary'], 1):
+        assert_fields(day, DAY_FIELDS)
+        assert day['day'] == number
+        for attraction in day['attractions']:
+            assert_fields(attraction, dict(ATTRACTION_FIELDS, cluster=int))
+        assert set(day['map_data']) == {'attractions', 'cluster_centers'}
+        for point in day['map_data']['attractions']:
+            assert_fields(point, MAP_ATTRACTION_FIELDS)
+        for center in day['map_data']['cluster_centers']:
+            assert_fields(center, CLUSTER_CENTER_FIELDS)
+        assert_fields(day['last_location'], LAST_LOCATION_FIELDS)
+
+        visits = sum(a['Estimated Visit Time (mins)'] for a in day['attractions'])
+        assert day['visit_time'] == visits + day['travel_time'] <= max_minutes
+        assert day['food_time'] == 60 * len(day['attractions'])
+        assert day['total_time'] == day['visit_time'] + day['food_time']
+        assert [a['name'] for a in day['map_data']['attractions']] == \
+            [a['Name'] for a in day['attractions']]
+        assert day['last_location']['name'] == day['attractions'][-1]['Name']
+
+
+def add_typo(name, rng):
+    """name with one substitution, deletion, insertion or swap of neighbours."""
+    i = rng.randrange(len(name))
+    kind = rng.choice(('substitute', 'delete', 'insert', 'swap'))
+    if kind == 'substitute':
+        return name[:i] + rng.choice(LETTERS) + name[i + 1:]
+    if kind == 'delete' and len(name) > 3:
+        return name[:i] + name[i + 1:]
+    if kind == 'swap' and i + 1 < len(name):
+        return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+    return name[:i] + rng.choice(LETTERS) + name[i:]
+
+
+def best_confidence(names, query):
+    """Best confidence over every name, as FuzzyResolver scores it, by a full scan."""
+    return max(1 - edit_distance(query, name) / max(len(query), len(name)) for name in names)
+
+
+def typo_queries(names, n, rng):
+    """(targets, queries): n names picked at random and each with one typo."""
+    targets = [names[rng.randrange(len(names))] for _ in range(n)]
+    return targets, [add_typo(name.lower(), rng) for name in targets]
+
+
+def suggestion_accuracy(resolver, targets, queries):
+    """
+    Suggest places for typo queries, timing each.
+
+    Returns:
+        tuple: (fraction with the target first, fraction with it in the top
+            five, per-query latencies in seconds)
+    """
+    latencies, top1, top5 = [], 0, 0
+    for target, query in zip(targets, queries):
+        start = time.perf_counter()
+        suggestions = resolver.suggest(query)
+        latencies.append(time.perf_counter() - start)
+        places = [s.place for s in suggestions]
+        top1 += places[:1] == [target]
+        top5 += target in places
+    return top1 / len(queries), top5 / len(queries), latencies
+
+
+def shortlist_mismatches(resolver, names, queries):
+    """Queries whose best suggestion scores below the best name of a full scan."""
+    lowered = [name.lower() for name in names]
+    return [query for query in queries
+            if resolver.suggest(query)[0].confidence != round(best_confidence(lowered, query), 3)]
+
+
+def assert_planner_corrects_typos(planner):
+    """Check a planner on the real dataset suggests, corrects and rejects misspelled places."""
+    assert planner.suggest_places('Kodaikanl')[0].place == 'kodaikanal'
+    assert planner.suggest_places('Trivandram')[0].place == 'thiruvananthapuram'
+    assert planner.suggest_places('Ooty')[0].confidence == 1.0
+
+    result = planner.generate_itinerary(['Kodaikanl', 'Ooty'], 3, '2026-01-01', 8)
+    assert result['corrections'] == {'Kodaikanl': 'kodaikanal'}
+    expected = planner.generate_itinerary(['Kodaikanal', 'Ooty'], 3, '2026-01-01', 8)
+    assert result['itinerary'] == expected['itinerary']
+
+    result = planner.generate_itinerary(['Atlantis'], 2, '2026-01-01', 8)
+    assert 'error' in result and result['suggestions'] == []
+
+
+def load_seed_rows(path=DATASET_PATH):
+    """Read attractions.csv as a list of typed attraction dictionaries."""
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    for row in rows:
+        row['Latitude'] = float(row['Latitude'])
+        row['Longitude'] = float(row['Longitude'])
+        row['Rating'] = float(row['Rating'])
+        row['Estimated Visit Time (mins)'] = int(row['Estimated Visit Time (mins)'])
+        row['Review Count'] = int(row['Review Count'])
+    return rows
+
+
+def iter_synthetic_attractions(n_rows, seed=42):
+    """
+    Scale the real dataset to n_rows by cloning rows near their original city.
+
+    Args:
+        n_rows (int): Number of attractions to generate
+        seed (int): Random seed
+
+    Yields:
+        dict: Attraction dictionaries
+    """
+    rng = random.Random(seed)
+    seed_rows = load_seed_rows()
+    for i in range(n_rows):
+        row = dict(seed_rows[i % len(seed_rows)])
+        if i >= len(seed_rows):
+            row['Name'] = f"{row['Name']} {i}"
+            row['Latitude'] += rng.uniform(-0.05, 0.05)
+            row['Longitude'] += rng.uniform(-0.05, 0.05)
+        yield row
+
+
+def synthetic_place_names(n_names, seed=42):
+    """
+    Distinct place names made of words from the real names and cities.
+
+    Names recombine the same vocabulary, so many share words and trigrams
+    the way real attraction names do ("Fort", "Temple", city names).
+
+    Returns:
+        list: n_names distinct names, the real names and cities first
+    """
+    rng = random.Random(seed)
+    seed_rows = load_seed_rows()
+    names = list(dict.fromkeys(name for row in seed_rows for name in (row['Name'], row['City'])))
+    words = sorted({word for name in names for word in name.split() if word.isalpha()})
+    seen = set(names)
+    while len(names) < n_names:
+        name = ' '.join(rng.sample(words, rng.randint(1, 3)))
+        if name not in seen:
+            seen.add(name)
+            names.append(name)
+    return names[:n_names]
+
+
+def synthetic_attractions(n_rows, seed=42):
+    return list(iter_synthetic_attractions(n_rows, seed))
+
+
+def generate_requests(planner, n, seed=42):
+    """
+    Make request records for the places in a planner's dataset.
+
+    Place popularity follows a Zipf-like law and most records repeat one of
+    n / 10 popular packages with their own duration and hours.
+
+    Args:
+        planner (SouthIndiaTravelPlanner): Planner whose places to use
+        n (int): Number of records
+        seed (int): Random seed
+
+    Returns:
+        list: Request dictionaries
+    """
+    rng = random.Random(seed)
+    dataset = planner.dataset
+    aliases = [alias for key, variations in planner.location_variations.items()
+               if dataset.location_index.lookup(key) for alias in variations]
+    pool = list(dict.fromkeys(list(dataset.attractions.cities) +
+                              list(dataset.attractions.states) + aliases))
+    rng.shuffle(pool)
+    weights = [1 / (rank + 1) for rank in range(len(pool))]
+
+    def pick_places():
+        return list(dict.fromkeys(rng.choices(pool, weights, k=rng.randint(1, 4))))
+
+    packages = [pick_places() for _ in range(max(1, n // 10))]
+    records = []
+    for _ in range(n):
+        places = list(rng.choice(packages) if rng.random() < 0.7 else pick_places())
+        roll = rng.random()
+        if roll < 0.05:
+            i = rng.randrange(len(places))
+            places[i] = add_typo(places[i], rng)
+        elif roll < 0.06:
+            places.append('Atlantis')
+        record = {'places': '; '.join(places), 'duration': rng.randint(1, 7),
+                  'startDate': f'2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+                  'maxHours': rng.randint(6, 12)}
+        if len(places) > 1 and rng.random() < 0.15:
+            record['startPlace'] = places[0]
+        if rng.random() < 0.2:
+            record['format'] = 'compact'
+        records.append(record)
+    return records
+
+
+def _app():
+    # Imported on first use, only the request helpers need the loaded planner
+    import app
+    return app
+
+
+def make_requests(planner, n, seed=42):
+    """(method, url, body) tuples, about three quarters of them itineraries."""
+    rng = random.Random(seed)
+    store = planner.attractions
+    requests = []
+    for record in generate_requests(planner, n * 3 // 4, seed):
+        url = '/generate_itinerary/stream' if rng.random() < 0.2 else '/generate_itinerary'
+        requests.append(('POST', url, json.dumps(record)))
+    # Routes ordered by the heuristic rather than exactly
+    cities = sorted(store.cities)
+    for _ in range(max(1, n // 50)):
+        record = {'places': '; '.join(rng.sample(cities, EXACT_LIMIT + rng.randint(1, 5))),
+                  'duration': 7, 'startDate': '2026-01-01', 'maxHours': rng.randint(8, 12)}
+        requests.append(('POST', '/generate_itinerary', json.dumps(record)))
+    while len(requests) < n:
+        i = rng.randrange(len(store))
+        if rng.random() < 0.5:
+            query = {'lat': store.latitudes[i], 'lng': store.longitudes[i],
+                     'radius_km': rng.choice([2, 5, 20])}
+            requests.append(('GET', '/nearby?' + urlencode(query), None))
+        else:
+            query = {'q': add_typo(store.cities[store.city_codes[i]], rng)}
+            requests.append(('GET', '/suggest_places?' + urlencode(query), None))
+    rng.shuffle(requests)
+    return requests
+
+
+def send(request):
+    """Serve a (method, url, body) request, returning (status, body bytes)."""
+    method, url, body = request
+    client = _app().app.test_client()
+    response = client.open(url, method=method, data=body, content_type='application/json')
+    return response.status_code, response.get_data()
+
+
+def clear_caches():
+    """Empty the app planner's cluster and itinerary caches."""
+    _app().travel_planner.cluster_cache.clear()
+    _app().travel_planner.itinerary_cache.clear()
+
+
+def run_threads(requests, n_threads):
+    """Serve requests from a pool of threads, returning responses in order."""
+    with ThreadPoolExecutor(max_workers=n_threads) as pool:
+        return list(pool.map(send, requests))
+
+
+def serve_in_worker(requests):
+    """Pool worker: serve requests with the planner inherited from the parent."""
+    results = [send(request) for request in requests]
+    return results, _app()._watcher_pid == os.getpid()
+
+
+def run_forked(requests, n_processes=2):
+    """Serve requests from forked workers sharing the planner loaded before the fork."""
+    chunks = [requests[i::n_processes] for i in range(n_processes)]
+    with multiprocessing.get_context('fork').Pool(n_processes) as pool:
+        outputs = pool.map(serve_in_worker, chunks)
+    assert all(watching for _, watching in outputs), 'a worker did not start its own watcher'
+    results = [None] * len(requests)
+    for i, (chunk_results, _) in enumerate(outputs):
+        results[i::n_processes] = chunk_results
+    return results
@@ -0,0 +1,94 @@
+import functools
+import json
+import shutil
+
+import pytest
+
+import app
+import batch
+from batch import BatchPool, BatchPoolBusy, generate_batch
+
+RECORDS = [{'places': 'Ooty; Munnar', 'duration': 3, 'startDate': '2026-01-01', 'maxHours': 8},
+           {'places': 'Mysore', 'duration': 2, 'startDate': '2026-01-01', 'maxHours': 10},
+           {'places': 'Ooty'},
+           {'places': 'Hampi', 'duration': 1, 'startDate': '2026-01-01', 'maxHours': 8,
+            'format': 'compact'},
+           {'places': 'Munnar; Ooty', 'duration': 4, 'startDate': '2026-01-01', 'maxHours': 6}]
+LINES = [json.dumps(record) for record in RECORDS]
+
+
+@pytest.fixture(scope='module')
+def pool():
+    pool = BatchPool(app.batch_planner, 2)
+    yield pool
+    pool.close()
+
+
+def run(lines, planner=None, **kwargs):
+    return [json.loads(line) for line in generate_batch(planner or app.travel_planner, lines,
+                                                        **kwargs)]
+
+
+def planner_for(csv_path):
+    """Batch worker planner reading csv_path instead of attractions.csv."""
+    app.DATASET_PATH = csv_path
+    return app.SouthIndiaTravelPlanner()
+
+
+def test_workers_answer_like_the_serving_process(pool):
+    expected = run(LINES)
+    assert 'error' in expected[2] and 'error' not in expected[0]
+    assert run(LINES, pool=pool) == expected
+    # Workers build their own planner, the serving process never sets one
+    assert batch._planner is None
+
+
+def test_busy_pool_refuses_another_batch(pool):
+    first = generate_batch(app.travel_planner, LINES, pool=pool)
+    with pytest.raises(BatchPoolBusy):
+        generate_batch(app.travel_planner, LINES, pool=pool, blocking=False)
+    first.close()
+    # Closing the first batch, even unread, gives its slot back
+    assert len(run(LINES, pool=pool, blocking=False)) == len(LINES)
+
+
+def test_endpoint_answers_503_while_busy(monkeypatch, pool):
+    monkeypatch.setattr(app, 'batch_pool', pool)
+    client = app.app.test_client()
+    held = generate_batch(app.travel_planner, [], pool=pool)
+    try:
+        response = client.post('/generate_itineraries', data='\n'.join(LINES) + '\n')
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+    finally:
+        held.close()
+    response = client.post('/generate_itineraries', data='\n'.join(LINES) + '\n')
+    assert response.status_code == 200
+    assert len(response.get_data().splitlines()) == len(LINES)
+
+
+def test_workers_follow_a_reload(monkeypatch, tmp_path):
+    csv_path = str(tmp_path / 'attractions.csv')
+    shutil.copy('attractions.csv', csv_path)
+    monkeypatch.setattr(app, 'DATASET_PATH', csv_path)
+    planner = app.SouthIndiaTravelPlanner()
+    kerala = [json.dumps({'places': 'Kerala', 'duration': 3, 'startDate': '2026-01-01',
+                          'maxHours': 8})] * 2 + LINES
+    pool = BatchPool(functools.partial(planner_for, csv_path), 2)
+    try:
+        before = run(kerala, planner, pool=pool)
+        assert 'Varkala' in {a['City'] for a in before[0]['all_attractions']}
+
+        with open(csv_path, encoding='utf-8') as f:
+            rows = f.readlines()
+        with open(csv_path, 'w', encoding='utf-8') as f:
+            f.writelines(row for row in rows if ',Varkala,' not in row)
+        assert planner.reload_dataset()['status'] == 'reloaded'
+
+        after = run(kerala, planner, pool=pool)
+        assert after == run(kerala, planner)
+        assert after[0]['dataset_version'] == planner.dataset_version
+        assert before[0]['dataset_version'] != planner.dataset_version
+        assert 'Varkala' not in {a['City'] for a in after[0]['all_attractions']}
+    finally:
+        pool.close()
@@ -0,0 +1,50 @@
+import json
+import logging
+
+import pytest
+
+import app
+from route_order import EXACT_LIMIT
+from tests.helpers import clear_caches, make_requests, run_forked, run_threads, send
+
+N_REQUESTS = 120
+N_THREADS = 16
+
+pytestmark = pytest.mark.filterwarnings('ignore:Number of distinct clusters')
+
+
+@pytest.fixture(scope='module')
+def requests_and_expected():
+    level = app.logger.level
+    app.logger.setLevel(logging.ERROR)
+    requests = make_requests(app.travel_planner, N_REQUESTS)
+    clear_caches()
+    yield requests, [send(request) for request in requests]
+    app.logger.setLevel(level)
+
+
+def assert_same(requests, results, expected):
+    mismatches = [request for request, a, b in zip(requests, results, expected) if a != b]
+    assert not mismatches, mismatches[:3]
+
+
+def test_requests_include_heuristic_routes(requests_and_expected):
+    requests, expected = requests_and_expected
+    long_trips = [json.loads(result) for (_, _, body), (_, result) in zip(requests, expected)
+                  if body and len(json.loads(body)['places'].split(';')) > EXACT_LIMIT]
+    assert long_trips
+    assert all(len(trip['route']['order']) > EXACT_LIMIT for trip in long_trips)
+
+
+@pytest.mark.parametrize('cluster_workers', [0, 4])
+def test_threads_answer_like_serial(requests_and_expected, monkeypatch, cluster_workers):
+    requests, expected = requests_and_expected
+    monkeypatch.setattr(app.travel_planner, 'cluster_workers', cluster_workers)
+    clear_caches()
+    assert_same(requests, run_threads(requests, N_THREADS), expected)
+
+
+def test_forked_workers_answer_like_serial(requests_and_expected):
+    requests, expected = requests_and_expected
+    clear_caches()
+    assert_same(requests, run_forked(requests), expected)
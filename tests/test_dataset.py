@@ -0,0 +1,143 @@
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+
+import pytest
+
+import app
+import snapshot
+from dataset import Dataset, DatasetWatcher
+from snapshot import dataset_version, save_snapshot
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / 'attractions.csv'
+    shutil.copy('attractions.csv', path)
+    return str(path)
+
+
+@pytest.fixture
+def hashes(monkeypatch):
+    """Paths snapshot hashes from now on."""
+    hashed = []
+    file_sha256 = snapshot._file_sha256
+
+    def counting(path):
+        hashed.append(path)
+        return file_sha256(path)
+
+    monkeypatch.setattr(snapshot, '_file_sha256', counting)
+    return hashed
+
+
+def load(csv_path, snapshot_path=None):
+    return Dataset.load(csv_path, snapshot_path, app.travel_planner.location_variations)
+
+
+def test_fresh_snapshot_gives_the_version_without_hashing(tmp_path, csv_path, hashes):
+    parsed = load(csv_path)
+    snapshot_path = str(tmp_path / 'attractions.snapshot.npz')
+    save_snapshot(snapshot_path, parsed.attractions, parsed.location_index, csv_path,
+                  app.travel_planner.location_variations)
+    del hashes[:]
+
+    dataset = load(csv_path, snapshot_path)
+    assert dataset.version == parsed.version == dataset_version(csv_path)
+    del hashes[:]
+    # What a reload poll checks while the file is untouched
+    assert dataset_version(csv_path, dataset.source) == dataset.version
+    assert hashes == []
+
+
+def test_touched_file_is_hashed_again(csv_path, hashes):
+    dataset = load(csv_path)
+    assert len(hashes) == 1
+    stat = os.stat(csv_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert dataset_version(csv_path, dataset.source) == dataset.version
+    assert len(hashes) == 2
+
+    with open(csv_path, 'a', encoding='utf-8') as f:
+        f.write('\n')
+    assert dataset_version(csv_path, dataset.source) != dataset.version
+
+
+def test_reload_reports_and_refits_a_removed_city(monkeypatch, csv_path):
+    monkeypatch.setattr(app, 'DATASET_PATH', csv_path)
+    planner = app.SouthIndiaTravelPlanner()
+    before = planner.generate_itinerary(['Kerala'], 3, '2026-01-01', 8)
+    assert 'Varkala' in {a['City'] for a in before['all_attractions']}
+
+    with open(csv_path, encoding='utf-8') as f:
+        rows = f.readlines()
+    with open(csv_path, 'w', encoding='utf-8') as f:
+        f.writelines(row for row in rows if ',Varkala,' not in row)
+    previous = planner.dataset
+    result = planner.reload_dataset()
+    assert result['status'] == 'reloaded', result
+    assert planner.dataset.changed_cities(previous) == ['Varkala']
+    assert result['changed_cities'] == 1 and result['reclustered'] >= 1
+
+    after = planner.generate_itinerary(['Kerala'], 3, '2026-01-01', 8)
+    assert 'Varkala' not in {a['City'] for a in after['all_attractions']}
+    assert after == app.SouthIndiaTravelPlanner().generate_itinerary(['Kerala'], 3,
+                                                                     '2026-01-01', 8)
+
+
+@pytest.mark.parametrize('edit_before_start', [False, True])
+def test_watcher_notices_edits_since_the_dataset_was_loaded(csv_path, edit_before_start):
+    dataset = load(csv_path)
+    if edit_before_start:
+        with open(csv_path, 'a', encoding='utf-8') as f:
+            f.write('\n')
+    changed = threading.Event()
+    watcher = DatasetWatcher(csv_path, 0.01, changed.set,
+                             loaded=(dataset.source['size'], dataset.source['mtime_ns']))
+    watcher.start()
+    try:
+        assert changed.wait(0.5) == edit_before_start
+    finally:
+        watcher.stop()
+
+
+def test_worker_watcher_reloads_edits_made_after_preloading(monkeypatch, csv_path):
+    monkeypatch.setattr(app, 'DATASET_PATH', csv_path)
+    planner = app.SouthIndiaTravelPlanner()
+    loaded_version = planner.dataset_version
+    with open(csv_path, 'a', encoding='utf-8') as f:
+        f.write('\n')
+
+    # As in a worker forked after the master loaded the dataset
+    monkeypatch.setattr(app, 'travel_planner', planner)
+    monkeypatch.setattr(app.config, 'DATASET_WATCH_INTERVAL', 0.01)
+    monkeypatch.setattr(app, '_watcher_pid', None)
+    monkeypatch.setattr(app, 'dataset_watcher', None)
+    watcher = app.start_dataset_watcher()
+    try:
+        for _ in range(100):
+            if planner.dataset_version != loaded_version:
+                break
+            time.sleep(0.01)
+        assert planner.dataset_version == dataset_version(csv_path) != loaded_version
+    finally:
+        watcher.stop()
+
+
+def test_failed_reload_is_logged_once_as_json(monkeypatch, csv_path, caplog, capsys):
+    monkeypatch.setattr(app, 'DATASET_PATH', csv_path)
+    planner = app.SouthIndiaTravelPlanner()
+    monkeypatch.setattr(app, 'travel_planner', planner)
+    with open(csv_path, 'w', encoding='utf-8') as f:
+        f.write('Name,Category,City,State,Latitude,Longitude,Rating,'
+                'Estimated Visit Time (mins),Review Count,Description\n')
+    capsys.readouterr()
+
+    with caplog.at_level(logging.INFO, logger='itinerary'):
+        result = app.reload_dataset()
+    assert result['status'] == 'error'
+    assert [json.loads(record.getMessage())['status'] for record in caplog.records] == ['error']
+    assert capsys.readouterr().out == ''
@@ -0,0 +1,72 @@
+import random
+
+import numpy as np
+import pytest
+
+import app
+from fuzzy_resolver import FuzzyResolver, PlaceNotFoundError, edit_distance
+from tests.helpers import (assert_planner_corrects_typos, shortlist_mismatches,
+                           suggestion_accuracy, synthetic_place_names, typo_queries)
+
+# A full edit-distance scan of 100k names takes seconds per query
+P95_LIMIT_MS = 20
+
+
+def levenshtein(a, b):
+    row = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        previous, row[0] = row[0], i
+        for k, char_b in enumerate(b, 1):
+            previous, row[k] = row[k], min(row[k] + 1, row[k - 1] + 1,
+                                           previous + (char_a != char_b))
+    return row[-1]
+
+
+@pytest.fixture(scope='module')
+def names():
+    return synthetic_place_names(100_000)
+
+
+def test_edit_distance_matches_the_dynamic_programming_table():
+    rng = random.Random(42)
+    pairs = [('', ''), ('', 'ooty'), ('munnar', ''), ('kodaikanal', 'kodaikanal')]
+    for _ in range(500):
+        # Past 64 characters too, where the bit vectors outgrow a machine word
+        pairs.append(tuple(''.join(rng.choice('abcde ') for _ in range(rng.randint(1, 90)))
+                           for _ in range(2)))
+    for a, b in pairs:
+        assert edit_distance(a, b) == levenshtein(a, b), (a, b)
+
+
+def test_typos_come_back_among_the_top_suggestions(names):
+    rng = random.Random(42)
+    resolver = FuzzyResolver((name, name) for name in names[:10_000])
+    targets, queries = typo_queries(names[:10_000], 500, rng)
+    top1, top5, _ = suggestion_accuracy(resolver, targets, queries)
+    assert top1 >= 0.95 and top5 >= 0.98, (top1, top5)
+    assert not shortlist_mismatches(resolver, names[:10_000], queries[:10])
+
+
+def test_suggestions_stay_fast_on_100k_names(names):
+    rng = random.Random(7)
+    resolver = FuzzyResolver((name, name) for name in names)
+    targets, queries = typo_queries(names, 300, rng)
+    resolver.suggest(queries[0])
+    top1, top5, latencies = suggestion_accuracy(resolver, targets, queries)
+    assert top5 >= 0.95, top5
+    assert np.percentile(latencies, 95) * 1000 < P95_LIMIT_MS
+
+
+def test_planner_corrects_typos():
+    assert_planner_corrects_typos(app.travel_planner)
+
+
+def test_resolve_place_only_picks_a_confident_unambiguous_match():
+    planner = app.travel_planner
+    assert planner.resolve_place('Kodaikanl') == 'kodaikanal'
+    with pytest.raises(PlaceNotFoundError) as error:
+        planner.resolve_place('Atlantis')
+    assert error.value.suggestions == []
+    # Spelled right but without attractions, never corrected into another place
+    with pytest.raises(PlaceNotFoundError):
+        planner.resolve_place('kanyakumari')
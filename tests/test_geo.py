@@ -0,0 +1,25 @@
+import numpy as np
+
+from geo import EARTH_RADIUS_KM, haversine_km, pairwise_haversine_km
+from tests.helpers import assert_haversine_matches_scalar, scalar_distance
+
+
+def test_matches_scalar_formula():
+    assert_haversine_matches_scalar(np.random.default_rng(42), n=20_000)
+
+
+def test_identical_points_are_zero_apart():
+    lats, lons = np.array([0.0, 12.97, -45.5, 89.9]), np.array([0.0, 77.59, 170.0, -120.0])
+    np.testing.assert_array_equal(haversine_km(lats, lons, lats, lons), 0.0)
+    assert np.all(np.diag(pairwise_haversine_km(lats, lons)) == 0.0)
+
+
+def test_antipodal_points_are_half_a_circumference_apart():
+    rng = np.random.default_rng(7)
+    lats, lons = rng.uniform(-89, 89, 10_000), rng.uniform(-180, 180, 10_000)
+    distances = haversine_km(lats, lons, -lats, np.where(lons > 0, lons - 180, lons + 180))
+    assert not np.isnan(distances).any()
+    # The formula is ill-conditioned next to the antipode, about 0.1 m here
+    np.testing.assert_allclose(distances, np.pi * EARTH_RADIUS_KM, rtol=1e-7)
+    # Where the scalar formula stays in range it agrees
+    assert abs(haversine_km(0, 0, 0, 180) - scalar_distance(0, 0, 0, 180)) < 1e-9
@@ -0,0 +1,69 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import app
+from itinerary_cache import CacheBackend, ItineraryCache, SQLiteCacheBackend
+
+
+@pytest.fixture
+def planner():
+    planner = app.travel_planner
+    planner.itinerary_cache.clear()
+    yield planner
+    planner.itinerary_cache.clear()
+
+
+def plan(planner, places, **kwargs):
+    return planner.generate_itinerary(places, 3, '2026-01-01', 8, **kwargs)
+
+
+@pytest.mark.parametrize('fixed', [{'start_place': 'Mysore'}, {'end_place': 'MYSURU '},
+                                   {'start_place': 'ooty', 'end_place': 'mysore'}])
+def test_fixed_ends_answer_the_same_cold_and_warm(planner, fixed):
+    cold = plan(planner, ['mysuru', 'Ooty'], **fixed)
+    assert 'error' not in cold, cold
+    planner.itinerary_cache.clear()
+    plan(planner, ['Mysore', 'Ooty'], **fixed)
+    warm = plan(planner, ['mysuru', 'Ooty'], **fixed)
+    assert warm == cold
+
+
+def test_fixed_end_outside_the_places_is_an_error_cold_and_warm(planner):
+    cold = plan(planner, ['mysuru', 'Ooty'], start_place='Munnar')
+    plan(planner, ['Mysore', 'Ooty'])
+    warm = plan(planner, ['mysuru', 'Ooty'], start_place='Munnar')
+    assert 'error' in cold and warm == cold
+
+
+def test_corrections_echo_this_request_spelling(planner):
+    first = plan(planner, ['Kodaikanl', 'Ooty'])
+    assert first['corrections'] == {'Kodaikanl': 'kodaikanal'}
+    second = plan(planner, ['kodaikanl ', 'Ooty'])
+    assert second['corrections'] == {'kodaikanl ': 'kodaikanal'}
+    assert second['itinerary'] == first['itinerary']
+    assert 'corrections' not in plan(planner, ['Kodaikanal', 'Ooty'])
+
+    events = list(planner.iter_itinerary(['KODAIKANL', 'Ooty'], 3, '2026-01-01', 8))
+    assert events[0]['corrections'] == {'KODAIKANL': 'kodaikanal'}
+
+
+def test_backends_must_implement_the_interface():
+    class Partial(CacheBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_backend_counters_are_exact_under_threads(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / 'cache.db'))
+    backend.set('shared', '{}')
+    # No local entries, so every lookup goes to the backend
+    cache = ItineraryCache(maxsize=0, backend=backend)
+    keys = ['shared', 'missing'] * 200
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(cache.get, keys))
+    stats = cache.stats()
+    assert (stats['backend_hits'], stats['backend_misses']) == (200, 200)
@@ -0,0 +1,15 @@
+import pytest
+
+import app
+from tests.helpers import assert_itinerary_schema
+
+QUERIES = [(['Munnar'], 3), (['Hyderabad', 'Mysore'], 4), (['Goa'], 7),
+           (['Ooty', 'Kodaikanal', 'Munnar', 'Kochi'], 7)]
+
+
+@pytest.mark.parametrize('places, duration', QUERIES)
+def test_days_keep_the_frontend_schema(places, duration):
+    result = app.travel_planner.generate_itinerary(places, duration, '2026-01-01', 8)
+    assert result['itinerary']
+    assert_itinerary_schema(result, 8 * 60)
+    assert [day['date'] for day in result['itinerary']][:2] == ['2026-01-01', '2026-01-02']
@@ -0,0 +1,43 @@
+import pytest
+
+import app
+
+OOTY = {'lat': 11.41, 'lng': 76.70, 'radius_km': 20}
+
+
+@pytest.fixture
+def client():
+    return app.app.test_client()
+
+
+def test_nearby_keeps_every_result_below_the_limit(client):
+    everything = client.get('/nearby', query_string=dict(OOTY, limit=1000)).get_json()
+    ids = [row['id'] for row in everything['attractions']]
+    assert len(ids) > 2
+    limited = client.get('/nearby', query_string=dict(OOTY, limit=2)).get_json()
+    assert [row['id'] for row in limited['attractions']] == ids[:2]
+    assert client.get('/nearby', query_string=dict(OOTY, limit=0)).get_json() == {
+        'attractions': []}
+
+
+@pytest.mark.parametrize('url, query', [('/nearby', OOTY), ('/suggest_places', {'q': 'Munar'})])
+def test_negative_limit_is_an_error(client, url, query):
+    response = client.get(url, query_string=dict(query, limit=-1))
+    assert response.get_json() == {'error': 'limit must not be negative.'}
+
+
+def test_large_limits_are_capped(client, monkeypatch):
+    monkeypatch.setattr(app.config, 'NEARBY_MAX_LIMIT', 2)
+    monkeypatch.setattr(app.config, 'SUGGEST_MAX_LIMIT', 1)
+    nearby = client.get('/nearby', query_string=dict(OOTY, limit=10 ** 9)).get_json()
+    assert len(nearby['attractions']) == 2
+    suggestions = client.get('/suggest_places', query_string={'q': 'Ooty', 'limit': 10 ** 9})
+    assert len(suggestions.get_json()['suggestions']) == 1
+
+
+def test_planner_rejects_negative_limits():
+    with pytest.raises(ValueError):
+        app.travel_planner.nearby(OOTY['lat'], OOTY['lng'], 5, limit=-1)
+    with pytest.raises(ValueError):
+        app.travel_planner.suggest_places('Munar', limit=-1)
+    assert app.travel_planner.suggest_places('Munar', limit=0) == []
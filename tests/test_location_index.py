@@ -0,0 +1,19 @@
+import pytest
+
+from app import SouthIndiaTravelPlanner
+from tests.helpers import location_index_mismatches, synthetic_attractions
+
+
+@pytest.fixture(scope='module')
+def planner():
+    return SouthIndiaTravelPlanner()
+
+
+def test_index_matches_scan_on_real_dataset(planner):
+    _, mismatches = location_index_mismatches(planner, planner.attractions)
+    assert mismatches == []
+
+
+def test_index_matches_scan_on_synthetic_dataset(planner):
+    _, mismatches = location_index_mismatches(planner, synthetic_attractions(5000))
+    assert mismatches == []
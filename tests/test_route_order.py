@@ -0,0 +1,71 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import app
+from geo import pairwise_haversine_km
+from route_order import EXACT_LIMIT, plan_route, two_opt
+from travel_times import PROFILES
+
+
+def random_distances(n, seed=42):
+    rng = np.random.default_rng(seed)
+    return pairwise_haversine_km(rng.uniform(8, 19, n), rng.uniform(73, 85, n))
+
+
+def test_heuristic_route_does_not_depend_on_load():
+    distances = random_distances(40)
+    expected = plan_route(distances)
+    assert sorted(expected.order) == list(range(40))
+    # Threads competing for the CPU slow every call down
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        routes = list(pool.map(lambda _: plan_route(distances, start=None), range(16)))
+    assert all(route == expected for route in routes)
+
+
+def test_heuristic_keeps_fixed_ends():
+    distances = random_distances(EXACT_LIMIT + 5)
+    route = plan_route(distances, start=3, end=0)
+    assert route.order[0] == 3 and route.order[-1] == 0
+    assert sorted(route.order) == list(range(EXACT_LIMIT + 5))
+
+
+def test_time_limit_is_logged_safety_net(caplog):
+    with caplog.at_level(logging.WARNING, logger='itinerary'):
+        route = plan_route(random_distances(60), time_limit=0.0)
+    assert sorted(route.order) == list(range(60))
+    assert 'time limit' in caplog.text
+
+
+def test_leg_minutes_follow_the_speed_profile():
+    distances = random_distances(3)
+    urban = plan_route(distances, speed=PROFILES['urban'])
+    highway = plan_route(distances, speed=PROFILES['highway'])
+    assert urban.legs == plan_route(distances).legs
+    assert highway.order == urban.order and highway.legs != urban.legs
+    assert highway.travel_time == sum(highway.legs)
+
+
+def test_planner_route_uses_the_dataset_profile():
+    def travel_time(profile):
+        planner = app.SouthIndiaTravelPlanner(speed_profile=profile)
+        result = planner.generate_itinerary(['Ooty', 'Kodaikanal', 'Munnar'], 3,
+                                            '2026-01-01', 8)
+        return result['route']['travel_time']
+
+    assert travel_time('highway') != travel_time('urban')
+
+
+def test_two_opt_keeps_fixed_ends_and_respects_its_budget():
+    distances = random_distances(30)
+    path = list(range(30))
+    improved, evaluated = two_opt(list(path), distances, fixed_start=True, fixed_end=True)
+    assert improved[0] == 0 and improved[-1] == 29 and sorted(improved) == path
+    lengths = [sum(distances[a, b] for a, b in zip(p, p[1:])) for p in (improved, path)]
+    assert lengths[0] < lengths[1]
+    # A local optimum: another pass finds nothing to reverse
+    assert two_opt(list(improved), distances, True, True)[0] == improved
+
+    _, evaluated = two_opt(list(path), distances, budget=10)
+    assert 10 <= evaluated < 10 + 30
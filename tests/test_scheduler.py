@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+import app
+import scheduler
+from scheduler import DayScheduler
+
+
+def plan(dataset, clusters, days=5):
+    used_names = np.zeros(len(dataset.attractions.distinct_names), dtype=bool)
+    day_scheduler = DayScheduler(dataset.attractions, clusters, used_names,
+                                 spatial_index=dataset.spatial_index,
+                                 travel_times=dataset.travel_times)
+    return day_scheduler, [day_scheduler.next_day(8 * 60) for _ in range(days)]
+
+
+@pytest.fixture
+def kerala():
+    dataset = app.travel_planner.dataset
+    ids = dataset.location_index.lookup('Kerala')
+    return dataset, [ids[0::2], ids[1::2]]
+
+
+def test_scan_keeps_its_flags_to_the_location(kerala):
+    dataset, clusters = kerala
+    day_scheduler, days = plan(dataset, clusters)
+    assert day_scheduler._index_mask is None
+    assert len(day_scheduler._available) == sum(len(ids) for ids in clusters)
+    assert sum(len(day.ids) for day in days) == np.count_nonzero(~day_scheduler._available)
+
+
+def test_index_and_scan_plan_the_same_days(kerala, monkeypatch):
+    dataset, clusters = kerala
+    _, scanned = plan(dataset, clusters)
+    monkeypatch.setattr(scheduler, 'NEARBY_SCAN_LIMIT', 0)
+    day_scheduler, indexed = plan(dataset, clusters)
+    assert day_scheduler._index_mask is not None
+    assert indexed == scanned
@@ -0,0 +1,26 @@
+import numpy as np
+
+import app
+from travel_times import TravelTimes, build_travel_times
+
+
+def test_rebuild_leaves_mapped_matrices_intact(tmp_path):
+    dataset = app.travel_planner.dataset
+    store, version = dataset.attractions, dataset.version
+    path = str(tmp_path / 'travel_times.npy')
+    build_travel_times(path, store, version, 'urban')
+    urban = TravelTimes.load(path, store, version, 'urban')
+    assert urban.mapped
+
+    city_ids = np.flatnonzero(store.city_codes == store.city_codes[0])
+    expected = urban.formula(0, city_ids)
+    np.testing.assert_array_equal(urban.minutes(0, city_ids), expected)
+
+    build_travel_times(path, store, version, 'highway')
+    # Still the urban matrices, not the highway ones written over the same path
+    np.testing.assert_array_equal(urban.minutes(0, city_ids), expected)
+    highway = TravelTimes.load(path, store, version, 'highway')
+    assert highway.mapped
+    np.testing.assert_array_equal(highway.minutes(0, city_ids), highway.formula(0, city_ids))
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['travel_times.json',
+                                                          'travel_times.npy']
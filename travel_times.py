@@ -0,0 +1,294 @@
+import csv
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from geo import AVERAGE_SPEED_KMH, haversine_km, pairwise_haversine_km, travel_minutes
+
+# Bump when the layout of the saved matrices changes
+TRAVEL_TIMES_VERSION = 1
+
+# Matrix cells are uint16 minutes, this one marks a pair left to the formula
+MISSING = np.iinfo(np.uint16).max
+
+# Cities with more attractions than this get no matrix (n^2 cells each)
+MAX_CITY_SIZE = 2048
+
+
+class SpeedProfile:
+    """
+    Travel minutes from straight-line distance.
+
+    The road distance is the straight-line one times a detour factor, the
+    first urban_km of a trip are driven at urban_speed_kmh and the rest at
+    speed_kmh. Minutes are truncated like int().
+    """
+
+    def __init__(self, speed_kmh, detour=1.0, urban_km=0.0, urban_speed_kmh=None):
+        self.speed_kmh = speed_kmh
+        self.detour = detour
+        self.urban_km = urban_km
+        self.urban_speed_kmh = urban_speed_kmh
+
+    def minutes(self, distance_km):
+        """
+        Args:
+            distance_km (array-like): Straight-line distances in kilometers
+
+        Returns:
+            numpy.ndarray: Travel times in whole minutes
+        """
+        road_km = np.asarray(distance_km) * self.detour
+        if not self.urban_km:
+            return travel_minutes(road_km, self.speed_kmh)
+        urban = np.minimum(road_km, self.urban_km)
+        hours = urban / self.urban_speed_kmh + (road_km - urban) / self.speed_kmh
+        return (hours * 60).astype(np.int64)
+
+
+PROFILES = {
+    # The planner's historical model, 40 km/h as the crow flies
+    'urban': SpeedProfile(AVERAGE_SPEED_KMH),
+    # Slow streets to leave town, then 70 km/h on roads 25% longer than a straight line
+    'highway': SpeedProfile(70, detour=1.25, urban_km=5, urban_speed_kmh=30),
+}
+
+
+def speed_profile(name):
+    """Look up a profile in PROFILES, raising ValueError for unknown names."""
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown speed profile {name!r}, choose from {', '.join(PROFILES)}")
+
+
+def manifest_path(path):
+    return os.path.splitext(path)[0] + '.json'
+
+
+def _city_positions(city_codes, n_cities):
+    """Each attraction's index among its city's attractions, and where cities start."""
+    order = np.argsort(city_codes, kind='stable')
+    starts = np.searchsorted(city_codes[order], np.arange(n_cities + 1))
+    positions = np.empty(len(city_codes), dtype=np.int64)
+    positions[order] = np.arange(len(city_codes)) - starts[city_codes[order]]
+    return order, starts, positions
+
+
+def load_edges(path):
+    """
+    Read road travel times between named attractions.
+
+    Args:
+        path (str): CSV file with 'from', 'to' and 'minutes' columns; names are
+            attraction names and every edge is used in both directions
+
+    Returns:
+        dict: (from name, to name) -> minutes
+    """
+    edges = {}
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            minutes = int(float(row['minutes']))
+            edges[(row['from'], row['to'])] = minutes
+            edges.setdefault((row['to'], row['from']), minutes)
+    return edges
+
+
+def build_travel_times(path, store, dataset_version, profile='urban', edges_path=None,
+                       max_city_size=MAX_CITY_SIZE):
+    """
+    Write a pairwise travel-time matrix for every city to disk.
+
+    All matrices go into one flat uint16 .npy file, so the planner maps a
+    single file, and a .json manifest next to it records where each city's
+    matrix starts and what it was built from. Both are written next to their
+    destinations and renamed into place, so processes that mapped the
+    previous file keep reading it intact.
+
+    Args:
+        path (str): .npy file to write
+        store (AttractionStore): Dataset to build for
+        dataset_version (str): Version of the dataset, matrices are only used with it
+        profile (str): Name of the speed profile for pairs without a road time
+        edges_path (str): Optional road times (see load_edges) overriding the profile
+        max_city_size (int): Cities with more attractions are left to the formula
+
+    Returns:
+        dict: The manifest
+    """
+    speed = speed_profile(profile)
+    edges = load_edges(edges_path) if edges_path else {}
+    order, starts, _ = _city_positions(store.city_codes, len(store.cities))
+
+    cities, total = {}, 0
+    for code, city in enumerate(store.cities):
+        size = int(starts[code + 1] - starts[code])
+        if 0 < size <= max_city_size:
+            cities[city] = {'offset': total, 'size': size}
+            total += size * size
+
+    tmp_path = f'{path}.tmp'
+    flat = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.uint16, shape=(total,))
+    overridden = 0
+    for code, city in enumerate(store.cities):
+        if city not in cities:
+            continue
+        ids = order[starts[code]:starts[code + 1]]
+        minutes = speed.minutes(pairwise_haversine_km(store.latitudes[ids],
+                                                      store.longitudes[ids]))
+        matrix = np.minimum(minutes, MISSING - 1).astype(np.uint16)
+        if edges:
+            positions = {}
+            for position, attraction_id in enumerate(ids.tolist()):
+                positions.setdefault(store.names[attraction_id], []).append(position)
+            for (from_name, to_name), road in edges.items():
+                for i in positions.get(from_name, ()):
+                    for k in positions.get(to_name, ()):
+                        if i != k:
+                            matrix[i, k] = min(road, MISSING - 1)
+                            overridden += 1
+        offset = cities[city]['offset']
+        flat[offset:offset + matrix.size] = matrix.ravel()
+    flat.flush()
+    del flat
+
+    manifest = {
+        'format': TRAVEL_TIMES_VERSION,
+        'dataset_version': dataset_version,
+        'profile': profile,
+        'edges': os.path.basename(edges_path) if edges_path else None,
+        'overridden_pairs': overridden,
+        'cities': cities,
+    }
+    tmp_manifest = f'{manifest_path(path)}.tmp'
+    with open(tmp_manifest, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+    # Truncating a mapped file would pull it from under running servers
+    os.replace(tmp_path, path)
+    os.replace(tmp_manifest, manifest_path(path))
+    return manifest
+
+
+class TravelTimes:
+    """
+    Travel minutes between attractions.
+
+    Pairs within a city come from the precomputed matrices when there are
+    any: the .npy file is memory-mapped and each city's matrix is a view into
+    it, so lookups are O(1) and nothing is copied or read up front. All other
+    pairs (other cities, cities without a matrix, no usable file) use the
+    speed profile's formula, which is also what the matrices hold unless road
+    times were supplied.
+    """
+
+    def __init__(self, store, profile='urban', flat=None, cities=None, version=None):
+        """
+        Args:
+            store (AttractionStore): Dataset the ids refer to
+            profile (str): Name of the speed profile for the formula
+            flat (numpy.ndarray): All matrices, as written by build_travel_times
+            cities (dict): City name -> {'offset', 'size'} into flat
+            version (str): Identifier of the matrices, defaults to the profile
+                name; part of the itinerary cache key
+        """
+        self.store = store
+        self.profile = profile
+        self.version = version or profile
+        self.speed = speed_profile(profile)
+        self.matrices = [None] * len(store.cities)
+        self._positions = None
+        self.mapped = False
+        if flat is not None and cities:
+            _, starts, self._positions = _city_positions(store.city_codes, len(store.cities))
+            for code, city in enumerate(store.cities):
+                entry = cities.get(city)
+                if entry and entry['size'] == starts[code + 1] - starts[code]:
+                    offset, size = entry['offset'], entry['size']
+                    self.matrices[code] = flat[offset:offset + size * size].reshape(size, size)
+                    self.mapped = True
+
+    @classmethod
+    def load(cls, path, store, dataset_version, profile='urban'):
+        """
+        Map the matrices written by build_travel_times, when they match the dataset.
+
+        Args:
+            path (str): .npy file, or None
+            store (AttractionStore): Dataset the ids refer to
+            dataset_version (str): Version the matrices must have been built for
+            profile (str): Speed profile they must have been built with
+
+        Returns:
+            TravelTimes: With the matrices, or formula-only when the file is
+                missing, stale or unreadable
+        """
+        if not path or not os.path.exists(path):
+            return cls(store, profile)
+        try:
+            with open(manifest_path(path), encoding='utf-8') as f:
+                manifest = json.load(f)
+            if (manifest.get('format') != TRAVEL_TIMES_VERSION or
+                    manifest.get('dataset_version') != dataset_version or
+                    manifest.get('profile') != profile):
+                print(f"Travel times {path} are stale, using the {profile} formula")
+                return cls(store, profile)
+            flat = np.load(path, mmap_mode='r')
+        except Exception as e:
+            print(f"Error loading travel times {path}: {e}")
+            return cls(store, profile)
+        digest = hashlib.sha256(json.dumps(manifest, sort_keys=True).encode('utf-8'))
+        return cls(store, profile, flat, manifest['cities'],
+                   version=f'{profile}:{digest.hexdigest()[:16]}')
+
+    def formula(self, from_id, to_ids):
+        """Travel minutes from one attraction to others, by the speed profile."""
+        store = self.store
+        return self.speed.minutes(haversine_km(store.latitudes[from_id], store.longitudes[from_id],
+                                               store.latitudes[to_ids], store.longitudes[to_ids]))
+
+    def minutes(self, from_id, to_ids):
+        """
+        Travel minutes from one attraction to several others.
+
+        Args:
+            from_id (int): Attraction id
+            to_ids (numpy.ndarray): Attraction ids
+
+        Returns:
+            numpy.ndarray: Whole minutes per destination
+        """
+        to_ids = np.asarray(to_ids, dtype=np.int64)
+        code = self.store.city_codes[from_id]
+        matrix = self.matrices[code]
+        if matrix is None:
+            return self.formula(from_id, to_ids)
+
+        result = np.zeros(len(to_ids), dtype=np.int64)
+        inside = self.store.city_codes[to_ids] == code
+        result[inside] = matrix[self._positions[from_id], self._positions[to_ids[inside]]]
+        fallback = ~inside | (result == MISSING)
+        if fallback.any():
+            result[fallback] = self.formula(from_id, to_ids[fallback])
+        return result
+
+    def path_minutes(self, ids):
+        """
+        Total travel minutes along a route.
+
+        Args:
+            ids (list): Attraction ids in visiting order
+
+        Returns:
+            int: Sum of the legs' whole minutes
+        """
+        if len(ids) < 2:
+            return 0
+        store = self.store
+        if not self.mapped:
+            return int(self.speed.minutes(haversine_km(
+                store.latitudes[ids[:-1]], store.longitudes[ids[:-1]],
+                store.latitudes[ids[1:]], store.longitudes[ids[1:]])).sum())
+        return sum(int(self.minutes(a, [b])[0]) for a, b in zip(ids[:-1], ids[1:]))
@@ -0,0 +1,25 @@
+"""
+WSGI entry point for production servers.
+
+Importing app loads the dataset, its indexes and travel-time matrices (and
+warms the cluster cache with WARM_CLUSTER_CACHE). Load it once in a
+preforking server's master and the workers share those pages copy-on-write
+instead of each loading its own copy:
+
+    gunicorn --preload --workers 4 --threads 8 wsgi:app
+
+The planner is shared safely by a worker's threads, see
+SouthIndiaTravelPlanner. The dataset watcher starts in each worker with its
+first request, and a reload in one worker leaves the others on the old
+version until their own watcher notices the change.
+"""
+import gc
+
+from app import app
+
+# Everything loaded so far lives as long as the process. Freezing it keeps the
+# garbage collector in the workers from writing to (and so copying) its pages.
+gc.freeze()
+
+# The name uWSGI and mod_wsgi look for
+application = app